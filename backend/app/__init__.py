@@ -1,19 +1,31 @@
 
 from flask import Flask
 from flask_cors import CORS
-from .config import Config
+from .config import Config, engine_options
 from .extensions import db, migrate, jwt
+from .common.replicas import replica_router
 
-def create_app():
+def create_app(config_overrides=None):
     flask_app = Flask(__name__)
     flask_app.config.from_object(Config)
+    if config_overrides:
+        flask_app.config.update(config_overrides)
+    if "SQLALCHEMY_ENGINE_OPTIONS" not in flask_app.config:
+        flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(flask_app.config)
 
     # Initialize CORS
     CORS(flask_app)
 
     db.init_app(flask_app)
+    replica_router.init_app(flask_app, db)
+
+    from app.common import instrumentation
+    instrumentation.init_app(flask_app)
     jwt.init_app(flask_app)
 
+    from app.common.cache import response_cache
+    response_cache.init_app(flask_app)
+
     # Import models to ensure they are registered with SQLAlchemy
     import app.auth.models
     import app.students.models
@@ -21,7 +33,8 @@ def create_app():
     import app.platforms.models
     import app.snapshots.models
     import app.staff.models # New Staff Profile Model
-    # import app.analytics.models # Empty for now
+    import app.analytics.models # Derived analytics tables
+    import app.jobs.models # Background job queue
 
     # Initialize Migrate after models are imported
     migrate.init_app(flask_app, db)
@@ -64,6 +77,25 @@ def create_app():
     from app.admin.routes import admin_bp
     flask_app.register_blueprint(admin_bp)
 
+    from app.jobs.routes import jobs_bp
+    flask_app.register_blueprint(jobs_bp)
+
+    from app.exports.routes import exports_bp
+    flask_app.register_blueprint(exports_bp)
+
+    # CLI commands
+    from app.analytics.commands import analytics_cli
+    flask_app.cli.add_command(analytics_cli)
+
+    from app.snapshots.commands import snapshots_cli
+    flask_app.cli.add_command(snapshots_cli)
+
+    from app.sync.commands import sync_cli
+    flask_app.cli.add_command(sync_cli)
+
+    from app.jobs.commands import jobs_cli
+    flask_app.cli.add_command(jobs_cli)
+
     @flask_app.route("/health")
     def health():
         return {"status": "ok"}
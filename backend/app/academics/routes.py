@@ -5,6 +5,8 @@ from app.extensions import db
 from app.academics.models import Department
 from app.auth.models import User
 from app.common.utils import success_response, error_response, is_admin
+from app.common.principal import current_principal
+from app.common.cache import response_cache
 
 academics_bp = Blueprint("academics", __name__, url_prefix="/academics")
 
@@ -12,7 +14,7 @@ academics_bp = Blueprint("academics", __name__, url_prefix="/academics")
 @jwt_required()
 def create_department():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_principal()
     
     if not is_admin(user):
         return error_response("Admin access required", 403)
@@ -46,6 +48,8 @@ def create_department():
     try:
         db.session.add(department)
         db.session.commit()
+        # A new HOD's role-gated views change with the department
+        response_cache.invalidate("institution", "departments", f"user:{hod_id}" if hod_id else None)
         return success_response(department.to_dict(), "Department created", 201)
     except Exception as e:
         db.session.rollback()
@@ -70,7 +74,7 @@ def get_department(dept_id):
 @jwt_required()
 def delete_department(dept_id):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_principal()
 
     if not is_admin(user):
         return error_response("Admin access required", 403)
@@ -83,8 +87,11 @@ def delete_department(dept_id):
         return error_response("Cannot delete department. Students are assigned.", 400)
 
     try:
+        hod_id = department.hod_id
         db.session.delete(department)
         db.session.commit()
+        response_cache.invalidate("institution", "departments", f"department:{dept_id}",
+                                  f"user:{hod_id}" if hod_id else None)
         return success_response(None, "Department deleted successfully")
     except Exception as e:
         db.session.rollback()
@@ -6,6 +6,9 @@ from app.auth.models import User, Role, UserRole
 from app.students.models import Student
 from app.academics.models import Department
 from app.common.utils import hash_password, success_response, error_response, is_admin
+from app.common.principal import current_principal
+from app.common.cache import response_cache, student_cache_tags
+from app.analytics.services import refresh_department_daily_stats
 import uuid
 from datetime import datetime
 
@@ -16,7 +19,7 @@ admin_bp = Blueprint("admin_bp", __name__, url_prefix="/admin")
 def create_institutional_user():
     # 1. Verify access: Admin only
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     if not is_admin(user):
         return error_response("Access denied. Admin role required.", 403)
 
@@ -77,6 +80,7 @@ def create_institutional_user():
                 department_id=department_id if department_id else None
             )
             db.session.add(student_profile)
+            refresh_department_daily_stats([student_profile.department_id])
         
         elif role_name in ["counsellor", "advisor"]:
             # Logic for Counsellor/Advisor linking to department?
@@ -108,6 +112,10 @@ def create_institutional_user():
                 pass
 
         db.session.commit()
+        cache_tags = [f"user:{new_user.id}"]
+        if role_name == "student":
+            cache_tags.extend(student_cache_tags(student_profile))
+        response_cache.invalidate(*cache_tags)
         
         return success_response({
             "user_id": new_user.id, 
@@ -0,0 +1,43 @@
+from datetime import datetime
+import click
+from flask.cli import AppGroup
+from sqlalchemy import func
+from app.extensions import db
+from app.academics.models import Department
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.services import rebuild_account_stats, backfill_department_daily_stats
+
+analytics_cli = AppGroup("analytics", help="Maintain derived analytics tables.")
+
+@analytics_cli.command("rebuild-stats")
+def rebuild_stats_command():
+    """Rebuild platform_account_stats from approved snapshots."""
+    count = rebuild_account_stats()
+    click.echo(f"Rebuilt stats for {count} platform accounts.")
+
+@analytics_cli.command("backfill-department-stats")
+@click.option("--start", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="First day to compute. Defaults to the earliest approved snapshot.")
+@click.option("--end", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Last day to compute. Defaults to today.")
+@click.option("--department", "department_codes", multiple=True,
+              help="Department code to backfill. Repeatable; defaults to all departments.")
+def backfill_department_stats_command(start, end, department_codes):
+    """Fill department_daily_stats for a date range (run daily to roll forward)."""
+    end_date = end.date() if end else datetime.utcnow().date()
+    if start:
+        start_date = start.date()
+    else:
+        start_date = db.session.query(func.min(PlatformSnapshot.snapshot_date))\
+            .filter(PlatformSnapshot.status == "approved").scalar() or end_date
+
+    department_ids = None
+    if department_codes:
+        departments = Department.query.filter(Department.code.in_(department_codes)).all()
+        missing = set(department_codes) - {d.code for d in departments}
+        if missing:
+            raise click.BadParameter(f"Unknown department code(s): {', '.join(sorted(missing))}")
+        department_ids = [d.id for d in departments]
+
+    count = backfill_department_daily_stats(start_date, end_date, department_ids)
+    click.echo(f"Wrote {count} department_daily_stats rows for {start_date} to {end_date}.")
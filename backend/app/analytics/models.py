@@ -0,0 +1,90 @@
+from datetime import datetime
+from sqlalchemy import case
+from sqlalchemy.ext.hybrid import hybrid_property
+from app.extensions import db
+
+class PlatformAccountStats(db.Model):
+    """
+    Latest and previous approved snapshot values per platform account.
+
+    Derived from platform_snapshots and maintained by
+    app.analytics.services.refresh_account_stats whenever a snapshot is
+    approved, so dashboards read one row per account instead of scanning the
+    snapshot history.
+    """
+    __tablename__ = "platform_account_stats"
+
+    platform_account_id = db.Column(
+        db.String(36),
+        db.ForeignKey("platform_accounts.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    latest_snapshot_date = db.Column(db.Date, nullable=False)
+    latest_total_solved = db.Column(db.Integer, nullable=False)
+    latest_contest_rating = db.Column(db.Integer, nullable=True)
+    latest_global_rank = db.Column(db.Integer, nullable=True)
+
+    previous_snapshot_date = db.Column(db.Date, nullable=True)
+    previous_total_solved = db.Column(db.Integer, nullable=True)
+    previous_contest_rating = db.Column(db.Integer, nullable=True)
+    previous_global_rank = db.Column(db.Integer, nullable=True)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    platform_account = db.relationship(
+        "PlatformAccount",
+        backref=db.backref("stats", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    )
+
+    @hybrid_property
+    def solved_growth(self):
+        if self.previous_total_solved is None:
+            return 0
+        return self.latest_total_solved - self.previous_total_solved
+
+    @solved_growth.expression
+    def solved_growth(cls):
+        return case(
+            (cls.previous_total_solved.is_(None), 0),
+            else_=cls.latest_total_solved - cls.previous_total_solved
+        )
+
+class DepartmentDailyStats(db.Model):
+    """
+    Per-department, per-day rollup of the latest approved snapshot values.
+
+    Maintained by app.analytics.services.refresh_department_daily_stats on
+    snapshot approval and department reassignment, and filled historically by
+    `flask analytics backfill-department-stats`. Student and account counts
+    reflect department membership at the time the row was computed.
+    """
+    __tablename__ = "department_daily_stats"
+
+    department_id = db.Column(db.String(36), db.ForeignKey("departments.id", ondelete="CASCADE"), primary_key=True)
+    stat_date = db.Column(db.Date, primary_key=True)
+
+    student_count = db.Column(db.Integer, nullable=False, default=0)
+    linked_accounts = db.Column(db.Integer, nullable=False, default=0)
+    total_solved = db.Column(db.Integer, nullable=False, default=0)
+    average_rating = db.Column(db.Float, nullable=True)
+    active_students = db.Column(db.Integer, nullable=False, default=0)
+    growth = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    department = db.relationship(
+        "Department",
+        backref=db.backref("daily_stats", lazy=True, cascade="all, delete-orphan", passive_deletes=True)
+    )
+
+    def to_dict(self):
+        return {
+            "department_id": self.department_id,
+            "stat_date": self.stat_date.isoformat(),
+            "student_count": self.student_count,
+            "linked_accounts": self.linked_accounts,
+            "total_solved": self.total_solved,
+            "average_rating": round(self.average_rating, 2) if self.average_rating is not None else 0,
+            "active_students": self.active_students,
+            "growth": self.growth
+        }
@@ -0,0 +1,115 @@
+"""
+Vectorized at-risk detection.
+
+Loads the scoped students and their accounts' latest approved stats in two
+queries (the same loaders as get_student_metrics), then computes per-student
+recency, growth and decline flags with NumPy in a single pass.
+"""
+
+from datetime import datetime, timedelta
+import numpy as np
+from flask import current_app
+from app.analytics.services import query_student_rows, query_account_rows
+
+# Sentinel ordinal for "no approved snapshot"
+NO_DATE = np.iinfo(np.int64).min
+
+class AtRiskReport:
+    """Per-student risk flags as aligned NumPy arrays"""
+
+    def __init__(self, students, account_count, total_solved, growth, last_ordinal,
+                 is_inactive, has_no_growth, is_declining, inactivity_days):
+        self.students = students
+        self.account_count = account_count
+        self.total_solved = total_solved
+        self.growth = growth
+        self.last_ordinal = last_ordinal
+        self.is_inactive = is_inactive
+        self.has_no_growth = has_no_growth
+        self.is_declining = is_declining
+        self.is_risk = is_inactive | has_no_growth
+        self.inactivity_days = inactivity_days
+
+    def __len__(self):
+        return len(self.students)
+
+    def last_snapshot_date(self, index):
+        ordinal = int(self.last_ordinal[index])
+        return None if ordinal == NO_DATE else datetime.fromordinal(ordinal).date()
+
+    def rows(self, only_risk=False, require_accounts=False):
+        """Yield one dict per student, optionally filtered to at-risk students"""
+        mask = self.is_risk if only_risk else np.ones(len(self), dtype=bool)
+        if require_accounts:
+            mask = mask & (self.account_count > 0)
+
+        for i in np.flatnonzero(mask):
+            student = self.students[i]
+            yield {
+                "student_id": student.id,
+                "full_name": student.full_name,
+                "register_number": student.register_number,
+                "department_name": student.department_name,
+                "total_solved": int(self.total_solved[i]),
+                "growth": int(self.growth[i]),
+                "last_snapshot_date": self.last_snapshot_date(i),
+                "is_inactive": bool(self.is_inactive[i]),
+                "has_no_growth": bool(self.has_no_growth[i]),
+                "is_declining": bool(self.is_declining[i]),
+                "is_risk": bool(self.is_risk[i])
+            }
+
+def evaluate_at_risk(student_scope=None, today=None, inactivity_days=None,
+                     min_growth=None, decline_threshold=None):
+    """
+    Evaluate risk flags for every student in `student_scope` (a SELECT of
+    student ids) or for all students when it is None. Thresholds default to
+    the AT_RISK_* config values.
+    """
+    config = current_app.config
+    if inactivity_days is None:
+        inactivity_days = config["AT_RISK_INACTIVITY_DAYS"]
+    if min_growth is None:
+        min_growth = config["AT_RISK_MIN_GROWTH"]
+    if decline_threshold is None:
+        decline_threshold = config["AT_RISK_DECLINE_THRESHOLD"]
+    today = today or datetime.utcnow().date()
+
+    # 1. Scoped students, 2. their accounts with latest approved stats
+    students = query_student_rows(student_scope).all()
+    accounts = query_account_rows(student_scope).all()
+
+    n_students = len(students)
+    index_of = {s.id: i for i, s in enumerate(students)}
+
+    # Account rows -> aligned arrays (accounts of out-of-scope students are dropped)
+    owner = np.fromiter((index_of.get(a.student_id, -1) for a in accounts), dtype=np.int64, count=len(accounts))
+    solved = np.fromiter((a.latest_total_solved or 0 for a in accounts), dtype=np.int64, count=len(accounts))
+    delta = np.fromiter(
+        (a.latest_total_solved - a.previous_total_solved if a.previous_total_solved is not None else 0 for a in accounts),
+        dtype=np.int64, count=len(accounts)
+    )
+    ordinal = np.fromiter(
+        (a.latest_snapshot_date.toordinal() if a.latest_snapshot_date else NO_DATE for a in accounts),
+        dtype=np.int64, count=len(accounts)
+    )
+
+    keep = owner >= 0
+    owner, solved, delta, ordinal = owner[keep], solved[keep], delta[keep], ordinal[keep]
+
+    # Single vectorized pass: group by student
+    account_count = np.bincount(owner, minlength=n_students)
+    total_solved = np.bincount(owner, weights=solved, minlength=n_students).astype(np.int64)
+    growth = np.bincount(owner, weights=delta, minlength=n_students).astype(np.int64)
+    last_ordinal = np.full(n_students, NO_DATE, dtype=np.int64)
+    np.maximum.at(last_ordinal, owner, ordinal)
+
+    cutoff = (today - timedelta(days=inactivity_days)).toordinal()
+    is_inactive = last_ordinal < cutoff
+    has_no_growth = growth <= min_growth
+    is_declining = growth < decline_threshold
+
+    return AtRiskReport(
+        students, account_count, total_solved, growth, last_ordinal,
+        is_inactive, has_no_growth, is_declining, inactivity_days
+    )
@@ -1,13 +1,20 @@
 
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.students.models import Student
+from app.students.models import Student, StudentAdvisor
 from app.platforms.models import PlatformAccount
 from app.snapshots.models import PlatformSnapshot
 from app.academics.models import Department
 from app.auth.models import User
+from app.analytics.models import PlatformAccountStats, DepartmentDailyStats
+from app.analytics.risk import evaluate_at_risk
+from app.analytics.services import get_student_metrics, student_summary_response, live_department_stats
+from app.analytics.timeseries import growth_series, INTERVALS
 from app.common.utils import success_response, error_response, is_admin, is_hod, is_counsellor
-from sqlalchemy import func, and_
+from app.common.principal import current_principal, load_principal
+from app.common.cache import response_cache
+from app.common.instrumentation import query_budget
+from sqlalchemy import func, and_, literal
 from app.extensions import db
 from datetime import datetime, timedelta
 
@@ -15,6 +22,7 @@ analytics_bp = Blueprint("analytics_bp", __name__, url_prefix="/analytics")
 
 @analytics_bp.route("/my-growth/<platform_account_id>", methods=["GET"])
 @jwt_required()
+@response_cache.cached(lambda user_id, platform_account_id: [f"user:{user_id}"])
 def get_my_growth(platform_account_id):
     current_user_id = get_jwt_identity()
 
@@ -29,31 +37,25 @@ def get_my_growth(platform_account_id):
     if account.student_id != student.id:
         return error_response("Unauthorized. This platform account does not belong to you.", 403)
 
-    snapshots = PlatformSnapshot.query.filter_by(platform_account_id=account.id, status="approved")\
-        .order_by(PlatformSnapshot.snapshot_date.desc())\
-        .limit(2)\
-        .all()
+    stats = PlatformAccountStats.query.get(account.id)
 
-    if len(snapshots) < 2:
+    if not stats or stats.previous_snapshot_date is None:
         return error_response("Not enough snapshots to calculate growth")
 
-    latest = snapshots[0]
-    previous = snapshots[1]
-
-    latest_total = latest.total_solved
-    previous_total = previous.total_solved
+    latest_total = stats.latest_total_solved
+    previous_total = stats.previous_total_solved
     total_growth = latest_total - previous_total
 
-    latest_rating = latest.contest_rating if latest.contest_rating is not None else 0
-    previous_rating = previous.contest_rating if previous.contest_rating is not None else 0
+    latest_rating = stats.latest_contest_rating if stats.latest_contest_rating is not None else 0
+    previous_rating = stats.previous_contest_rating if stats.previous_contest_rating is not None else 0
     rating_growth = latest_rating - previous_rating
 
     growth_percentage = (total_growth / previous_total * 100) if previous_total > 0 else 0
 
     return success_response({
         "platform_account_id": account.id,
-        "latest_snapshot_date": latest.snapshot_date.isoformat(),
-        "previous_snapshot_date": previous.snapshot_date.isoformat(),
+        "latest_snapshot_date": stats.latest_snapshot_date.isoformat(),
+        "previous_snapshot_date": stats.previous_snapshot_date.isoformat(),
         "latest_total_solved": latest_total,
         "previous_total_solved": previous_total,
         "total_growth": total_growth,
@@ -64,15 +66,43 @@ def get_my_growth(platform_account_id):
     })
 
 def check_department_access_level(user_id, department_id):
-    user = User.query.get(user_id)
+    user = load_principal(user_id)
     if is_admin(user) or is_counsellor(user):
         return True
     if is_hod(user, department_id):
         return True
     return False
 
+def check_student_access_level(user_id, student):
+    if student.user_id == user_id:
+        return True
+    if check_department_access_level(user_id, student.department_id):
+        return True
+    return StudentAdvisor.query.filter_by(student_id=student.id, advisor_user_id=user_id).first() is not None
+
+def get_department_leaderboard_query(department_id):
+    """
+    Department leaderboard as a single statement: latest approved totals per
+    account (from platform_account_stats), summed per student and ranked in SQL.
+    """
+    student_total = func.coalesce(func.sum(PlatformAccountStats.latest_total_solved), 0)
+
+    return db.session.query(
+        Student.id.label("student_id"),
+        User.full_name,
+        student_total.label("total_solved"),
+        func.row_number().over(order_by=(student_total.desc(), Student.id)).label("rank")
+    ).outerjoin(User, Student.user_id == User.id)\
+     .outerjoin(PlatformAccount, PlatformAccount.student_id == Student.id)\
+     .outerjoin(PlatformAccountStats, PlatformAccountStats.platform_account_id == PlatformAccount.id)\
+     .filter(Student.department_id == department_id)\
+     .group_by(Student.id, User.full_name)\
+     .order_by("rank")
+
 @analytics_bp.route("/department/<department_id>/leaderboard", methods=["GET"])
+@query_budget(3)
 @jwt_required()
+@response_cache.cached(lambda user_id, department_id: [f"department:{department_id}"])
 def get_department_leaderboard(department_id):
     current_user_id = get_jwt_identity()
     
@@ -85,44 +115,28 @@ def get_department_leaderboard(department_id):
     if not check_department_access_level(current_user_id, department_id):
         return error_response("Unauthorized access to this department leaderboard", 403)
 
-    # MVP Leaderboard Logic
-    students = Student.query.filter_by(department_id=department_id).all()
-    
+    results = get_department_leaderboard_query(department_id).all()
+
     leaderboard_data = []
-    
-    for student in students:
-        total_solved = 0
-        
-        accounts = PlatformAccount.query.filter_by(student_id=student.id).all()
-        for account in accounts:
-            latest_snapshot = PlatformSnapshot.query.filter_by(platform_account_id=account.id, status="approved")\
-                .order_by(PlatformSnapshot.snapshot_date.desc())\
-                .first()
-            if latest_snapshot:
-                total_solved += latest_snapshot.total_solved
-        
+    for r in results:
         leaderboard_data.append({
-            "student_id": student.id,
-            "full_name": student.user.full_name if student.user else "Unknown",
-            "total_solved": total_solved
+            "student_id": r.student_id,
+            "full_name": r.full_name if r.full_name else "Unknown",
+            "total_solved": r.total_solved,
+            "rank": r.rank
         })
-    
-    # Sort descending
-    leaderboard_data.sort(key=lambda x: x["total_solved"], reverse=True)
-    
-    # Assign ranks
-    for index, entry in enumerate(leaderboard_data):
-        entry["rank"] = index + 1
-        
+
     return success_response({
         "department_id": department.id,
         "department_name": department.name,
-        "total_students": len(students),
+        "total_students": len(leaderboard_data),
         "leaderboard": leaderboard_data
     })
 
 @analytics_bp.route("/my-summary", methods=["GET"])
+@query_budget(3)
 @jwt_required()
+@response_cache.cached(lambda user_id: [f"user:{user_id}"])
 def get_my_summary():
     current_user_id = get_jwt_identity()
 
@@ -130,107 +144,18 @@ def get_my_summary():
     if not student:
         return error_response("Access denied. Only students access this dashboard.", 403)
 
-    # Fetch Department Name
-    department_name = student.department.name if student.department else None
-
-    # Fetch Platform Accounts
-    accounts = PlatformAccount.query.filter_by(student_id=student.id).all()
-
-    platform_summary_list = []
-    
-    overall_total_solved = 0
-    total_rating_sum = 0
-    platforms_with_rating_count = 0
-    overall_growth = 0
-
-    for account in accounts:
-        # Fetch last 2 snapshots efficiently
-        snapshots = PlatformSnapshot.query.filter_by(platform_account_id=account.id, status="approved")\
-            .order_by(PlatformSnapshot.snapshot_date.desc())\
-            .limit(2)\
-            .all()
-
-        latest_total_solved = 0
-        latest_rating = 0
-        last_snapshot_date = None
-        total_growth = 0
-        growth_percentage = 0
-
-        if snapshots:
-            latest = snapshots[0]
-            latest_total_solved = latest.total_solved
-            latest_rating = latest.contest_rating if latest.contest_rating else 0
-            last_snapshot_date = latest.snapshot_date.isoformat()
-
-            # Global aggregation
-            overall_total_solved += latest_total_solved
-            
-            if latest.contest_rating:
-                total_rating_sum += latest.contest_rating
-                platforms_with_rating_count += 1
-
-            # Growth Calculation
-            if len(snapshots) >= 2:
-                previous = snapshots[1]
-                previous_total = previous.total_solved
-                total_growth = latest_total_solved - previous_total
-                
-                if previous_total > 0:
-                    growth_percentage = (total_growth / previous_total) * 100
-                else:
-                    growth_percentage = 0
-            
-            # Aggregate growth
-            overall_growth += total_growth
-
-        platform_summary_list.append({
-            "platform_name": account.platform_name,
-            "username": account.username,
-            "latest_total_solved": latest_total_solved,
-            "latest_rating": latest_rating,
-            "last_snapshot_date": last_snapshot_date,
-            "total_growth": total_growth,
-            "growth_percentage": round(growth_percentage, 2)
-        })
-
-    # Overall Averages
-    overall_rating_average = 0
-    if platforms_with_rating_count > 0:
-        overall_rating_average = total_rating_sum / platforms_with_rating_count
-
-    response_data = {
-        "student_info": {
-            "student_id": student.id,
-            "full_name": student.user.full_name,
-            "email": student.user.email,
-            "register_number": student.register_number,
-            "admission_year": student.admission_year,
-            "department_name": department_name
-        },
-        "platform_summary": platform_summary_list,
-        "overall_aggregation": {
-            "total_platforms_linked": len(accounts),
-            "overall_total_solved": overall_total_solved,
-            "overall_rating_average": round(overall_rating_average, 2),
-            "overall_growth": overall_growth
-        }
-    }
+    metrics = get_student_metrics([student.id])[student.id]
 
-    return success_response(response_data, "Student summary fetched successfully")
+    return success_response(student_summary_response(metrics), "Student summary fetched successfully")
 
 # --- Institutional Analytics ---
 
-def get_latest_snapshots_subquery():
-    """Helper to get the subquery for latest snapshots per account"""
-    return db.session.query(
-        PlatformSnapshot.platform_account_id,
-        func.max(PlatformSnapshot.snapshot_date).label('max_date')
-    ).filter(PlatformSnapshot.status == "approved").group_by(PlatformSnapshot.platform_account_id).subquery()
-
 @analytics_bp.route("/institution-summary", methods=["GET"])
+@query_budget(5)
 @jwt_required()
+@response_cache.cached(lambda user_id: ["institution"])
 def get_institution_summary():
-    user = User.query.get(get_jwt_identity())
+    user = current_principal()
     if not (is_admin(user) or is_hod(user, None) or is_counsellor(user)):
         return error_response("Access denied.", 403)
 
@@ -238,27 +163,16 @@ def get_institution_summary():
     total_departments = Department.query.count()
     total_linked_platforms = PlatformAccount.query.count()
 
-    # Calculate Totals from Latest Snapshots
-    subquery = get_latest_snapshots_subquery()
-    
-    # Query Latest Snapshots
+    # Calculate Totals and Growth (latest - previous) from Latest Approved Stats
     stats = db.session.query(
-        func.sum(PlatformSnapshot.total_solved).label('total_solved'),
-        func.avg(PlatformSnapshot.contest_rating).label('avg_rating')
-    ).join(subquery, and_(
-        PlatformSnapshot.platform_account_id == subquery.c.platform_account_id,
-        PlatformSnapshot.snapshot_date == subquery.c.max_date
-    )).first()
+        func.sum(PlatformAccountStats.latest_total_solved).label('total_solved'),
+        func.avg(PlatformAccountStats.latest_contest_rating).label('avg_rating'),
+        func.sum(PlatformAccountStats.solved_growth).label('total_growth')
+    ).first()
 
     total_problems_solved = stats.total_solved if stats.total_solved else 0
     average_rating = float(stats.avg_rating) if stats.avg_rating else 0.0
-
-    # Approximating Total Growth (Latest - Previous is hard to do efficiently in one massive query for MVP)
-    # We will assume total_growth is 0 for this aggregated view for now, or perform a simpler estimation 
-    # if required, but strict accuracy requires iterating all pairs which is slow.
-    # The prompt asks for it. I will implement a simpler sum of "last known growth" if I had it.
-    # For now, return 0 to avoid N+1 timeout on large datasets.
-    total_growth = 0 
+    total_growth = stats.total_growth if stats.total_growth else 0
 
     return success_response({
         "total_students": total_students,
@@ -269,150 +183,359 @@ def get_institution_summary():
         "total_growth": total_growth
     })
 
+def department_performance_tags(user_id):
+    # "departments" covers departments being added or removed
+    return ["departments", *(f"department:{department_id}" for department_id, in db.session.query(Department.id))]
+
 @analytics_bp.route("/department-performance", methods=["GET"])
 @jwt_required()
+@response_cache.cached(department_performance_tags)
 def get_department_performance():
-    user = User.query.get(get_jwt_identity())
+    user = current_principal()
     if not (is_admin(user) or is_counsellor(user) or is_hod(user, None)):
         return error_response("Access denied.", 403)
 
-    subquery = get_latest_snapshots_subquery()
-    
-    # We need: Dept Name -> Sum(LatestSnapshot.total_solved)
-    results = db.session.query(
-        Department.id,
-        Department.name,
-        func.count(func.distinct(Student.id)).label('student_count'),
-        func.sum(PlatformSnapshot.total_solved).label('total_solved')
-    ).join(Student, Department.students)\
-     .outerjoin(PlatformAccount, Student.platform_accounts)\
-     .outerjoin(subquery, PlatformAccount.id == subquery.c.platform_account_id)\
-     .outerjoin(PlatformSnapshot, and_(
-         PlatformSnapshot.platform_account_id == subquery.c.platform_account_id,
-         PlatformSnapshot.snapshot_date == subquery.c.max_date
-     ))\
-     .group_by(Department.id).all()
+    # Student and account counts are live: roster changes outside the
+    # approval path (registration, bulk seeding) never touch the rollup
+    counts = live_department_stats(counts_only=True)
+
+    # Latest rollup row per department (department_daily_stats)
+    latest = db.session.query(
+        DepartmentDailyStats.department_id,
+        func.max(DepartmentDailyStats.stat_date).label('stat_date')
+    ).group_by(DepartmentDailyStats.department_id).subquery()
+
+    results = db.session.query(Department.id, Department.name, DepartmentDailyStats)\
+        .outerjoin(latest, latest.c.department_id == Department.id)\
+        .outerjoin(DepartmentDailyStats, and_(
+            DepartmentDailyStats.department_id == latest.c.department_id,
+            DepartmentDailyStats.stat_date == latest.c.stat_date
+        )).all()
+
+    # Departments without a rollup row yet (new, or not backfilled) are aggregated live
+    missing = [department_id for department_id, _, stats in results
+               if stats is None and counts[department_id]["student_count"]]
+    live = live_department_stats(missing) if missing else {}
+    today = datetime.utcnow().date()
 
     data = []
-    for r in results:
+    for department_id, department_name, stats in results:
+        count = counts[department_id]
+        if not count["student_count"]:
+            continue
+        if stats is not None:
+            metrics = {
+                "total_solved": stats.total_solved,
+                "average_rating": stats.average_rating,
+                "active_students": stats.active_students,
+                "growth": stats.growth,
+                "as_of": stats.stat_date
+            }
+        else:
+            metrics = {**live[department_id], "as_of": today}
         data.append({
-            "department_id": r.id,
-            "department_name": r.name,
-            "total_students": r.student_count,
-            "total_solved": r.total_solved if r.total_solved else 0
+            "department_id": department_id,
+            "department_name": department_name,
+            "total_students": count["student_count"],
+            "total_solved": int(metrics["total_solved"]),
+            "linked_accounts": count["linked_accounts"],
+            "average_rating": round(float(metrics["average_rating"]), 2) if metrics["average_rating"] is not None else 0,
+            "active_students": metrics["active_students"],
+            "growth": int(metrics["growth"]),
+            "as_of": metrics["as_of"].isoformat()
         })
 
     # Sort
     data.sort(key=lambda x: x['total_solved'], reverse=True)
     return success_response(data)
 
+@analytics_bp.route("/department/<department_id>/trend", methods=["GET"])
+@jwt_required()
+@response_cache.cached(lambda user_id, department_id: [f"department:{department_id}"])
+def get_department_trend(department_id):
+    current_user_id = get_jwt_identity()
+
+    department = Department.query.get(department_id)
+    if not department:
+        return error_response("Department not found", 404)
+
+    if not check_department_access_level(current_user_id, department_id):
+        return error_response("Unauthorized access to this department", 403)
+
+    try:
+        end_date = datetime.strptime(request.args["to"], "%Y-%m-%d").date() if request.args.get("to") else datetime.utcnow().date()
+        start_date = datetime.strptime(request.args["from"], "%Y-%m-%d").date() if request.args.get("from") else end_date - timedelta(days=90)
+    except ValueError:
+        return error_response("Invalid date format. Use YYYY-MM-DD")
+
+    rows = DepartmentDailyStats.query.filter(
+        DepartmentDailyStats.department_id == department_id,
+        DepartmentDailyStats.stat_date >= start_date,
+        DepartmentDailyStats.stat_date <= end_date
+    ).order_by(DepartmentDailyStats.stat_date).all()
+
+    return success_response({
+        "department_id": department.id,
+        "department_name": department.name,
+        "from": start_date.isoformat(),
+        "to": end_date.isoformat(),
+        "series": [r.to_dict() for r in rows]
+    })
+
+def parse_series_args():
+    """interval/from/to query args; defaults to the last 12 weeks or months"""
+    interval = request.args.get("interval", "week")
+    if interval not in INTERVALS:
+        raise ValueError("Invalid interval. Use 'week' or 'month'")
+
+    try:
+        end_date = datetime.strptime(request.args["to"], "%Y-%m-%d").date() if request.args.get("to") else datetime.utcnow().date()
+        if request.args.get("from"):
+            start_date = datetime.strptime(request.args["from"], "%Y-%m-%d").date()
+        elif interval == "week":
+            start_date = end_date - timedelta(weeks=11)
+        else:
+            start_date = end_date.replace(day=1) - timedelta(days=330)
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+
+    if start_date > end_date:
+        raise ValueError("'from' must not be after 'to'")
+    return interval, start_date, end_date
+
+def series_response(scope, scope_id, extra):
+    try:
+        interval, start_date, end_date = parse_series_args()
+    except ValueError as e:
+        return error_response(str(e))
+
+    return success_response({
+        **extra,
+        "interval": interval,
+        "from": start_date.isoformat(),
+        "to": end_date.isoformat(),
+        "series": growth_series(scope, scope_id, interval, start_date, end_date)
+    })
+
+@analytics_bp.route("/timeseries/account/<platform_account_id>", methods=["GET"])
+@query_budget(3)
+@jwt_required()
+@response_cache.cached(lambda user_id, platform_account_id: [f"account:{platform_account_id}"])
+def get_account_series(platform_account_id):
+    current_user_id = get_jwt_identity()
+
+    account = PlatformAccount.query.get(platform_account_id)
+    if not account:
+        return error_response("Platform account not found", 404)
+
+    if not check_student_access_level(current_user_id, account.student):
+        return error_response("Unauthorized access to this platform account", 403)
+
+    return series_response("account", account.id, {
+        "platform_account_id": account.id,
+        "platform": account.platform_name
+    })
+
+@analytics_bp.route("/timeseries/student/<student_id>", methods=["GET"])
+@query_budget(3)
+@jwt_required()
+@response_cache.cached(lambda user_id, student_id: [f"student:{student_id}"])
+def get_student_series(student_id):
+    current_user_id = get_jwt_identity()
+
+    student = Student.query.get(student_id)
+    if not student:
+        return error_response("Student not found", 404)
+
+    if not check_student_access_level(current_user_id, student):
+        return error_response("Unauthorized access to this student", 403)
+
+    return series_response("student", student.id, {"student_id": student.id})
+
+@analytics_bp.route("/timeseries/department/<department_id>", methods=["GET"])
+@query_budget(3)
+@jwt_required()
+@response_cache.cached(lambda user_id, department_id: [f"department:{department_id}"])
+def get_department_series(department_id):
+    current_user_id = get_jwt_identity()
+
+    department = Department.query.get(department_id)
+    if not department:
+        return error_response("Department not found", 404)
+
+    if not check_department_access_level(current_user_id, department_id):
+        return error_response("Unauthorized access to this department", 403)
+
+    return series_response("department", department.id, {
+        "department_id": department.id,
+        "department_name": department.name
+    })
+
+TOP_PERFORMER_PARTITIONS = ("none", "department", "admission_year", "platform")
+TOP_PERFORMER_METRICS = ("solved", "rating")
+
+def get_top_performers_query(partition="none", metric="solved", department_id=None):
+    """
+    Ranked performers in one statement. RANK() and PERCENT_RANK() are computed
+    per partition (department, admission year, platform or everyone); the
+    `position` column (ROW_NUMBER) is what pages are cut on.
+    """
+    if partition == "platform":
+        # One entry per platform account
+        solved = PlatformAccountStats.latest_total_solved
+        rating = PlatformAccountStats.latest_contest_rating
+        base = db.session.query(
+            Student.id.label("student_id"),
+            PlatformAccount.platform_name.label("platform"),
+            solved.label("total_solved"),
+            rating.label("average_rating")
+        )
+    else:
+        # One entry per student, summed over their accounts
+        solved = func.sum(PlatformAccountStats.latest_total_solved)
+        rating = func.avg(PlatformAccountStats.latest_contest_rating)
+        base = db.session.query(
+            Student.id.label("student_id"),
+            solved.label("total_solved"),
+            rating.label("average_rating")
+        )
+
+    base = base.join(PlatformAccount, PlatformAccount.student_id == Student.id)\
+        .join(PlatformAccountStats, PlatformAccountStats.platform_account_id == PlatformAccount.id)
+    if department_id:
+        base = base.filter(Student.department_id == department_id)
+    if partition == "platform":
+        if metric == "rating":
+            base = base.filter(rating.isnot(None))
+    else:
+        base = base.group_by(Student.id)
+        if metric == "rating":
+            base = base.having(rating.isnot(None))
+    base = base.subquery()
+
+    value = base.c.average_rating if metric == "rating" else base.c.total_solved
+    if partition == "platform":
+        partition_by = base.c.platform
+    else:
+        partition_by = {
+            "none": None,
+            "department": Student.department_id,
+            "admission_year": Student.admission_year
+        }[partition]
+
+    return db.session.query(
+        base,
+        User.full_name,
+        Student.department_id,
+        Department.name.label("department_name"),
+        Student.admission_year,
+        (partition_by if partition_by is not None else literal(None)).label("group"),
+        func.rank().over(partition_by=partition_by, order_by=value.desc()).label("rank"),
+        func.percent_rank().over(partition_by=partition_by, order_by=value.desc()).label("percent_rank"),
+        func.row_number().over(partition_by=partition_by, order_by=(value.desc(), base.c.student_id)).label("position"),
+        func.count().over(partition_by=partition_by).label("group_size")
+    ).select_from(base)\
+     .join(Student, Student.id == base.c.student_id)\
+     .join(User, Student.user_id == User.id)\
+     .outerjoin(Department, Student.department_id == Department.id)\
+     .subquery()
+
 @analytics_bp.route("/top-performers", methods=["GET"])
+@query_budget(2)
 @jwt_required()
+@response_cache.cached(lambda user_id: ["institution"])
 def get_top_performers():
-    user = User.query.get(get_jwt_identity())
+    """
+    ?partition=none|department|admission_year|platform  top `limit` per group
+    ?metric=solved|rating                              ranking value
+    ?offset=N                                          next page within each group
+    ?department_id=                                    restrict to one department
+    """
+    user = current_principal()
     if not (is_admin(user) or is_counsellor(user) or is_hod(user, None)):
         return error_response("Access denied.", 403)
 
-    limit = int(request.args.get('limit', 10))
-
-    subquery = get_latest_snapshots_subquery()
-    
-    # Rank by sum of total_solved across all accounts
-    results = db.session.query(
-        Student.id,
-        User.full_name,
-        Department.name.label('dept_name'),
-        func.sum(PlatformSnapshot.total_solved).label('total_solved'),
-        func.avg(PlatformSnapshot.contest_rating).label('avg_rating')
-    ).join(User, Student.user_id == User.id)\
-     .outerjoin(Department, Student.department_id == Department.id)\
-     .join(PlatformAccount, Student.platform_accounts)\
-     .join(subquery, PlatformAccount.id == subquery.c.platform_account_id)\
-     .join(PlatformSnapshot, and_(
-         PlatformSnapshot.platform_account_id == subquery.c.platform_account_id,
-         PlatformSnapshot.snapshot_date == subquery.c.max_date
-     ))\
-     .group_by(Student.id, User.full_name, Department.name)\
-     .order_by(func.sum(PlatformSnapshot.total_solved).desc())\
-     .limit(limit).all()
+    partition = request.args.get('partition', 'none')
+    metric = request.args.get('metric', 'solved')
+    if partition not in TOP_PERFORMER_PARTITIONS:
+        return error_response(f"Invalid partition. Use one of: {', '.join(TOP_PERFORMER_PARTITIONS)}")
+    if metric not in TOP_PERFORMER_METRICS:
+        return error_response(f"Invalid metric. Use one of: {', '.join(TOP_PERFORMER_METRICS)}")
+
+    try:
+        limit = min(int(request.args.get('limit', 10)), 100)
+        offset = int(request.args.get('offset', 0))
+        if limit < 1 or offset < 0:
+            raise ValueError
+    except ValueError:
+        return error_response("Invalid limit or offset")
+
+    ranked = get_top_performers_query(partition, metric, request.args.get('department_id'))
+    results = db.session.query(ranked)\
+        .filter(ranked.c.position > offset, ranked.c.position <= offset + limit)\
+        .order_by(ranked.c.group, ranked.c.position).all()
 
     data = []
-    for i, r in enumerate(results):
-        data.append({
-            "rank": i + 1,
-            "student_id": r.id,
+    for r in results:
+        item = {
+            "rank": r.rank,
+            "percentile": round((1 - float(r.percent_rank)) * 100, 2),
+            "position": r.position,
+            "group": r.group,
+            "group_size": r.group_size,
+            "student_id": r.student_id,
             "full_name": r.full_name,
-            "department_name": r.dept_name,
+            "department_id": r.department_id,
+            "department_name": r.department_name,
+            "admission_year": r.admission_year,
             "total_solved": r.total_solved if r.total_solved else 0,
-            "average_rating": round(float(r.avg_rating), 2) if r.avg_rating else 0
-        })
+            "average_rating": round(float(r.average_rating), 2) if r.average_rating else 0
+        }
+        if partition == "platform":
+            item["platform"] = r.platform
+        data.append(item)
 
     return success_response(data)
 
 @analytics_bp.route("/at-risk", methods=["GET"])
+@query_budget(3)
 @jwt_required()
+@response_cache.cached(lambda user_id: ["institution"])
 def get_at_risk_students():
-    user = User.query.get(get_jwt_identity())
+    user = current_principal()
     if not (is_admin(user) or is_counsellor(user) or is_hod(user, None)):
         return error_response("Access denied.", 403)
 
-    # Risk Criteria:
-    # 1. No snapshot in last 30 days
-    # 2. Growth <= 0 (Using python logic for simplicity as requested to avoid massive SQL)
-    
-    # Get all students
-    students = Student.query.all()
+    # Risk Criteria (thresholds from AT_RISK_* config):
+    # 1. No approved snapshot within the inactivity window
+    # 2. Growth at or below the minimum (decline flagged separately)
+    # Students without linked accounts are new, not at risk.
+    report = evaluate_at_risk()
+
     at_risk = []
-    
-    cutoff_date = datetime.utcnow().date() - timedelta(days=30)
-    
-    for student in students:
-        is_risk = False
-        reason = ""
-        growth = 0
-        last_date = None
-        
-        accounts = PlatformAccount.query.filter_by(student_id=student.id).all()
-        if not accounts:
-            continue # No accounts -> maybe new student, not necessarily 'at risk' of failing logic? 
-                     # Or maybe implies inactive. Let's ignore empty for now or add as inactive.
-        
-        has_recent_activity = False
-        total_student_growth = 0
-
-        for account in accounts:
-            snapshots = PlatformSnapshot.query.filter_by(platform_account_id=account.id, status="approved")\
-                .order_by(PlatformSnapshot.snapshot_date.desc())\
-                .limit(2)\
-                .all()
-            
-            if snapshots:
-                latest = snapshots[0]
-                if latest.snapshot_date >= cutoff_date:
-                    has_recent_activity = True
-                
-                # Update last known date
-                if last_date is None or latest.snapshot_date > last_date:
-                    last_date = latest.snapshot_date
-
-                if len(snapshots) >= 2:
-                    total_student_growth += (latest.total_solved - snapshots[1].total_solved)
-        
-        if not has_recent_activity:
-            is_risk = True
-            reason = "No Activity > 30 Days"
-        elif total_student_growth <= 0:
-            is_risk = True
+    for row in report.rows(only_risk=True, require_accounts=True):
+        if row["is_inactive"]:
+            reason = f"No Activity > {report.inactivity_days} Days"
+        else:
             reason = "No Growth / Decline"
-        
-        if is_risk:
-            at_risk.append({
-                "student_id": student.id,
-                "full_name": student.user.full_name,
-                "department_name": student.department.name if student.department else "Unassigned",
-                "growth": total_student_growth,
-                "last_snapshot_date": last_date.isoformat() if last_date else "Never",
-                "reason": reason
-            })
+
+        at_risk.append({
+            "student_id": row["student_id"],
+            "full_name": row["full_name"],
+            "department_name": row["department_name"] if row["department_name"] else "Unassigned",
+            "growth": row["growth"],
+            "last_snapshot_date": row["last_snapshot_date"].isoformat() if row["last_snapshot_date"] else "Never",
+            "is_declining": row["is_declining"],
+            "reason": reason
+        })
     
     return success_response(at_risk)
+
+@analytics_bp.route("/cache-stats", methods=["GET"])
+@jwt_required()
+def get_cache_stats():
+    user = current_principal()
+    if not is_admin(user):
+        return error_response("Access denied.", 403)
+
+    return success_response(response_cache.stats())
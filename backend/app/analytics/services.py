@@ -0,0 +1,436 @@
+from datetime import datetime, timedelta
+import numpy as np
+from flask import current_app
+from sqlalchemy import select, insert, delete, func, case, literal, union_all
+from app.extensions import db
+from app.auth.models import User
+from app.academics.models import Department
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.models import PlatformAccountStats, DepartmentDailyStats
+
+STATS_COLUMNS = [
+    "platform_account_id",
+    "latest_snapshot_date", "latest_total_solved", "latest_contest_rating", "latest_global_rank",
+    "previous_snapshot_date", "previous_total_solved", "previous_contest_rating", "previous_global_rank",
+    "updated_at"
+]
+
+def _account_stats_select(account_ids=None, since=None):
+    """
+    SELECT producing one platform_account_stats row per account with approved
+    snapshots. `since` bounds snapshot_date so partitioned tables are pruned.
+    """
+    ranked = select(
+        PlatformSnapshot.platform_account_id,
+        PlatformSnapshot.snapshot_date,
+        PlatformSnapshot.total_solved,
+        PlatformSnapshot.contest_rating,
+        PlatformSnapshot.global_rank,
+        func.row_number().over(
+            partition_by=PlatformSnapshot.platform_account_id,
+            order_by=PlatformSnapshot.snapshot_date.desc()
+        ).label("rn")
+    ).where(PlatformSnapshot.status == "approved")
+
+    if account_ids is not None:
+        ranked = ranked.where(PlatformSnapshot.platform_account_id.in_(account_ids))
+    if since is not None:
+        ranked = ranked.where(PlatformSnapshot.snapshot_date >= since)
+
+    ranked = ranked.subquery()
+
+    def pick(column, rn):
+        return func.max(case((ranked.c.rn == rn, column)))
+
+    return select(
+        ranked.c.platform_account_id,
+        pick(ranked.c.snapshot_date, 1),
+        pick(ranked.c.total_solved, 1),
+        pick(ranked.c.contest_rating, 1),
+        pick(ranked.c.global_rank, 1),
+        pick(ranked.c.snapshot_date, 2),
+        pick(ranked.c.total_solved, 2),
+        pick(ranked.c.contest_rating, 2),
+        pick(ranked.c.global_rank, 2),
+        literal(datetime.utcnow(), db.DateTime)
+    ).where(ranked.c.rn <= 2).group_by(ranked.c.platform_account_id)
+
+def refresh_account_stats(account_ids, since=None):
+    """
+    Recompute platform_account_stats for the given accounts inside the
+    caller's transaction. The caller commits.
+
+    `since` is the earliest snapshot_date whose approval changed. When every
+    account already has a previous snapshot, the new top two can only come
+    from min(since, previous_snapshot_date) onward, so older snapshot
+    partitions are not read.
+    """
+    account_ids = list(set(account_ids))
+    if not account_ids:
+        return
+
+    db.session.flush()
+
+    lower_bound = None
+    if since is not None:
+        previous_dates = [r[0] for r in db.session.query(PlatformAccountStats.previous_snapshot_date)
+                          .filter(PlatformAccountStats.platform_account_id.in_(account_ids)).all()]
+        if len(previous_dates) == len(account_ids) and all(previous_dates):
+            lower_bound = min(since, *previous_dates)
+
+    db.session.execute(
+        delete(PlatformAccountStats)
+        .where(PlatformAccountStats.platform_account_id.in_(account_ids))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(
+        insert(PlatformAccountStats).from_select(STATS_COLUMNS, _account_stats_select(account_ids, lower_bound))
+    )
+    db.session.expire_all()
+
+def rebuild_account_stats():
+    """Rebuild platform_account_stats from the full approved snapshot history"""
+    db.session.execute(delete(PlatformAccountStats))
+    db.session.execute(
+        insert(PlatformAccountStats).from_select(STATS_COLUMNS, _account_stats_select())
+    )
+    db.session.commit()
+    return PlatformAccountStats.query.count()
+
+# --- Student Metrics ---
+
+def query_student_rows(student_scope=None):
+    """Students with user and department names. `student_scope` is a list or SELECT of ids."""
+    query = db.session.query(
+        Student.id,
+        User.full_name,
+        User.email,
+        Student.register_number,
+        Student.admission_year,
+        Student.department_id,
+        Department.name.label("department_name")
+    ).join(User, Student.user_id == User.id)\
+     .outerjoin(Department, Student.department_id == Department.id)
+
+    if student_scope is not None:
+        query = query.filter(Student.id.in_(student_scope))
+    return query
+
+def query_account_rows(student_scope=None):
+    """Platform accounts with their latest approved stats (NULLs when none)"""
+    query = db.session.query(
+        PlatformAccount.id,
+        PlatformAccount.student_id,
+        PlatformAccount.platform_name,
+        PlatformAccount.username,
+        PlatformAccountStats.latest_snapshot_date,
+        PlatformAccountStats.latest_total_solved,
+        PlatformAccountStats.latest_contest_rating,
+        PlatformAccountStats.previous_total_solved
+    ).outerjoin(PlatformAccountStats, PlatformAccountStats.platform_account_id == PlatformAccount.id)
+
+    if student_scope is not None:
+        query = query.filter(PlatformAccount.student_id.in_(student_scope))
+    return query
+
+def _account_metrics(row):
+    latest_total_solved = 0
+    latest_rating = 0
+    total_growth = 0
+    growth_percentage = 0
+
+    if row.latest_snapshot_date is not None:
+        latest_total_solved = row.latest_total_solved
+        latest_rating = row.latest_contest_rating if row.latest_contest_rating else 0
+
+        if row.previous_total_solved is not None:
+            total_growth = latest_total_solved - row.previous_total_solved
+            if row.previous_total_solved > 0:
+                growth_percentage = (total_growth / row.previous_total_solved) * 100
+
+    return {
+        "platform_account_id": row.id,
+        "platform_name": row.platform_name,
+        "username": row.username,
+        "latest_total_solved": latest_total_solved,
+        "latest_rating": latest_rating,
+        "last_snapshot_date": row.latest_snapshot_date,
+        "total_growth": total_growth,
+        "growth_percentage": round(growth_percentage, 2)
+    }
+
+def get_student_metrics(student_ids):
+    """
+    Per-student and per-account metrics for `student_ids` (a list or SELECT of
+    ids) in two queries, regardless of how many students are requested.
+
+    Returns a dict keyed by student id. Each value holds the student's profile
+    fields, a "platforms" list of per-account metrics and the aggregates
+    total_solved, growth, last_active and rating_average.
+    """
+    metrics = {}
+    for row in query_student_rows(student_ids).all():
+        metrics[row.id] = {
+            "student_id": row.id,
+            "full_name": row.full_name,
+            "email": row.email,
+            "register_number": row.register_number,
+            "admission_year": row.admission_year,
+            "department_id": row.department_id,
+            "department_name": row.department_name,
+            "platforms": [],
+            "total_solved": 0,
+            "growth": 0,
+            "last_active": None,
+            "rating_average": 0
+        }
+
+    rating_totals = {}
+    for row in query_account_rows(student_ids).all():
+        student = metrics.get(row.student_id)
+        if student is None:
+            continue
+
+        account = _account_metrics(row)
+        student["platforms"].append(account)
+        student["total_solved"] += account["latest_total_solved"]
+        student["growth"] += account["total_growth"]
+
+        last_date = account["last_snapshot_date"]
+        if last_date and (student["last_active"] is None or last_date > student["last_active"]):
+            student["last_active"] = last_date
+
+        if row.latest_contest_rating:
+            rating_sum, rating_count = rating_totals.get(row.student_id, (0, 0))
+            rating_totals[row.student_id] = (rating_sum + row.latest_contest_rating, rating_count + 1)
+
+    for student_id, (rating_sum, rating_count) in rating_totals.items():
+        metrics[student_id]["rating_average"] = rating_sum / rating_count
+
+    return metrics
+
+def student_summary_response(metrics, include_account_ids=False):
+    """Shape one get_student_metrics entry as the student dashboard summary payload"""
+    platform_summary_list = []
+    for account in metrics["platforms"]:
+        entry = dict(account)
+        entry["last_snapshot_date"] = account["last_snapshot_date"].isoformat() if account["last_snapshot_date"] else None
+        if not include_account_ids:
+            del entry["platform_account_id"]
+        platform_summary_list.append(entry)
+
+    return {
+        "student_info": {
+            "student_id": metrics["student_id"],
+            "full_name": metrics["full_name"],
+            "email": metrics["email"],
+            "register_number": metrics["register_number"],
+            "admission_year": metrics["admission_year"],
+            "department_name": metrics["department_name"]
+        },
+        "platform_summary": platform_summary_list,
+        "overall_aggregation": {
+            "total_platforms_linked": len(metrics["platforms"]),
+            "overall_total_solved": metrics["total_solved"],
+            "overall_rating_average": round(metrics["rating_average"], 2),
+            "overall_growth": metrics["growth"]
+        }
+    }
+
+# --- Department Daily Rollup ---
+
+def _department_snapshot_rows(department_id, start_date, end_date):
+    """
+    Approved snapshots of the department's accounts that are the latest or
+    previous value on some day in [start_date, end_date]: everything inside the
+    range plus the two most recent before it. Ordered by account and date.
+    """
+    columns = (
+        PlatformAccount.student_id,
+        PlatformSnapshot.platform_account_id,
+        PlatformSnapshot.snapshot_date,
+        PlatformSnapshot.total_solved,
+        PlatformSnapshot.contest_rating
+    )
+    scope = (
+        PlatformSnapshot.status == "approved",
+        Student.department_id == department_id
+    )
+
+    before = select(
+        *columns,
+        func.row_number().over(
+            partition_by=PlatformSnapshot.platform_account_id,
+            order_by=PlatformSnapshot.snapshot_date.desc()
+        ).label("rn")
+    ).join(PlatformAccount, PlatformSnapshot.platform_account_id == PlatformAccount.id)\
+     .join(Student, PlatformAccount.student_id == Student.id)\
+     .where(*scope, PlatformSnapshot.snapshot_date < start_date)\
+     .subquery()
+
+    within = select(*columns)\
+        .join(PlatformAccount, PlatformSnapshot.platform_account_id == PlatformAccount.id)\
+        .join(Student, PlatformAccount.student_id == Student.id)\
+        .where(*scope, PlatformSnapshot.snapshot_date >= start_date, PlatformSnapshot.snapshot_date <= end_date)
+
+    combined = union_all(
+        select(
+            before.c.student_id, before.c.platform_account_id, before.c.snapshot_date,
+            before.c.total_solved, before.c.contest_rating
+        ).where(before.c.rn <= 2),
+        within
+    ).subquery()
+
+    return db.session.execute(
+        select(combined).order_by(combined.c.platform_account_id, combined.c.snapshot_date)
+    ).all()
+
+def _spread(n_days, begin, end, values):
+    """Sum `values` over the half-open day ranges [begin, end) with a difference array"""
+    diff = np.zeros(n_days + 1)
+    np.add.at(diff, begin, values)
+    np.add.at(diff, end, -values)
+    return np.cumsum(diff[:-1])
+
+def compute_department_daily_stats(department_id, start_date, end_date, inactivity_days=None):
+    """
+    Compute department_daily_stats rows for every day in [start_date, end_date].
+
+    Each approved snapshot is the account's latest value from its date until
+    the next snapshot, so daily totals, growth and ratings are built with
+    difference arrays in one pass over the loaded rows. A student is active on
+    a day when their latest snapshot is at most `inactivity_days` old.
+    """
+    if inactivity_days is None:
+        inactivity_days = current_app.config["AT_RISK_INACTIVITY_DAYS"]
+    n_days = (end_date - start_date).days + 1
+
+    counts = db.session.query(
+        func.count(func.distinct(Student.id)),
+        func.count(PlatformAccount.id)
+    ).outerjoin(PlatformAccount, PlatformAccount.student_id == Student.id)\
+     .filter(Student.department_id == department_id).first()
+
+    total = growth = rating_sum = rating_count = active = np.zeros(n_days)
+
+    rows = _department_snapshot_rows(department_id, start_date, end_date)
+    if rows:
+        _, account = np.unique([r.platform_account_id for r in rows], return_inverse=True)
+        _, student = np.unique([r.student_id for r in rows], return_inverse=True)
+        day = np.array([(r.snapshot_date - start_date).days for r in rows], dtype=np.int64)
+        solved = np.array([r.total_solved for r in rows], dtype=np.float64)
+        rating = np.array([r.contest_rating if r.contest_rating is not None else np.nan for r in rows])
+
+        # Per account: a snapshot is "latest" until the account's next snapshot
+        same_next = np.append(account[1:] == account[:-1], False)
+        same_prev = np.insert(account[1:] == account[:-1], 0, False)
+        next_day = np.where(same_next, np.append(day[1:], n_days), n_days)
+        begin = np.clip(day, 0, n_days)
+        end = np.clip(next_day, 0, n_days)
+
+        delta = np.where(same_prev, solved - np.insert(solved[:-1], 0, 0), 0)
+        has_rating = ~np.isnan(rating)
+
+        total = _spread(n_days, begin, end, solved)
+        growth = _spread(n_days, begin, end, delta)
+        rating_sum = _spread(n_days, begin, end, np.where(has_rating, rating, 0))
+        rating_count = _spread(n_days, begin, end, has_rating.astype(np.float64))
+
+        # Per student: each snapshot covers [date, date + window] until the student's next snapshot
+        order = np.lexsort((day, student))
+        s_student, s_day = student[order], day[order]
+        same_next_student = np.append(s_student[1:] == s_student[:-1], False)
+        cover_end = s_day + inactivity_days + 1
+        cover_end = np.where(same_next_student, np.minimum(cover_end, np.append(s_day[1:], 0)), cover_end)
+        active = _spread(n_days, np.clip(s_day, 0, n_days), np.clip(cover_end, 0, n_days), np.ones(len(s_day)))
+
+    now = datetime.utcnow()
+    stats_rows = []
+    for i in range(n_days):
+        stats_rows.append({
+            "department_id": department_id,
+            "stat_date": start_date + timedelta(days=i),
+            "student_count": counts[0],
+            "linked_accounts": counts[1],
+            "total_solved": int(round(total[i])),
+            "average_rating": float(rating_sum[i] / rating_count[i]) if rating_count[i] > 0 else None,
+            "active_students": int(round(active[i])),
+            "growth": int(round(growth[i])),
+            "updated_at": now
+        })
+    return stats_rows
+
+def _write_department_daily_stats(department_id, start_date, end_date):
+    rows = compute_department_daily_stats(department_id, start_date, end_date)
+    db.session.execute(
+        delete(DepartmentDailyStats).where(
+            DepartmentDailyStats.department_id == department_id,
+            DepartmentDailyStats.stat_date >= start_date,
+            DepartmentDailyStats.stat_date <= end_date
+        ).execution_options(synchronize_session=False)
+    )
+    db.session.execute(insert(DepartmentDailyStats), rows)
+    return len(rows)
+
+def refresh_department_daily_stats(department_ids, since=None):
+    """
+    Incrementally refresh the rollup inside the caller's transaction.
+
+    Today's row is always recomputed. When `since` is given (e.g. the date of
+    a back-dated snapshot), existing rows from that date onward are
+    recomputed too; days before the department's first rollup row are left
+    to the backfill command. The caller commits.
+    """
+    today = datetime.utcnow().date()
+    db.session.flush()
+
+    for department_id in set(d for d in department_ids if d):
+        start_date = today
+        if since is not None and since < today:
+            earliest = db.session.query(func.min(DepartmentDailyStats.stat_date))\
+                .filter(DepartmentDailyStats.department_id == department_id).scalar()
+            if earliest is not None:
+                start_date = max(since, earliest)
+        _write_department_daily_stats(department_id, start_date, today)
+
+def live_department_stats(department_ids=None, counts_only=False):
+    """
+    Current per-department figures straight from students, accounts and
+    platform_account_stats, keyed by department id. Used where the rollup
+    has no row yet; counts_only skips the solved/rating/activity aggregates.
+    """
+    columns = [
+        Department.id,
+        func.count(func.distinct(Student.id)).label("student_count"),
+        func.count(PlatformAccount.id).label("linked_accounts")
+    ]
+    query = db.session.query(*columns)\
+        .outerjoin(Student, Student.department_id == Department.id)\
+        .outerjoin(PlatformAccount, PlatformAccount.student_id == Student.id)
+    if not counts_only:
+        cutoff = datetime.utcnow().date() - timedelta(days=current_app.config["AT_RISK_INACTIVITY_DAYS"])
+        query = query.outerjoin(PlatformAccountStats, PlatformAccountStats.platform_account_id == PlatformAccount.id)\
+            .add_columns(
+                func.coalesce(func.sum(PlatformAccountStats.latest_total_solved), 0).label("total_solved"),
+                func.avg(PlatformAccountStats.latest_contest_rating).label("average_rating"),
+                func.count(func.distinct(case(
+                    (PlatformAccountStats.latest_snapshot_date >= cutoff, Student.id)
+                ))).label("active_students"),
+                func.coalesce(func.sum(PlatformAccountStats.solved_growth), 0).label("growth")
+            )
+    if department_ids is not None:
+        query = query.filter(Department.id.in_(department_ids))
+    return {row.id: row._asdict() for row in query.group_by(Department.id).all()}
+
+def backfill_department_daily_stats(start_date, end_date, department_ids=None):
+    """Recompute the rollup for [start_date, end_date], one department per transaction"""
+    if department_ids is None:
+        department_ids = [d.id for d in Department.query.all()]
+
+    written = 0
+    for department_id in department_ids:
+        written += _write_department_daily_stats(department_id, start_date, end_date)
+        db.session.commit()
+    return written
@@ -0,0 +1,154 @@
+"""
+Weekly and monthly growth series bucketed in SQL.
+
+Snapshots are bucketed with date_trunc on Postgres and date() modifiers on
+SQLite. Within each bucket the account's last approved snapshot is its value
+for that period, and LAG() over the buckets gives the change from the
+previous period. Only snapshots inside the requested range, plus each
+account's latest value before it, are read.
+"""
+
+from datetime import date, timedelta
+from sqlalchemy import select, func, cast, literal, union_all, type_coerce
+from app.extensions import db
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+
+INTERVALS = ("week", "month")
+
+def bucket_start(column, interval):
+    """SQL expression for the first day of the week (Monday) or month containing `column`"""
+    if db.session.get_bind().dialect.name == "postgresql":
+        return cast(func.date_trunc(interval, column), db.Date)
+    if interval == "week":
+        return type_coerce(func.date(column, "weekday 0", "-6 days"), db.Date)
+    return type_coerce(func.date(column, "start of month"), db.Date)
+
+def period_start(day, interval):
+    """Python equivalent of bucket_start"""
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+def next_period(day, interval):
+    if interval == "week":
+        return day + timedelta(days=7)
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+def previous_period(day, interval):
+    if interval == "week":
+        return day - timedelta(days=7)
+    return date(day.year - (day.month == 1), (day.month - 2) % 12 + 1, 1)
+
+def _scoped(query, scope, scope_id):
+    query = query.join(PlatformAccount, PlatformSnapshot.platform_account_id == PlatformAccount.id)
+    if scope == "account":
+        return query.where(PlatformSnapshot.platform_account_id == scope_id)
+    if scope == "student":
+        return query.where(PlatformAccount.student_id == scope_id)
+    if scope == "department":
+        return query.join(Student, PlatformAccount.student_id == Student.id)\
+            .where(Student.department_id == scope_id)
+    raise ValueError(f"Unknown scope: {scope}")
+
+def growth_series_query(scope, scope_id, interval, start_date, end_date):
+    """
+    One statement returning (bucket, total_solved, solved_delta,
+    average_rating, snapshots) per bucket with approved data. The first row
+    may be the baseline bucket just before the range.
+    """
+    first_bucket = period_start(start_date, interval)
+    baseline_bucket = previous_period(first_bucket, interval)
+    bucket = bucket_start(PlatformSnapshot.snapshot_date, interval)
+
+    # Each account's latest value before the range acts as the baseline bucket
+    before = _scoped(select(
+        PlatformSnapshot.platform_account_id,
+        PlatformSnapshot.total_solved,
+        PlatformSnapshot.contest_rating,
+        PlatformSnapshot.snapshot_date,
+        func.row_number().over(
+            partition_by=PlatformSnapshot.platform_account_id,
+            order_by=PlatformSnapshot.snapshot_date.desc()
+        ).label("rn")
+    ), scope, scope_id).where(
+        PlatformSnapshot.status == "approved",
+        PlatformSnapshot.snapshot_date < first_bucket
+    ).subquery()
+
+    # Last approved snapshot per account per bucket inside the range
+    within = _scoped(select(
+        PlatformSnapshot.platform_account_id,
+        PlatformSnapshot.total_solved,
+        PlatformSnapshot.contest_rating,
+        bucket.label("bucket"),
+        func.row_number().over(
+            partition_by=(PlatformSnapshot.platform_account_id, bucket),
+            order_by=PlatformSnapshot.snapshot_date.desc()
+        ).label("rn")
+    ), scope, scope_id).where(
+        PlatformSnapshot.status == "approved",
+        PlatformSnapshot.snapshot_date >= first_bucket,
+        PlatformSnapshot.snapshot_date <= end_date
+    ).subquery()
+
+    per_account = union_all(
+        select(
+            before.c.platform_account_id, before.c.total_solved, before.c.contest_rating,
+            literal(baseline_bucket, db.Date).label("bucket")
+        ).where(before.c.rn == 1),
+        select(
+            within.c.platform_account_id, within.c.total_solved, within.c.contest_rating, within.c.bucket
+        ).where(within.c.rn == 1)
+    ).subquery()
+
+    previous_value = func.lag(per_account.c.total_solved).over(
+        partition_by=per_account.c.platform_account_id,
+        order_by=per_account.c.bucket
+    )
+    changes = select(
+        per_account.c.bucket,
+        per_account.c.contest_rating,
+        # Change in the running total (first appearance counts in full)
+        (per_account.c.total_solved - func.coalesce(previous_value, 0)).label("level_change"),
+        # Growth since the account's previous period (0 on first appearance)
+        func.coalesce(per_account.c.total_solved - previous_value, 0).label("delta")
+    ).subquery()
+
+    return select(
+        changes.c.bucket,
+        func.sum(func.sum(changes.c.level_change)).over(order_by=changes.c.bucket).label("total_solved"),
+        func.sum(changes.c.delta).label("solved_delta"),
+        func.avg(changes.c.contest_rating).label("average_rating"),
+        func.count().label("snapshots")
+    ).group_by(changes.c.bucket).order_by(changes.c.bucket)
+
+def growth_series(scope, scope_id, interval, start_date, end_date):
+    """Chart-ready series with one point per period; empty periods carry the total forward"""
+    first_bucket = period_start(start_date, interval)
+    rows = {
+        r.bucket: r for r in db.session.execute(
+            growth_series_query(scope, scope_id, interval, start_date, end_date)
+        ).all()
+    }
+
+    # The baseline bucket (before the range) only seeds the running total
+    baseline = rows.get(previous_period(first_bucket, interval))
+    total_solved = int(baseline.total_solved) if baseline else 0
+
+    series = []
+    current = first_bucket
+    while current <= end_date:
+        row = rows.get(current)
+        if row:
+            total_solved = int(row.total_solved or 0)
+        series.append({
+            "period_start": current.isoformat(),
+            "total_solved": total_solved,
+            "solved_delta": int(row.solved_delta or 0) if row else 0,
+            "average_rating": round(float(row.average_rating), 2) if row and row.average_rating is not None else None,
+            "snapshots": row.snapshots if row else 0
+        })
+        current = next_period(current, interval)
+    return series
@@ -1,9 +1,10 @@
 
-from flask import Blueprint, request
+from flask import Blueprint, request, current_app
 from app.extensions import db
 from app.auth.models import User, Role, UserRole
 from app.students.models import Student
 from app.common.utils import hash_password, verify_password, success_response, error_response
+from app.common.principal import load_principal
 from flask_jwt_extended import create_access_token
 from datetime import datetime
 
@@ -84,7 +85,12 @@ def login():
     if not user or not verify_password(password, user.password_hash):
         return error_response("Invalid credentials", 401)
 
-    access_token = create_access_token(identity=user.id)
+    # Roles and staff scope in the token let read-only endpoints skip the lookup
+    additional_claims = None
+    if current_app.config.get("JWT_PRINCIPAL_CLAIMS"):
+        additional_claims = load_principal(user.id).claims()
+
+    access_token = create_access_token(identity=user.id, additional_claims=additional_claims)
 
     return success_response({
         "access_token": access_token,
@@ -0,0 +1,259 @@
+"""
+Response cache for the dashboard blueprints.
+
+Cached entries are keyed by endpoint, view arguments, query string and the
+calling user, and carry a set of tags (department, student, counsellor, ...).
+Each tag has a version counter; an entry is only served while the versions it
+was stored with are current, so invalidating a tag is a single INCR and never
+has to find the affected keys.
+
+Backends: Redis when REDIS_URL is configured (shared across workers), an
+in-process LRU with TTL otherwise, or "null" to disable caching.
+
+With read replicas, a tag bump is remembered for REPLICA_STICKY_SECONDS. A
+miss on a recently bumped tag reads from the primary rather than the
+replica, so a lagging replica's pre-write data is never stored under the
+new version.
+"""
+
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from app.common.replicas import replica_router
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+class MemoryBackend:
+    """Single-process LRU with per-entry TTL"""
+    name = "memory"
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.bumped_until = {}
+        self.lock = threading.Lock()
+
+    def lookup(self, key, tag_keys):
+        with self.lock:
+            versions = [self.versions.get(t, 0) for t in tag_keys]
+            entry = self.entries.get(key)
+            if entry is None:
+                return None, versions
+            expires_at, raw = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None, versions
+            self.entries.move_to_end(key)
+            return raw, versions
+
+    def store(self, key, raw, timeout):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + timeout, raw)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def bump(self, tag_keys, recent_seconds=0):
+        with self.lock:
+            for t in tag_keys:
+                self.versions[t] = self.versions.get(t, 0) + 1
+                if recent_seconds:
+                    self.bumped_until[t] = time.monotonic() + recent_seconds
+
+    def recently_bumped(self, tag_keys):
+        now = time.monotonic()
+        with self.lock:
+            return any(self.bumped_until.get(t, 0) > now for t in tag_keys)
+
+    def size(self):
+        return len(self.entries)
+
+class RedisBackend:
+    """Shared cache; entry and tag versions are read in one round trip"""
+    name = "redis"
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def lookup(self, key, tag_keys):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(key)
+        if tag_keys:
+            pipe.mget(tag_keys)
+        results = pipe.execute()
+        versions = [int(v or 0) for v in results[1]] if tag_keys else []
+        return results[0], versions
+
+    def store(self, key, raw, timeout):
+        self.client.setex(key, timeout, raw)
+
+    def bump(self, tag_keys, recent_seconds=0):
+        pipe = self.client.pipeline(transaction=False)
+        for t in tag_keys:
+            pipe.incr(t)
+            if recent_seconds:
+                pipe.set(t + ":bumped", 1, ex=max(1, int(recent_seconds)))
+        pipe.execute()
+
+    def recently_bumped(self, tag_keys):
+        return bool(self.client.exists(*[t + ":bumped" for t in tag_keys]))
+
+    def size(self):
+        return None
+
+class ResponseCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def init_app(self, app):
+        cache_type = app.config.get("CACHE_TYPE")
+        if cache_type == "redis" and redis is None:
+            logger.warning("CACHE_TYPE is redis but the redis package is not installed; caching disabled")
+            cache_type = "null"
+
+        if cache_type == "redis":
+            backend = RedisBackend(app.config["REDIS_URL"])
+        elif cache_type == "null":
+            backend = None
+        else:
+            backend = MemoryBackend(app.config.get("CACHE_MAX_ENTRIES", 2048))
+
+        app.extensions["response_cache"] = {
+            "backend": backend,
+            "stats": {"hits": 0, "misses": 0, "invalidations": 0, "errors": 0}
+        }
+
+    def _state(self):
+        return current_app.extensions["response_cache"]
+
+    def _count(self, name, amount=1):
+        stats = self._state()["stats"]
+        with self.lock:
+            stats[name] += amount
+
+    def _prefixed(self, name):
+        return current_app.config.get("CACHE_KEY_PREFIX", "codelens:") + name
+
+    def cached(self, tags, timeout=None):
+        """
+        Cache successful JSON responses of a @jwt_required view.
+
+        `tags(user_id, **view_args)` returns the tags the response depends on.
+        Every entry also carries the caller's user:{id} tag, so a change to the
+        caller's roles or assignments drops the views they had cached.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                backend = self._state()["backend"]
+                if backend is None:
+                    return view(*args, **kwargs)
+
+                user_id = get_jwt_identity()
+                key = self._prefixed("resp:" + json.dumps([
+                    request.endpoint, kwargs, sorted(request.args.items(multi=True)), user_id
+                ], separators=(",", ":")))
+                tag_keys = [self._prefixed("tag:" + t)
+                            for t in dict.fromkeys([*tags(user_id, **kwargs), f"user:{user_id}"])]
+
+                try:
+                    raw, versions = backend.lookup(key, tag_keys)
+                except Exception:
+                    logger.exception("Response cache lookup failed")
+                    self._count("errors")
+                    return view(*args, **kwargs)
+
+                if raw is not None:
+                    entry = json.loads(raw)
+                    if entry["versions"] == versions:
+                        self._count("hits")
+                        response = current_app.response_class(entry["body"], mimetype="application/json")
+                        response.headers["X-Cache"] = "HIT"
+                        return response
+
+                self._count("misses")
+                if tag_keys and replica_router.reading_replica():
+                    try:
+                        recent = backend.recently_bumped(tag_keys)
+                    except Exception:
+                        logger.exception("Response cache lookup failed")
+                        self._count("errors")
+                        recent = True
+                    if recent:
+                        # The replica may not have the write behind the bump yet
+                        replica_router.use_primary()
+
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200 and response.is_json:
+                    raw = json.dumps({"versions": versions, "body": response.get_data(as_text=True)})
+                    try:
+                        backend.store(key, raw, timeout or current_app.config.get("CACHE_DEFAULT_TIMEOUT", 300))
+                    except Exception:
+                        logger.exception("Response cache store failed")
+                        self._count("errors")
+                response.headers["X-Cache"] = "MISS"
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        """Expire every cached response carrying any of the tags; call after commit"""
+        backend = self._state()["backend"]
+        tags = {t for t in tags if t}
+        if backend is None or not tags:
+            return
+        recent_seconds = 0
+        if current_app.extensions["replica_router"]["replicas"]:
+            recent_seconds = current_app.config.get("REPLICA_STICKY_SECONDS", 5)
+        try:
+            backend.bump([self._prefixed("tag:" + t) for t in sorted(tags)], recent_seconds)
+            self._count("invalidations", len(tags))
+        except Exception:
+            logger.exception("Response cache invalidation failed")
+            self._count("errors")
+
+    def stats(self):
+        state = self._state()
+        backend = state["backend"]
+        stats = dict(state["stats"])
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["backend"] = backend.name if backend else "null"
+        stats["entries"] = backend.size() if backend else 0
+        return stats
+
+response_cache = ResponseCache()
+
+def student_cache_tags(student):
+    """Tags of every cached view that includes this student's data"""
+    return assignment_cache_tags(
+        student.id, student.user_id, student.department_id,
+        advisor_user_id=student.advisor_record.advisor_user_id if student.advisor_record else None,
+        counsellor_user_id=student.counsellor_record.counsellor_user_id if student.counsellor_record else None
+    )
+
+def assignment_cache_tags(student_id, user_id, department_id=None, advisor_user_id=None, counsellor_user_id=None):
+    """student_cache_tags from already-loaded columns, for bulk paths that never load Student"""
+    tags = [
+        f"student:{student_id}",
+        f"user:{user_id}",
+        "institution"
+    ]
+    if department_id:
+        tags.append(f"department:{department_id}")
+    if advisor_user_id:
+        tags.append(f"advisor:{advisor_user_id}")
+    if counsellor_user_id:
+        tags.append(f"counsellor:{counsellor_user_id}")
+    return tags
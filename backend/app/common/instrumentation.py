@@ -0,0 +1,225 @@
+"""
+Per-request SQL instrumentation.
+
+Cursor events on every engine (primary and replicas) feed a RequestStats on
+flask.g: statement count, total DB time, the slowest statement and how often
+each statement text repeated. After the request this becomes
+
+- Server-Timing (db, app) and X-Query-Count response headers,
+- per-endpoint histograms served in Prometheus text format at /metrics when
+  METRICS_ENABLED is set, behind METRICS_TOKEN if configured (per process;
+  scrape each worker or run a single worker per container),
+- a warning log for slow statements and likely N+1 patterns (the same
+  statement text issued SQL_N_PLUS_ONE_THRESHOLD or more times).
+
+Routes may declare a budget with @query_budget(n). With
+SQL_ENFORCE_QUERY_BUDGETS (on by default under TESTING) a request that issues
+more statements fails with QueryBudgetExceeded, so N+1 regressions break the
+test that exercises the route.
+"""
+
+import hmac
+import time
+import logging
+import threading
+from collections import Counter
+from functools import wraps
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.common.utils import error_response
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class RequestStats:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.count = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+        self.statements = Counter()
+
+    def record(self, statement, elapsed):
+        self.count += 1
+        self.db_seconds += elapsed
+        self.statements[statement] += 1
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+    def most_repeated(self):
+        return self.statements.most_common(1)[0] if self.statements else (None, 0)
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, labels):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self.series = {}  # label values -> [bucket counts..., sum, count]
+        self.lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self.lock:
+            series = self.series.setdefault(label_values, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for label_values, series in sorted(self.series.items()):
+                labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {series[-1]}')
+                lines.append(f"{self.name}_sum{{{labels}}} {series[-2]}")
+                lines.append(f"{self.name}_count{{{labels}}} {series[-1]}")
+        return lines
+
+class Counters:
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values = Counter()
+        self.lock = threading.Lock()
+
+    def inc(self, label_values):
+        with self.lock:
+            self.values[label_values] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for label_values, value in sorted(self.values.items()):
+                labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+                lines.append(f"{self.name}{{{labels}}} {value}")
+        return lines
+
+class Metrics:
+    def __init__(self):
+        self.request_seconds = Histogram(
+            "codelens_request_duration_seconds", "Request wall time",
+            DURATION_BUCKETS, ("endpoint", "method", "status"))
+        self.db_seconds = Histogram(
+            "codelens_request_db_seconds", "Time spent in SQL per request",
+            DURATION_BUCKETS, ("endpoint",))
+        self.queries = Histogram(
+            "codelens_request_queries", "SQL statements per request",
+            QUERY_BUCKETS, ("endpoint",))
+        self.n_plus_one = Counters(
+            "codelens_n_plus_one_total", "Requests that repeated one statement past the threshold",
+            ("endpoint",))
+
+    def observe(self, endpoint, method, status, stats, elapsed):
+        self.request_seconds.observe((endpoint, method, str(status)), elapsed)
+        self.db_seconds.observe((endpoint,), stats.db_seconds)
+        self.queries.observe((endpoint,), stats.count)
+
+    def render(self):
+        lines = []
+        for metric in (self.request_seconds, self.db_seconds, self.queries, self.n_plus_one):
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+def query_budget(max_queries):
+    """Declare the most statements a route may issue; place directly under @route"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            return view(*args, **kwargs)
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+def current_stats():
+    return g.get("_sql_stats") if has_app_context() else None
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._codelens_started_at = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_stats()
+    started_at = getattr(context, "_codelens_started_at", None)
+    if stats is not None and started_at is not None:
+        stats.record(statement, time.perf_counter() - started_at)
+
+_listening = False
+
+def _listen():
+    # Class-level listeners cover every engine, including ones created later
+    global _listening
+    if not _listening:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _listening = True
+
+def init_app(app):
+    if not app.config.get("SQL_INSTRUMENTATION", True):
+        return
+    _listen()
+    enforce = app.config.get("SQL_ENFORCE_QUERY_BUDGETS")
+    if enforce is None:
+        enforce = app.testing
+
+    @app.before_request
+    def start_request_stats():
+        g._sql_stats = RequestStats()
+
+    @app.after_request
+    def finish_request_stats(response):
+        stats = g.pop("_sql_stats", None)
+        if stats is None:
+            return response
+        elapsed = time.perf_counter() - stats.started_at
+        endpoint = request.endpoint or "unmatched"
+
+        response.headers["X-Query-Count"] = str(stats.count)
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.count} queries", '
+            f"app;dur={elapsed * 1000:.2f}"
+        )
+        metrics.observe(endpoint, request.method, response.status_code, stats, elapsed)
+
+        slow_ms = app.config.get("SQL_SLOW_QUERY_MS", 200)
+        if stats.slowest_seconds * 1000 >= slow_ms:
+            logger.warning("Slow query on %s (%.1f ms): %s", endpoint,
+                           stats.slowest_seconds * 1000, stats.slowest_statement)
+
+        statement, repeats = stats.most_repeated()
+        if repeats >= app.config.get("SQL_N_PLUS_ONE_THRESHOLD", 10):
+            metrics.n_plus_one.inc((endpoint,))
+            logger.warning("Possible N+1 on %s: statement issued %d times: %s", endpoint, repeats, statement)
+
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, "query_budget", None)
+        if enforce and budget is not None and stats.count > budget:
+            raise QueryBudgetExceeded(
+                f"{endpoint} issued {stats.count} queries (budget {budget}); "
+                f"most repeated x{repeats}: {statement}"
+            )
+        return response
+
+    if not app.config.get("METRICS_ENABLED"):
+        return
+
+    @app.route("/metrics")
+    def prometheus_metrics():
+        token = current_app.config.get("METRICS_TOKEN")
+        if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return error_response("Unauthorized", 401)
+        return current_app.response_class(metrics.render(), mimetype="text/plain; version=0.0.4")
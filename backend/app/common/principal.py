@@ -0,0 +1,117 @@
+"""
+Request-scoped principal: the authenticated user's roles and staff scope.
+
+load_principal() fetches roles, HOD department and staff profile (with its
+department) in one joined query and memoises the result on flask.g, so any
+number of permission checks in a request cost a single round trip.
+
+With JWT_PRINCIPAL_CLAIMS enabled the same data is embedded in the access
+token at login and read-only (GET) requests build the principal from the
+claims without touching the database. Mutating requests always reload it so
+a revoked role takes effect immediately.
+"""
+
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy.orm import joinedload
+from app.extensions import db
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+class Principal:
+    def __init__(self, id, roles, full_name=None, hod_department_id=None,
+                 staff_role_type=None, staff_department_id=None, staff_department_name=None, user=None):
+        self.id = id
+        self.full_name = full_name
+        self.role_names = frozenset(roles)
+        self.hod_department_id = hod_department_id
+        self.staff_role_type = staff_role_type
+        self.staff_department_id = staff_department_id
+        self.staff_department_name = staff_department_name
+        self._user = user
+
+    @classmethod
+    def from_user(cls, user):
+        hod_of = user.department_hod_of
+        profile = user.staff_profile
+        return cls(
+            id=user.id,
+            roles=[ur.role.name.lower() for ur in user.roles if ur.role],
+            full_name=user.full_name,
+            hod_department_id=hod_of.id if hod_of else None,
+            staff_role_type=profile.role_type if profile else None,
+            staff_department_id=profile.department_id if profile else None,
+            staff_department_name=profile.department.name if profile and profile.department else None,
+            user=user
+        )
+
+    @classmethod
+    def from_claims(cls, identity, claims):
+        scope = claims.get("scope") or {}
+        return cls(
+            id=identity,
+            roles=claims.get("roles", []),
+            full_name=claims.get("name"),
+            hod_department_id=scope.get("hod_department_id"),
+            staff_role_type=scope.get("staff_role_type"),
+            staff_department_id=scope.get("staff_department_id"),
+            staff_department_name=scope.get("staff_department_name")
+        )
+
+    def claims(self):
+        """Additional JWT claims carrying this principal"""
+        return {
+            "roles": sorted(self.role_names),
+            "name": self.full_name,
+            "scope": {
+                "hod_department_id": self.hod_department_id,
+                "staff_role_type": self.staff_role_type,
+                "staff_department_id": self.staff_department_id,
+                "staff_department_name": self.staff_department_name
+            }
+        }
+
+    def has_role(self, *names):
+        return not self.role_names.isdisjoint(names)
+
+    @property
+    def user(self):
+        """The User row; loaded on first access when built from claims"""
+        if self._user is None:
+            from app.auth.models import User
+            self._user = db.session.get(User, self.id)
+        return self._user
+
+def principal_query():
+    from app.auth.models import User, UserRole
+    from app.staff.models import StaffProfile
+    return User.query.options(
+        joinedload(User.roles).joinedload(UserRole.role),
+        joinedload(User.department_hod_of),
+        joinedload(User.staff_profile).joinedload(StaffProfile.department)
+    )
+
+def load_principal(user_id):
+    """Principal for any user id (one query, cached for the request); None if unknown"""
+    if not user_id:
+        return None
+    cache = g.setdefault("_principals", {})
+    if user_id not in cache:
+        from app.auth.models import User
+        user = principal_query().filter(User.id == user_id).first()
+        cache[user_id] = Principal.from_user(user) if user else None
+    return cache[user_id]
+
+def current_principal():
+    """Principal of the JWT identity. Call inside a jwt_required view."""
+    identity = get_jwt_identity()
+    cache = g.setdefault("_principals", {})
+    if identity in cache:
+        return cache[identity]
+
+    claims = get_jwt()
+    if (current_app.config.get("JWT_PRINCIPAL_CLAIMS") and "roles" in claims
+            and request.method in SAFE_METHODS):
+        cache[identity] = Principal.from_claims(identity, claims)
+        return cache[identity]
+    return load_principal(identity)
@@ -0,0 +1,147 @@
+"""
+Read-replica routing.
+
+Each URL in SQLALCHEMY_REPLICA_URIS gets its own engine (and pool). GET
+requests to the read-only blueprints pick one at random for the request; the
+session then runs reads there while flushes and DML still go to the primary.
+Everything else uses the primary.
+
+After a user's own successful write their reads stay on the primary for
+REPLICA_STICKY_SECONDS, so they do not see replication lag on the data they
+just changed. The sticky marks live in Redis when REDIS_URL is set (shared by
+all workers), in process memory otherwise. Other users' cache misses on
+freshly invalidated data are sent to the primary by app.common.cache.
+"""
+
+import time
+import random
+import logging
+import threading
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine
+from sqlalchemy.sql.dml import UpdateBase
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+READ_ONLY_BLUEPRINTS = {"analytics_bp", "advisor_bp", "counsellor_bp", "exports_bp"}
+READ_ONLY_ENDPOINTS = {"students_bp.get_all_students"}
+SAFE_METHODS = ("GET", "HEAD")
+
+class RoutingSession(Session):
+    """Session that reads from the engine in session.info["replica"] when set"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get("replica")
+        if replica is not None and bind is None and not self._flushing and not isinstance(clause, UpdateBase):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+class MemoryStickyStore:
+    def __init__(self):
+        self.until = {}
+        self.lock = threading.Lock()
+
+    def mark(self, user_id, seconds):
+        with self.lock:
+            self.until[user_id] = time.monotonic() + seconds
+
+    def is_sticky(self, user_id):
+        with self.lock:
+            until = self.until.get(user_id)
+            if until is None:
+                return False
+            if until < time.monotonic():
+                del self.until[user_id]
+                return False
+            return True
+
+class RedisStickyStore:
+    def __init__(self, url, prefix):
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.prefix = prefix
+
+    def mark(self, user_id, seconds):
+        self.client.set(f"{self.prefix}primary:{user_id}", 1, ex=max(1, int(seconds)))
+
+    def is_sticky(self, user_id):
+        return bool(self.client.exists(f"{self.prefix}primary:{user_id}"))
+
+class ReplicaRouter:
+    def init_app(self, app, db):
+        from app.config import engine_options
+
+        self.db = db
+        replicas = [
+            create_engine(uri, **engine_options(app.config, uri))
+            for uri in app.config.get("SQLALCHEMY_REPLICA_URIS") or []
+        ]
+        store = None
+        if replicas:
+            if app.config.get("REDIS_URL") and redis is not None:
+                store = RedisStickyStore(app.config["REDIS_URL"], app.config.get("CACHE_KEY_PREFIX", "codelens:"))
+            else:
+                store = MemoryStickyStore()
+            app.before_request(self._route)
+            app.after_request(self._mark_write)
+        app.extensions["replica_router"] = {"replicas": replicas, "store": store}
+
+    def _state(self):
+        return current_app.extensions["replica_router"]
+
+    def _identity(self):
+        try:
+            verify_jwt_in_request(optional=True)
+            return get_jwt_identity()
+        except Exception:
+            # Invalid tokens are rejected by the view itself
+            return None
+
+    def _route(self):
+        self.db.session.info.pop("replica", None)
+        if request.method not in SAFE_METHODS:
+            return
+        if request.blueprint not in READ_ONLY_BLUEPRINTS and request.endpoint not in READ_ONLY_ENDPOINTS:
+            return
+
+        state = self._state()
+        user_id = self._identity()
+        if user_id:
+            try:
+                if state["store"].is_sticky(user_id):
+                    return
+            except Exception:
+                logger.exception("Replica sticky lookup failed; reading from primary")
+                return
+        self.db.session.info["replica"] = random.choice(state["replicas"])
+
+    def dispose(self, close=True):
+        """Dispose every replica engine's pool (close=False after a fork)"""
+        for engine in self._state()["replicas"]:
+            engine.dispose(close=close)
+
+    def reading_replica(self):
+        return self.db.session.info.get("replica") is not None
+
+    def use_primary(self):
+        """Send the rest of this request's reads to the primary"""
+        self.db.session.info.pop("replica", None)
+
+    def _mark_write(self, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return response
+        user_id = self._identity()
+        if user_id:
+            try:
+                self._state()["store"].mark(user_id, current_app.config.get("REPLICA_STICKY_SECONDS", 5))
+            except Exception:
+                logger.exception("Replica sticky mark failed")
+        return response
+
+replica_router = ReplicaRouter()
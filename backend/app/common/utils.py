@@ -21,38 +21,37 @@ def error_response(message="An error occurred", status_code=400):
         "error": message
     }), status_code
 
-def is_admin(user):
+def role_names(user):
+    """Lower-cased role names of a User or Principal, as a set"""
     if not user:
-        return False
-    # Check if any of the user's roles is 'admin'
-    return any(ur.role.name.lower() == 'admin' for ur in user.roles if ur.role)
+        return frozenset()
+    names = getattr(user, "role_names", None)
+    if names is None:
+        names = frozenset(ur.role.name.lower() for ur in user.roles if ur.role)
+    return names
+
+def hod_department_id(user):
+    """Id of the department a User or Principal heads, or None"""
+    if hasattr(user, "hod_department_id"):
+        return user.hod_department_id
+    return user.department_hod_of.id if user.department_hod_of else None
+
+def is_admin(user):
+    return "admin" in role_names(user)
 
 def is_hod(user, department_id):
-    if not user:
-        return False
-    # Check if user is HOD of the department
-    # Also check if they have 'hod' role
-    is_hod_role = any(ur.role.name.lower() == 'hod' for ur in user.roles if ur.role)
-    if not is_hod_role:
+    # Must hold the 'hod' role and head a department
+    if "hod" not in role_names(user):
         return False
-        
+
     # If department_id is None, just check if they are HOD of ANY department
+    hod_dept_id = hod_department_id(user)
     if department_id is None:
-        return bool(user.department_hod_of)
-
-    # Check actual department assignment
-    # Using the relationship defined in Department model: user.department_hod_of
-    if user.department_hod_of and user.department_hod_of.id == department_id:
-        return True
-        
-    return False
+        return hod_dept_id is not None
+    return hod_dept_id == department_id
 
 def is_counsellor(user):
-    if not user:
-        return False
-    return any(ur.role.name.lower() == 'counsellor' for ur in user.roles if ur.role)
+    return "counsellor" in role_names(user)
 
 def is_advisor(user):
-    if not user:
-        return False
-    return any(ur.role.name.lower() == 'advisor' for ur in user.roles if ur.role)
+    return "advisor" in role_names(user)
@@ -8,68 +8,40 @@ from app.platforms.models import PlatformAccount
 from app.snapshots.models import PlatformSnapshot
 from app.auth.models import User
 from app.common.utils import success_response, error_response, is_counsellor
-from sqlalchemy import func
+from app.common.principal import current_principal
+from app.common.cache import response_cache
+from app.common.instrumentation import query_budget
+from app.analytics.risk import evaluate_at_risk
+from sqlalchemy import func, select
 from datetime import datetime, timedelta
 
 counsellor_bp = Blueprint("counsellor_bp", __name__, url_prefix="/analytics/counsellor")
 
-from app.staff.models import StaffProfile
-
-def get_assigned_department(user_id):
-    # Check StaffProfile table
-    profile = StaffProfile.query.filter_by(user_id=user_id).first()
-    return profile.department if profile else None
+def assigned_students_scope(counsellor_user_id):
+    """SELECT of student ids assigned to the counsellor"""
+    return select(StudentCounsellor.student_id).where(StudentCounsellor.counsellor_user_id == counsellor_user_id)
 
 @counsellor_bp.route("/summary", methods=["GET"])
+@query_budget(3)
 @jwt_required()
+@response_cache.cached(lambda user_id: [f"counsellor:{user_id}"])
 def get_counsellor_summary():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     
     if not is_counsellor(user):
         return error_response("Access Denied. Counsellor role required.", 403)
         
-    department = get_assigned_department(current_user_id)
-    department_name = department.name if department else "Unknown Dept"
+    # Staff department is loaded with the principal
+    department_name = user.staff_department_name or "Unknown Dept"
         
-    # Get students assigned to this counsellor
-    # students = Student.query.filter_by(department_id=department.id).all() # OLD
-    students = Student.query.join(StudentCounsellor).filter(StudentCounsellor.counsellor_user_id == current_user_id).all()
-    
-    total_students = len(students)
-    
-    total_solved = 0
-    total_growth = 0
-    at_risk_count = 0
+    # Evaluate students assigned to this counsellor
+    report = evaluate_at_risk(assigned_students_scope(current_user_id))
     
-    cutoff_date = datetime.utcnow().date() - timedelta(days=30)
-    
-    for student in students:
-        accounts = PlatformAccount.query.filter_by(student_id=student.id).all()
-        student_total = 0
-        student_growth = 0
-        has_recent = False
-        
-        for account in accounts:
-            snapshots = PlatformSnapshot.query.filter_by(platform_account_id=account.id, status="approved")\
-                .order_by(PlatformSnapshot.snapshot_date.desc())\
-                .limit(2)\
-                .all()
-                
-            if snapshots:
-                latest = snapshots[0]
-                student_total += latest.total_solved
-                if latest.snapshot_date >= cutoff_date:
-                    has_recent = True
-                    
-                if len(snapshots) >= 2:
-                    student_growth += (latest.total_solved - snapshots[1].total_solved)
-        
-        total_solved += student_total
-        total_growth += student_growth
-        
-        if not has_recent or student_growth <= 0:
-            at_risk_count += 1
+    total_students = len(report)
+    total_solved = int(report.total_solved.sum())
+    total_growth = int(report.growth.sum())
+    at_risk_count = int(report.is_risk.sum())
             
     avg_growth = round(total_growth / total_students, 2) if total_students > 0 else 0
     
@@ -82,111 +54,61 @@ def get_counsellor_summary():
     })
 
 @counsellor_bp.route("/students", methods=["GET"])
+@query_budget(3)
 @jwt_required()
+@response_cache.cached(lambda user_id: [f"counsellor:{user_id}"])
 def get_my_students():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     
     if not is_counsellor(user):
         return error_response("Access Denied", 403)
         
     # Filter by assignment
-    students = Student.query.join(StudentCounsellor).filter(StudentCounsellor.counsellor_user_id == current_user_id).all()
+    report = evaluate_at_risk(assigned_students_scope(current_user_id))
     
     data = []
-    cutoff_date = datetime.utcnow().date() - timedelta(days=30)
-    
-    for student in students:
-        accounts = PlatformAccount.query.filter_by(student_id=student.id).all()
-        total_solved = 0
-        growth = 0
-        last_active = None
-        is_risk = False
-        
-        for account in accounts:
-            snapshots = PlatformSnapshot.query.filter_by(platform_account_id=account.id, status="approved")\
-                .order_by(PlatformSnapshot.snapshot_date.desc())\
-                .limit(2)\
-                .all()
-            
-            if snapshots:
-                latest = snapshots[0]
-                total_solved += latest.total_solved
-                if last_active is None or latest.snapshot_date > last_active:
-                    last_active = latest.snapshot_date
-                
-                if len(snapshots) >= 2:
-                    growth += (latest.total_solved - snapshots[1].total_solved)
-
-        # Risk Logic
-        if not last_active or last_active < cutoff_date or growth <= 0:
-            is_risk = True
-            
+    for row in report.rows():
         data.append({
-            "student_id": student.id,
-            "full_name": student.user.full_name,
-            "register_number": student.register_number,
-            "total_solved": total_solved,
-            "growth": growth,
-            "last_active": last_active.isoformat() if last_active else "Never",
-            "is_risk": is_risk
+            "student_id": row["student_id"],
+            "full_name": row["full_name"],
+            "register_number": row["register_number"],
+            "total_solved": row["total_solved"],
+            "growth": row["growth"],
+            "last_active": row["last_snapshot_date"].isoformat() if row["last_snapshot_date"] else "Never",
+            "is_risk": row["is_risk"]
         })
         
     return success_response(data)
 
 @counsellor_bp.route("/at-risk", methods=["GET"])
+@query_budget(3)
 @jwt_required()
+@response_cache.cached(lambda user_id: [f"counsellor:{user_id}"])
 def get_at_risk_only():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     
     if not is_counsellor(user):
         return error_response("Access Denied", 403)
         
-    students = Student.query.join(StudentCounsellor).filter(StudentCounsellor.counsellor_user_id == current_user_id).all()
+    report = evaluate_at_risk(assigned_students_scope(current_user_id))
     
     at_risk_data = []
-    cutoff_date = datetime.utcnow().date() - timedelta(days=30)
-    
-    for student in students:
-        accounts = PlatformAccount.query.filter_by(student_id=student.id).all()
-        total_solved = 0
-        growth = 0
-        last_active = None
-        has_recent = False
-        
-        for account in accounts:
-            snapshots = PlatformSnapshot.query.filter_by(platform_account_id=account.id, status="approved")\
-                .order_by(PlatformSnapshot.snapshot_date.desc())\
-                .limit(2)\
-                .all()
-            
-            if snapshots:
-                latest = snapshots[0]
-                total_solved += latest.total_solved
-                if latest.snapshot_date >= cutoff_date:
-                    has_recent = True
-                
-                if last_active is None or latest.snapshot_date > last_active:
-                    last_active = latest.snapshot_date
-                
-                if len(snapshots) >= 2:
-                    growth += (latest.total_solved - snapshots[1].total_solved)
-        
-        reason = ""
-        if not has_recent:
-            reason = "Inactive (>30 days)"
-        elif growth <= 0:
+    for row in report.rows(only_risk=True):
+        if row["is_inactive"]:
+            reason = f"Inactive (>{report.inactivity_days} days)"
+        else:
             reason = "No Growth"
             
-        if reason:
-            at_risk_data.append({
-                "student_id": student.id,
-                "full_name": student.user.full_name,
-                "total_solved": total_solved,
-                "growth": growth,
-                "last_active": last_active.isoformat() if last_active else "Never",
-                "reason": reason
-            })
+        at_risk_data.append({
+            "student_id": row["student_id"],
+            "full_name": row["full_name"],
+            "total_solved": row["total_solved"],
+            "growth": row["growth"],
+            "last_active": row["last_snapshot_date"].isoformat() if row["last_snapshot_date"] else "Never",
+            "is_declining": row["is_declining"],
+            "reason": reason
+        })
             
     return success_response(at_risk_data)
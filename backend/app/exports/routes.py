@@ -0,0 +1,117 @@
+from datetime import datetime
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required
+from app.extensions import db
+from app.academics.models import Department
+from app.platforms.routes import ALLOWED_PLATFORMS
+from app.analytics.routes import check_department_access_level
+from app.common.utils import error_response, is_admin, is_hod
+from app.common.principal import current_principal
+from app.exports.services import roster_export, leaderboard_export, snapshot_export
+from app.exports.streaming import export_response, EXPORT_FORMATS
+
+exports_bp = Blueprint("exports_bp", __name__, url_prefix="/exports")
+
+SNAPSHOT_STATUSES = ("pending", "approved", "rejected")
+
+def _format():
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format. Allowed: {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+def _int(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}. Must be an integer")
+
+def _date(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid {name}. Use YYYY-MM-DD")
+
+def _department_filter(principal):
+    """
+    Department an export is limited to: the ?department_id filter for admins,
+    the HOD's own department otherwise. Raises PermissionError for other roles.
+    """
+    if is_admin(principal):
+        return request.args.get("department_id")
+    if is_hod(principal, None) and principal.hod_department_id:
+        requested = request.args.get("department_id")
+        if requested and requested != principal.hod_department_id:
+            raise PermissionError("HODs can only export their own department")
+        return principal.hod_department_id
+    raise PermissionError("Access denied. Admin or HOD role required.")
+
+@exports_bp.route("/students", methods=["GET"])
+@jwt_required()
+def export_students():
+    """
+    Student roster with metrics (totals, growth, rating average, last active,
+    solved per platform). ?format=csv|ndjson; filters department_id,
+    admission_year.
+    """
+    principal = current_principal()
+    try:
+        department_id = _department_filter(principal)
+        fmt = _format()
+        admission_year = _int("admission_year")
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e))
+
+    return export_response(roster_export(department_id, admission_year), "students", fmt)
+
+@exports_bp.route("/departments/<department_id>/leaderboard", methods=["GET"])
+@jwt_required()
+def export_department_leaderboard(department_id):
+    principal = current_principal()
+    if not principal:
+        return error_response("User not found", 404)
+    department = db.session.get(Department, department_id)
+    if not department:
+        return error_response("Department not found", 404)
+    if not check_department_access_level(principal.id, department_id):
+        return error_response("Unauthorized access to this department leaderboard", 403)
+    try:
+        fmt = _format()
+    except ValueError as e:
+        return error_response(str(e))
+
+    return export_response(leaderboard_export(department_id), f"leaderboard-{department.code}", fmt)
+
+@exports_bp.route("/snapshots", methods=["GET"])
+@jwt_required()
+def export_snapshots():
+    """
+    Full snapshot history, ordered by account and date. ?format=csv|ndjson;
+    filters department_id, student_id, platform, status, start, end (YYYY-MM-DD).
+    """
+    principal = current_principal()
+    args = request.args
+    try:
+        department_id = _department_filter(principal)
+        fmt = _format()
+        start, end = _date("start"), _date("end")
+        if args.get("platform") and args["platform"] not in ALLOWED_PLATFORMS:
+            raise ValueError(f"Invalid platform. Allowed: {', '.join(ALLOWED_PLATFORMS)}")
+        if args.get("status") and args["status"] not in SNAPSHOT_STATUSES:
+            raise ValueError(f"Invalid status. Allowed: {', '.join(SNAPSHOT_STATUSES)}")
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e))
+
+    statement = snapshot_export(department_id, args.get("student_id"), args.get("platform"),
+                                args.get("status"), start, end)
+    return export_response(statement, "snapshots", fmt)
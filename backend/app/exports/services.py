@@ -0,0 +1,119 @@
+"""
+Export statements: one SELECT per report, ordered so the database can stream
+rows as it produces them.
+
+Per-student metrics are aggregated in SQL from platform_account_stats with
+the same rules as get_student_metrics (growth is latest minus previous
+approved total, the rating average ignores unrated accounts), so an export
+never holds more than a cursor batch in Python.
+"""
+
+from sqlalchemy import select, func, case
+from app.students.models import Student
+from app.auth.models import User
+from app.academics.models import Department
+from app.platforms.models import PlatformAccount
+from app.platforms.routes import ALLOWED_PLATFORMS
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.models import PlatformAccountStats
+
+def student_totals():
+    """Per-student aggregates over linked accounts, one row per student with an account"""
+    solved = func.coalesce(PlatformAccountStats.latest_total_solved, 0)
+    return select(
+        PlatformAccount.student_id,
+        func.count(PlatformAccount.id).label("linked_platforms"),
+        func.sum(solved).label("total_solved"),
+        func.sum(PlatformAccountStats.solved_growth).label("growth"),
+        func.avg(func.nullif(PlatformAccountStats.latest_contest_rating, 0)).label("rating_average"),
+        func.max(PlatformAccountStats.latest_snapshot_date).label("last_active"),
+        *(func.sum(case((PlatformAccount.platform_name == platform, solved), else_=0)).label(f"{platform}_solved")
+          for platform in ALLOWED_PLATFORMS)
+    ).outerjoin(PlatformAccountStats, PlatformAccountStats.platform_account_id == PlatformAccount.id)\
+     .group_by(PlatformAccount.student_id)\
+     .subquery()
+
+def roster_export(department_id=None, admission_year=None):
+    """Students with profile fields and metrics, ordered by register number"""
+    totals = student_totals()
+    statement = select(
+        Student.id.label("student_id"),
+        Student.register_number,
+        User.full_name,
+        User.email,
+        Student.admission_year,
+        Department.name.label("department_name"),
+        func.coalesce(totals.c.linked_platforms, 0).label("linked_platforms"),
+        func.coalesce(totals.c.total_solved, 0).label("total_solved"),
+        func.coalesce(totals.c.growth, 0).label("growth"),
+        func.round(totals.c.rating_average, 2).label("rating_average"),
+        totals.c.last_active,
+        *(func.coalesce(totals.c[f"{platform}_solved"], 0).label(f"{platform}_solved") for platform in ALLOWED_PLATFORMS)
+    ).join(User, Student.user_id == User.id)\
+     .outerjoin(Department, Student.department_id == Department.id)\
+     .outerjoin(totals, totals.c.student_id == Student.id)
+
+    if department_id:
+        statement = statement.where(Student.department_id == department_id)
+    if admission_year:
+        statement = statement.where(Student.admission_year == admission_year)
+    return statement.order_by(Student.register_number, Student.id)
+
+def leaderboard_export(department_id):
+    """
+    Department leaderboard with metrics. Ranked like
+    get_department_leaderboard_query: total solved desc, then student id.
+    """
+    totals = student_totals()
+    total_solved = func.coalesce(totals.c.total_solved, 0)
+    return select(
+        func.row_number().over(order_by=(total_solved.desc(), Student.id)).label("rank"),
+        Student.id.label("student_id"),
+        Student.register_number,
+        User.full_name,
+        total_solved.label("total_solved"),
+        func.coalesce(totals.c.growth, 0).label("growth"),
+        func.round(totals.c.rating_average, 2).label("rating_average"),
+        func.coalesce(totals.c.linked_platforms, 0).label("linked_platforms"),
+        totals.c.last_active
+    ).outerjoin(User, Student.user_id == User.id)\
+     .outerjoin(totals, totals.c.student_id == Student.id)\
+     .where(Student.department_id == department_id)\
+     .order_by(total_solved.desc(), Student.id)
+
+def snapshot_export(department_id=None, student_id=None, platform=None, status=None, start=None, end=None):
+    """
+    Snapshot history with owner and account fields. Ordered by (account, date),
+    which the unique (platform_account_id, snapshot_date) index serves without
+    a sort, so the first rows arrive before the scan finishes.
+    """
+    statement = select(
+        PlatformSnapshot.id.label("snapshot_id"),
+        Student.id.label("student_id"),
+        Student.register_number,
+        PlatformSnapshot.platform_account_id,
+        PlatformAccount.platform_name,
+        PlatformAccount.username,
+        PlatformSnapshot.snapshot_date,
+        PlatformSnapshot.total_solved,
+        PlatformSnapshot.contest_rating,
+        PlatformSnapshot.global_rank,
+        PlatformSnapshot.status,
+        PlatformSnapshot.created_at,
+        PlatformSnapshot.reviewed_at
+    ).join(PlatformAccount, PlatformSnapshot.platform_account_id == PlatformAccount.id)\
+     .join(Student, PlatformAccount.student_id == Student.id)
+
+    if department_id:
+        statement = statement.where(Student.department_id == department_id)
+    if student_id:
+        statement = statement.where(Student.id == student_id)
+    if platform:
+        statement = statement.where(PlatformAccount.platform_name == platform)
+    if status:
+        statement = statement.where(PlatformSnapshot.status == status)
+    if start:
+        statement = statement.where(PlatformSnapshot.snapshot_date >= start)
+    if end:
+        statement = statement.where(PlatformSnapshot.snapshot_date <= end)
+    return statement.order_by(PlatformSnapshot.platform_account_id, PlatformSnapshot.snapshot_date)
@@ -0,0 +1,46 @@
+import json
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.jobs.queue import enqueue, requeue_stale, UnknownTask
+from app.jobs.tasks import TASKS
+from app.jobs.worker import run_workers
+
+jobs_cli = AppGroup("jobs", help="Run and schedule background jobs.")
+
+@jobs_cli.command("worker")
+@click.option("--concurrency", "-c", type=int, default=1, show_default=True,
+              help="Worker processes to run. Each claims jobs independently.")
+@click.option("--task", "tasks", multiple=True, type=click.Choice(sorted(TASKS)),
+              help="Only run this task. Repeatable; defaults to all tasks.")
+@click.option("--burst", is_flag=True, help="Exit once no job is due instead of polling.")
+def worker_command(concurrency, tasks, burst):
+    """Process queued jobs until stopped (SIGTERM finishes the current job first)."""
+    run_workers(current_app._get_current_object(), concurrency, tasks or None, burst)
+
+@jobs_cli.command("enqueue")
+@click.argument("task", type=click.Choice(sorted(TASKS)))
+@click.option("--payload", default="{}", help="JSON object of keyword arguments for the task.")
+@click.option("--priority", type=int, default=0, help="Higher runs first.")
+@click.option("--delay", type=int, default=0, help="Seconds to wait before the first run.")
+@click.option("--every", "interval", type=int, default=None, help="Repeat every N seconds.")
+@click.option("--key", default=None, help="Schedule name; skipped if a job with this key is queued or running.")
+def enqueue_command(task, payload, priority, delay, interval, key):
+    """Queue a job, e.g. `flask jobs enqueue sync.run --every 86400 --key daily-sync`."""
+    try:
+        payload = json.loads(payload)
+    except ValueError as e:
+        raise click.BadParameter(f"Invalid JSON: {e}", param_hint="--payload")
+    if not isinstance(payload, dict):
+        raise click.BadParameter("Must be a JSON object", param_hint="--payload")
+    try:
+        job = enqueue(task, payload, priority=priority, delay=delay, interval=interval, key=key)
+    except UnknownTask as e:
+        raise click.BadParameter(str(e))
+    click.echo(f"Job {job.id} ({job.task}) {job.status}, runs at {job.run_at.isoformat()}.")
+
+@jobs_cli.command("requeue-stale")
+@click.option("--timeout", type=int, default=None, help="Seconds without a heartbeat. Defaults to JOB_LOCK_TIMEOUT_SECONDS.")
+def requeue_stale_command(timeout):
+    """Release running jobs whose worker died."""
+    click.echo(f"Released {requeue_stale(timeout)} stale jobs.")
@@ -0,0 +1,85 @@
+import uuid
+from datetime import datetime
+from app.extensions import db
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+
+class Job(db.Model):
+    """
+    A unit of background work run by `flask jobs worker`.
+
+    Workers claim the highest-priority queued job whose run_at has passed
+    (see app.jobs.queue.claim_job). A failed attempt is re-queued with
+    exponential backoff until max_attempts; a job with interval_seconds
+    enqueues its next run when it finishes. `key` names a schedule: while a
+    queued or running job holds a key, enqueueing the same key is a no-op.
+    """
+    __tablename__ = "jobs"
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    task = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    key = db.Column(db.String(200), nullable=True)
+
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, succeeded, failed, cancelled
+    priority = db.Column(db.Integer, nullable=False, default=0)  # higher runs first
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    interval_seconds = db.Column(db.Integer, nullable=True)
+
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    created_by = db.Column(db.String(36), db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Claim order: queued jobs by priority, then due time
+        db.Index(
+            'ix_jobs_queued_priority_run_at', db.text('priority DESC'), 'run_at',
+            postgresql_where=db.text("status = 'queued'"),
+            sqlite_where=db.text("status = 'queued'")
+        ),
+        # Stale lock recovery
+        db.Index(
+            'ix_jobs_running_locked_at', 'locked_at',
+            postgresql_where=db.text("status = 'running'"),
+            sqlite_where=db.text("status = 'running'")
+        ),
+        db.Index('ix_jobs_key', 'key'),
+        # One active job per key (app.jobs.queue.enqueue)
+        db.Index(
+            'ux_jobs_active_key', 'key', unique=True,
+            postgresql_where=db.text("status IN ('queued', 'running')"),
+            sqlite_where=db.text("status IN ('queued', 'running')")
+        ),
+        db.Index('ix_jobs_created_at', 'created_at'),
+    )
+
+    def to_dict(self):
+        iso = lambda value: value.isoformat() if value else None
+        return {
+            "id": self.id,
+            "task": self.task,
+            "payload": self.payload,
+            "key": self.key,
+            "status": self.status,
+            "priority": self.priority,
+            "run_at": iso(self.run_at),
+            "interval_seconds": self.interval_seconds,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "locked_by": self.locked_by,
+            "result": self.result,
+            "error": self.error,
+            "created_by": self.created_by,
+            "created_at": iso(self.created_at),
+            "started_at": iso(self.started_at),
+            "finished_at": iso(self.finished_at)
+        }
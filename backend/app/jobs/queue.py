@@ -0,0 +1,187 @@
+"""
+Job queue operations on the jobs table.
+
+claim_job moves one due job from queued to running in a single UPDATE whose
+target is picked by a subquery ordered by (priority desc, run_at). On
+Postgres the subquery takes the row with FOR UPDATE SKIP LOCKED, so parallel
+workers never wait on or double-claim each other's rows. SQLite has no row
+locks but serialises writers, and the UPDATE re-checks status = 'queued', so
+the same statement is safe there too.
+
+Every state change after the claim is guarded by locked_by, so a worker
+whose lock expired (requeue_stale) cannot overwrite the next attempt.
+
+A partial unique index allows one queued or running job per key; enqueue
+inserts keyed jobs in a savepoint and returns the winner of a concurrent
+insert of the same key.
+"""
+
+import os
+import socket
+import uuid
+import logging
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+class UnknownTask(ValueError):
+    pass
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+ACTIVE_STATUSES = ("queued", "running")
+
+def _active_job(key):
+    return Job.query.filter(Job.key == key, Job.status.in_(ACTIVE_STATUSES)).first()
+
+def enqueue(task, payload=None, priority=0, run_at=None, delay=None, interval=None,
+            max_attempts=None, key=None, created_by=None, commit=True):
+    """
+    Queue `task` (a name in app.jobs.tasks.TASKS). run_at or delay (seconds)
+    schedules it; interval (seconds) makes it recurring. With a key, returns
+    the existing queued or running job of that key instead of adding one.
+    """
+    from app.jobs.tasks import TASKS
+    if task not in TASKS:
+        raise UnknownTask(f"Unknown task '{task}'")
+
+    if key:
+        existing = _active_job(key)
+        if existing:
+            return existing
+
+    now = datetime.utcnow()
+    job = Job(
+        task=task,
+        payload=payload or {},
+        key=key,
+        priority=priority,
+        run_at=run_at or now + timedelta(seconds=delay or 0),
+        interval_seconds=interval,
+        max_attempts=max_attempts or current_app.config.get("JOB_MAX_ATTEMPTS", 3),
+        created_by=created_by,
+        created_at=now
+    )
+    if key:
+        try:
+            with db.session.begin_nested():
+                db.session.add(job)
+        except IntegrityError:
+            # A concurrent enqueue of the same key committed first
+            existing = _active_job(key)
+            if existing is None:
+                raise
+            return existing
+    else:
+        db.session.add(job)
+    if commit:
+        db.session.commit()
+    return job
+
+def claim_job(worker, tasks=None):
+    """Claim the next due job for `worker` and return its id, or None if none is due (commits)"""
+    now = datetime.utcnow()
+    candidate = select(Job.id).where(Job.status == "queued", Job.run_at <= now)
+    if tasks:
+        candidate = candidate.where(Job.task.in_(tasks))
+    candidate = candidate.order_by(Job.priority.desc(), Job.run_at, Job.id).limit(1)
+    if db.session.get_bind().dialect.name == "postgresql":
+        candidate = candidate.with_for_update(skip_locked=True)
+
+    job_id = db.session.execute(
+        update(Job)
+        .where(Job.id == candidate.scalar_subquery(), Job.status == "queued")
+        .values(status="running", locked_by=worker, locked_at=now, started_at=now,
+                attempts=Job.attempts + 1)
+        .returning(Job.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.session.commit()
+    return job_id
+
+def retry_delay(attempts):
+    """Backoff before the next attempt after `attempts` failures"""
+    config = current_app.config
+    base = config.get("JOB_RETRY_BACKOFF_SECONDS", 30)
+    return min(base * 2 ** (attempts - 1), config.get("JOB_RETRY_MAX_BACKOFF_SECONDS", 3600))
+
+def _finish(job_id, worker, **values):
+    """Apply values to a job still held by worker; False if the lock was lost"""
+    updated = db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "running", Job.locked_by == worker)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    return bool(updated)
+
+def _schedule_next(job):
+    """Enqueue the next run of a recurring job, keeping its cadence"""
+    if not job.interval_seconds:
+        return
+    now = datetime.utcnow()
+    run_at = job.run_at + timedelta(seconds=job.interval_seconds)
+    if run_at < now:
+        run_at = now
+    enqueue(job.task, job.payload, priority=job.priority, run_at=run_at, interval=job.interval_seconds,
+            max_attempts=job.max_attempts, key=job.key, created_by=job.created_by, commit=False)
+
+def complete_job(job, worker, result=None):
+    now = datetime.utcnow()
+    if _finish(job.id, worker, status="succeeded", result=result, error=None, finished_at=now,
+               locked_by=None, locked_at=None):
+        _schedule_next(job)
+    db.session.commit()
+
+def fail_job(job, worker, error, retry=True):
+    """Re-queue (after a backoff if `retry`) while attempts remain, otherwise mark failed"""
+    now = datetime.utcnow()
+    if job.attempts < job.max_attempts:
+        delay = retry_delay(job.attempts) if retry else 0
+        _finish(job.id, worker, status="queued", error=error, locked_by=None, locked_at=None,
+                run_at=now + timedelta(seconds=delay))
+    elif _finish(job.id, worker, status="failed", error=error, finished_at=now, locked_by=None, locked_at=None):
+        # A recurring job keeps its schedule even when one run fails
+        _schedule_next(job)
+    db.session.commit()
+
+def cancel_job(job_id):
+    """Cancel a queued job; True if it was still queued"""
+    cancelled = db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "queued")
+        .values(status="cancelled", finished_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return bool(cancelled)
+
+def requeue_stale(timeout=None):
+    """
+    Release jobs whose worker has not heartbeated for `timeout` seconds
+    (JOB_LOCK_TIMEOUT_SECONDS): re-queued while attempts remain, failed
+    otherwise. Returns how many were released.
+    """
+    timeout = timeout or current_app.config.get("JOB_LOCK_TIMEOUT_SECONDS", 600)
+    cutoff = datetime.utcnow() - timedelta(seconds=timeout)
+    stale = Job.query.filter(Job.status == "running", Job.locked_at < cutoff).all()
+    for job in stale:
+        logger.warning("Releasing job %s (%s) from lost worker %s", job.id, job.task, job.locked_by)
+        fail_job(job, job.locked_by, "Worker lost", retry=False)
+    return len(stale)
+
+def heartbeat(job_id, worker):
+    """Extend the lock on a long-running job"""
+    db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.locked_by == worker)
+        .values(locked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
@@ -0,0 +1,115 @@
+from datetime import datetime
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy import func
+from app.extensions import db
+from app.jobs.models import Job, JOB_STATUSES
+from app.jobs.queue import enqueue, cancel_job, UnknownTask
+from app.jobs.tasks import TASKS
+from app.common.utils import success_response, error_response, is_admin
+from app.common.principal import current_principal
+from app.common.instrumentation import query_budget
+
+jobs_bp = Blueprint("jobs_bp", __name__, url_prefix="/jobs")
+
+JOBS_PAGE_SIZE = 50
+MAX_JOBS_PAGE_SIZE = 200
+
+def _int_field(data, field, default=None, minimum=None):
+    value = data.get(field, default)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or (minimum is not None and value < minimum):
+        raise ValueError(f"{field} must be an integer" + (f" >= {minimum}" if minimum is not None else ""))
+    return value
+
+@jobs_bp.route("", methods=["POST"])
+@jwt_required()
+def create_job():
+    """
+    Queue a task: {"task", "payload"?, "priority"?, "run_at"? (ISO datetime,
+    UTC), "delay_seconds"?, "interval_seconds"?, "max_attempts"?, "key"?}.
+    """
+    principal = current_principal()
+    if not is_admin(principal):
+        return error_response("Access denied. Admin role required.", 403)
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data.get("task"):
+        return error_response("Missing required field: task")
+    payload = data.get("payload") or {}
+    if not isinstance(payload, dict):
+        return error_response("payload must be an object")
+
+    try:
+        run_at = datetime.fromisoformat(data["run_at"]) if data.get("run_at") else None
+    except (TypeError, ValueError):
+        return error_response("Invalid run_at. Use an ISO 8601 datetime")
+    try:
+        job = enqueue(
+            data["task"], payload,
+            priority=_int_field(data, "priority", 0),
+            run_at=run_at,
+            delay=_int_field(data, "delay_seconds", minimum=0),
+            interval=_int_field(data, "interval_seconds", minimum=1),
+            max_attempts=_int_field(data, "max_attempts", minimum=1),
+            key=data.get("key"),
+            created_by=principal.id
+        )
+    except UnknownTask as e:
+        return error_response(f"{e}. Available: {', '.join(sorted(TASKS))}")
+    except ValueError as e:
+        return error_response(str(e))
+    return success_response(job.to_dict(), "Job queued", 202)
+
+@jobs_bp.route("", methods=["GET"])
+@query_budget(3)
+@jwt_required()
+def list_jobs():
+    """Most recent jobs, newest first; ?status=, ?task=, ?limit=. Includes counts per status."""
+    principal = current_principal()
+    if not is_admin(principal):
+        return error_response("Access denied. Admin role required.", 403)
+
+    status = request.args.get("status")
+    if status and status not in JOB_STATUSES:
+        return error_response(f"Invalid status. Allowed: {', '.join(JOB_STATUSES)}")
+    try:
+        limit = min(max(int(request.args.get("limit", JOBS_PAGE_SIZE)), 1), MAX_JOBS_PAGE_SIZE)
+    except ValueError:
+        return error_response("limit must be an integer")
+
+    query = Job.query
+    if status:
+        query = query.filter(Job.status == status)
+    if request.args.get("task"):
+        query = query.filter(Job.task == request.args["task"])
+    jobs = query.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit).all()
+
+    counts = dict.fromkeys(JOB_STATUSES, 0)
+    counts.update(db.session.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+    return success_response({"jobs": [job.to_dict() for job in jobs], "counts": counts})
+
+@jobs_bp.route("/<job_id>", methods=["GET"])
+@query_budget(2)
+@jwt_required()
+def get_job(job_id):
+    """Status of one job; visible to admins and to the user who queued it"""
+    principal = current_principal()
+    job = db.session.get(Job, job_id)
+    if not principal or not job or not (is_admin(principal) or job.created_by == principal.id):
+        return error_response("Job not found", 404)
+    return success_response(job.to_dict())
+
+@jobs_bp.route("/<job_id>/cancel", methods=["POST"])
+@jwt_required()
+def cancel(job_id):
+    principal = current_principal()
+    job = db.session.get(Job, job_id)
+    if not principal or not job or not (is_admin(principal) or job.created_by == principal.id):
+        return error_response("Job not found", 404)
+    if not cancel_job(job_id):
+        db.session.refresh(job)
+        return error_response(f"Job is {job.status}; only queued jobs can be cancelled", 409)
+    db.session.refresh(job)
+    return success_response(job.to_dict(), "Job cancelled")
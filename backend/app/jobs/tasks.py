@@ -0,0 +1,59 @@
+"""
+Tasks the job worker can run.
+
+A task is a function registered under a dotted name with @task. It is called
+with the job's payload as keyword arguments inside an app context, commits
+its own work and returns a JSON-serialisable result that is stored on the
+job. Raising marks the attempt failed (and retried, see app.jobs.queue).
+"""
+
+from datetime import date
+from app.extensions import db
+
+TASKS = {}
+
+def task(name):
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+def _date(value):
+    return date.fromisoformat(value) if value else None
+
+@task("analytics.rebuild_stats")
+def rebuild_stats():
+    from app.analytics.services import rebuild_account_stats
+    return {"accounts": rebuild_account_stats()}
+
+@task("analytics.backfill_department_stats")
+def backfill_department_stats(start=None, end=None, department_ids=None):
+    from sqlalchemy import func
+    from app.snapshots.models import PlatformSnapshot
+    from app.analytics.services import backfill_department_daily_stats
+
+    end_date = _date(end) or date.today()
+    start_date = _date(start) or db.session.query(func.min(PlatformSnapshot.snapshot_date))\
+        .filter(PlatformSnapshot.status == "approved").scalar() or end_date
+    rows = backfill_department_daily_stats(start_date, end_date, department_ids)
+    return {"rows": rows, "start": start_date.isoformat(), "end": end_date.isoformat()}
+
+@task("sync.run")
+def sync_run(platforms=None, account_ids=None, limit=None):
+    from app.sync.services import sync_accounts
+    return sync_accounts(platforms, account_ids, limit)
+
+@task("snapshots.import")
+def import_snapshots(user_id, rows, on_conflict="skip"):
+    """Bulk snapshot submission (POST /snapshots/bulk?async=true) on behalf of user_id"""
+    from app.common.principal import load_principal
+    from app.snapshots.bulk import submit_snapshots, summarize
+
+    principal = load_principal(user_id)
+    if not principal:
+        raise ValueError(f"User {user_id} not found")
+    results = submit_snapshots(principal, rows, on_conflict)
+    db.session.commit()
+
+    # Keep the stored result small: only rows that need attention
+    return {"summary": summarize(results), "results": [r for r in results if r["status"] in ("skipped", "error")]}
@@ -0,0 +1,133 @@
+"""
+Job worker process (`flask jobs worker`).
+
+A Worker loops: claim a due job, run its task in a fresh app context, record
+the result or the failure, and sleep JOB_POLL_INTERVAL seconds when the queue
+is empty. While a task runs, a heartbeat thread keeps its lock fresh so only
+jobs of dead workers are released by requeue_stale, which every worker runs
+once per JOB_LOCK_TIMEOUT_SECONDS / 4.
+
+run_workers starts several independent worker processes; each builds its own
+app (and connection pool) with create_app, and they share nothing but the
+jobs table. SIGTERM or SIGINT stops a worker after its current job.
+"""
+
+import time
+import signal
+import logging
+import threading
+import traceback
+import multiprocessing
+from app.extensions import db
+from app.jobs.models import Job
+from app.jobs.queue import worker_name, claim_job, complete_job, fail_job, requeue_stale, heartbeat
+
+logger = logging.getLogger(__name__)
+
+class Worker:
+    def __init__(self, app, name=None, tasks=None, poll_interval=None):
+        self.app = app
+        self.name = name or worker_name()
+        self.tasks = list(tasks) if tasks else None
+        self.poll_interval = poll_interval if poll_interval is not None else app.config.get("JOB_POLL_INTERVAL", 2.0)
+        self.lock_timeout = app.config.get("JOB_LOCK_TIMEOUT_SECONDS", 600)
+        self.stopping = False
+        self.last_recovery = 0.0
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def recover_stale(self):
+        if time.monotonic() - self.last_recovery >= self.lock_timeout / 4:
+            self.last_recovery = time.monotonic()
+            with self.app.app_context():
+                requeue_stale(self.lock_timeout)
+
+    def _heartbeat(self, job_id, done):
+        while not done.wait(self.lock_timeout / 3):
+            with self.app.app_context():
+                heartbeat(job_id, self.name)
+
+    def run_once(self):
+        """Claim and run one job; returns the job's final status, or None if none was due"""
+        with self.app.app_context():
+            job_id = claim_job(self.name, self.tasks)
+        if not job_id:
+            return None
+
+        done = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(job_id, done), daemon=True)
+        beat.start()
+        try:
+            with self.app.app_context():
+                return self.execute(db.session.get(Job, job_id))
+        finally:
+            done.set()
+            beat.join()
+
+    def execute(self, job):
+        from app.jobs.tasks import TASKS
+        started = time.monotonic()
+        logger.info("Running job %s (%s), attempt %d/%d", job.id, job.task, job.attempts, job.max_attempts)
+        try:
+            func = TASKS.get(job.task)
+            if func is None:
+                raise LookupError(f"Unknown task '{job.task}'")
+            result = func(**(job.payload or {}))
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Job %s (%s) failed", job.id, job.task)
+            error = f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=5)}"
+            fail_job(job, self.name, error)
+        else:
+            try:
+                complete_job(job, self.name, result)
+                logger.info("Job %s (%s) succeeded in %.1fs", job.id, job.task, time.monotonic() - started)
+            except Exception as e:
+                # e.g. a result that is not JSON-serialisable
+                db.session.rollback()
+                fail_job(job, self.name, f"Could not store result: {type(e).__name__}: {e}")
+        db.session.refresh(job)
+        return job.status
+
+    def run(self, burst=False, max_jobs=None):
+        """Process jobs until stopped; with burst, return once nothing is due. Returns jobs run."""
+        processed = 0
+        while not self.stopping and (max_jobs is None or processed < max_jobs):
+            self.recover_stale()
+            if self.run_once() is None:
+                if burst:
+                    break
+                time.sleep(self.poll_interval)
+            else:
+                processed += 1
+        return processed
+
+def _worker_process(tasks, burst):
+    from app import create_app
+    worker = Worker(create_app(), tasks=tasks)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run(burst=burst)
+
+def run_workers(app, concurrency=1, tasks=None, burst=False):
+    """Run `concurrency` workers: in this process when 1, otherwise as child processes"""
+    if concurrency <= 1:
+        worker = Worker(app, tasks=tasks)
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+        return worker.run(burst=burst)
+
+    processes = [multiprocessing.Process(target=_worker_process, args=(tasks, burst), daemon=False)
+                 for _ in range(concurrency)]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
@@ -5,9 +5,19 @@ from app.extensions import db
 from app.platforms.models import PlatformAccount
 from app.students.models import Student
 from app.common.utils import success_response, error_response
+from app.common.cache import response_cache, student_cache_tags
+from app.analytics.services import refresh_department_daily_stats
 
 platforms_bp = Blueprint("platforms_bp", __name__, url_prefix="/platforms")
 
+# Profile URL per supported platform; app.sync.adapters has an adapter for each
+ALLOWED_PLATFORMS = {
+    "leetcode": "https://leetcode.com/{}",
+    "codeforces": "https://codeforces.com/profile/{}",
+    "github": "https://github.com/{}",
+    "hackerrank": "https://www.hackerrank.com/profile/{}"
+}
+
 @platforms_bp.route("/link", methods=["POST"])
 @jwt_required()
 def link_platform():
@@ -33,13 +43,6 @@ def link_platform():
     platform_name = platform_name.strip().lower()
     username = username.strip()
 
-    ALLOWED_PLATFORMS = {
-        "leetcode": "https://leetcode.com/{}",
-        "codeforces": "https://codeforces.com/profile/{}",
-        "github": "https://github.com/{}",
-        "hackerrank": "https://www.hackerrank.com/profile/{}"
-    }
-
     if platform_name not in ALLOWED_PLATFORMS:
         return error_response(f"Unsupported platform. Allowed: {', '.join(ALLOWED_PLATFORMS.keys())}")
 
@@ -62,7 +65,9 @@ def link_platform():
 
     try:
         db.session.add(new_account)
+        refresh_department_daily_stats([student.department_id])
         db.session.commit()
+        response_cache.invalidate(*student_cache_tags(student))
         return success_response(new_account.to_dict(), "Platform linked successfully", 201)
     except Exception as e:
         db.session.rollback()
@@ -97,9 +102,13 @@ def unlink_platform(platform_id):
     if account.student_id != student.id:
         return error_response("Unauthorized action", 403)
 
+    cache_tags = [f"account:{account.id}", *student_cache_tags(student)]
+
     try:
         db.session.delete(account)
+        refresh_department_daily_stats([student.department_id])
         db.session.commit()
+        response_cache.invalidate(*cache_tags)
         return success_response(None, "Platform account unlinked successfully")
     except Exception as e:
         db.session.rollback()
@@ -0,0 +1,100 @@
+"""
+Bulk review of pending snapshots.
+
+The requested snapshots are loaded with their student's assignments in one
+joined query, classified (not found, not assigned, already reviewed) and the
+eligible ones change status with a single UPDATE .. WHERE id IN (..) AND
+status = 'pending'. Ids the UPDATE does not return were reviewed by a
+concurrent request and are reported as skipped too.
+"""
+
+from datetime import datetime
+from sqlalchemy import select, update
+from app.extensions import db
+from app.snapshots.models import PlatformSnapshot
+from app.platforms.models import PlatformAccount
+from app.students.models import Student, StudentAdvisor, StudentCounsellor
+from app.analytics.services import refresh_account_stats, refresh_department_daily_stats
+from app.common.cache import assignment_cache_tags
+
+DECISIONS = ("approved", "rejected")
+
+def _candidates(snapshot_ids=None, student_id=None):
+    query = select(
+        PlatformSnapshot.id,
+        PlatformSnapshot.status,
+        PlatformSnapshot.platform_account_id,
+        PlatformSnapshot.snapshot_date,
+        Student.id.label("student_id"),
+        Student.user_id,
+        Student.department_id,
+        StudentAdvisor.advisor_user_id,
+        StudentCounsellor.counsellor_user_id
+    ).join(PlatformAccount, PlatformSnapshot.platform_account_id == PlatformAccount.id)\
+     .join(Student, PlatformAccount.student_id == Student.id)\
+     .outerjoin(StudentAdvisor, StudentAdvisor.student_id == Student.id)\
+     .outerjoin(StudentCounsellor, StudentCounsellor.student_id == Student.id)
+
+    if student_id is not None:
+        query = query.where(Student.id == student_id, PlatformSnapshot.status == "pending")
+    else:
+        query = query.where(PlatformSnapshot.id.in_(snapshot_ids))
+    return db.session.execute(query).all()
+
+def review_snapshots(counsellor_id, decision, snapshot_ids=None, student_id=None, remarks=None):
+    """
+    Approve or reject snapshots of students assigned to `counsellor_id`,
+    either the given ids or every pending snapshot of `student_id`.
+
+    Returns (updated ids, skipped [{"id", "reason"}], cache tags to
+    invalidate after commit). The caller commits.
+    """
+    if decision not in DECISIONS:
+        raise ValueError(f"decision must be one of {DECISIONS}")
+
+    rows = {row.id: row for row in _candidates(snapshot_ids, student_id)}
+    requested = list(dict.fromkeys(snapshot_ids)) if student_id is None else list(rows)
+
+    skipped, eligible = [], []
+    for snapshot_id in requested:
+        row = rows.get(snapshot_id)
+        if row is None:
+            skipped.append({"id": snapshot_id, "reason": "not found"})
+        elif row.counsellor_user_id != counsellor_id:
+            skipped.append({"id": snapshot_id, "reason": "student not assigned to you"})
+        elif row.status != "pending":
+            skipped.append({"id": snapshot_id, "reason": f"already {row.status}"})
+        else:
+            eligible.append(snapshot_id)
+
+    if not eligible:
+        return [], skipped, []
+
+    values = {"status": decision, "reviewed_by": counsellor_id, "reviewed_at": datetime.utcnow()}
+    if decision == "rejected":
+        values["remarks"] = remarks or "Rejected by counsellor"
+    updated = set(db.session.execute(
+        update(PlatformSnapshot)
+        .where(PlatformSnapshot.id.in_(eligible), PlatformSnapshot.status == "pending")
+        .values(**values)
+        .returning(PlatformSnapshot.id)
+        .execution_options(synchronize_session=False)
+    ).scalars())
+
+    skipped += [{"id": i, "reason": "already reviewed"} for i in eligible if i not in updated]
+    changed = [rows[i] for i in eligible if i in updated]
+    if not changed:
+        return [], skipped, []
+
+    if decision == "approved":
+        # Derived stats move in the same transaction as the approvals
+        since = min(row.snapshot_date for row in changed)
+        refresh_account_stats([row.platform_account_id for row in changed], since=since)
+        refresh_department_daily_stats([row.department_id for row in changed], since=since)
+
+    cache_tags = set()
+    for row in changed:
+        cache_tags.add(f"account:{row.platform_account_id}")
+        cache_tags.update(assignment_cache_tags(row.student_id, row.user_id, row.department_id,
+                                                row.advisor_user_id, row.counsellor_user_id))
+    return [row.id for row in changed], skipped, sorted(cache_tags)
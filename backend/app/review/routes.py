@@ -1,5 +1,7 @@
 
-from flask import Blueprint, request
+import json
+import base64
+from flask import Blueprint, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from app.extensions import db
@@ -9,68 +11,154 @@ from app.students.models import Student, StudentCounsellor
 from app.academics.models import Department, DepartmentCounsellor
 from app.auth.models import User
 from app.common.utils import success_response, error_response, is_counsellor
+from app.common.principal import current_principal
+from app.analytics.services import refresh_account_stats, refresh_department_daily_stats
+from app.common.cache import response_cache, student_cache_tags
+from app.common.instrumentation import query_budget
+from app.review.bulk import review_snapshots
+from sqlalchemy import select, func, tuple_, true
+from sqlalchemy.orm import aliased
 
 review_bp = Blueprint("review_bp", __name__, url_prefix="/counsellor")
 
-from app.staff.models import StaffProfile
+PENDING_PAGE_SIZE = 50
+MAX_PENDING_PAGE_SIZE = 200
 
-def get_assigned_department(user_id):
-    profile = StaffProfile.query.filter_by(user_id=user_id).first()
-    return profile.department if profile else None
+def encode_pending_cursor(row):
+    payload = json.dumps([row.created_at.isoformat(), row.id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+def decode_pending_cursor(cursor):
+    try:
+        created_at, snapshot_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), str(snapshot_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+class PreviousApproved:
+    """
+    The latest approved snapshot of the same account dated before the
+    pending one. Postgres joins it LATERAL (one index probe per row on the
+    approved (account, date) index); other databases read it with correlated
+    subqueries on the same index.
+    """
+
+    FIELDS = ("total_solved", "contest_rating", "snapshot_date")
+
+    def __init__(self, dialect):
+        previous = aliased(PlatformSnapshot)
+        match = select(*(getattr(previous, f) for f in self.FIELDS)).where(
+            previous.platform_account_id == PlatformSnapshot.platform_account_id,
+            previous.status == "approved",
+            previous.snapshot_date < PlatformSnapshot.snapshot_date
+        ).order_by(previous.snapshot_date.desc()).limit(1)
+
+        if dialect == "postgresql":
+            self.lateral = match.lateral("previous")
+            self.columns = [self.lateral.c[f].label(f"previous_{f}") for f in self.FIELDS]
+        else:
+            self.lateral = None
+            self.columns = [match.with_only_columns(getattr(previous, f)).scalar_subquery().label(f"previous_{f}")
+                            for f in self.FIELDS]
+
+    def join(self, query):
+        if self.lateral is None:
+            return query
+        return query.outerjoin(self.lateral, true())
+
+def pending_item(s):
+    return {
+        "snapshot_id": s.id,
+        "student_name": s.student_name,
+        "register_number": s.register_number,
+        "platform_name": s.platform_name,
+        "username": s.username,
+        "total_solved": s.total_solved,
+        "contest_rating": s.contest_rating,
+        "snapshot_date": s.snapshot_date.isoformat(),
+        "submitted_at": s.created_at.isoformat(),
+        "previous_total_solved": s.previous_total_solved,
+        "previous_contest_rating": s.previous_contest_rating,
+        "previous_snapshot_date": s.previous_snapshot_date.isoformat() if s.previous_snapshot_date else None
+    }
 
 @review_bp.route("/pending-snapshots", methods=["GET"])
+@query_budget(3)
 @jwt_required()
 def get_pending_snapshots():
+    """
+    Pending snapshots of assigned students, newest submission first, one page
+    per request. ?cursor= continues from next_cursor; ?paginate=false returns
+    the full list. Each row carries the account's previous approved values.
+    """
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     
     if not is_counsellor(user):
         return error_response("Access denied. Counsellor role required.", 403)
-        
-    department = get_assigned_department(current_user_id)
-    # Even if department is missing, we rely on StudentCounsellor assignment now.
-        
-    # Get all pending snapshots for assigned students
-    pending_snapshots = db.session.query(
-        PlatformSnapshot.id,
-        PlatformSnapshot.total_solved,
-        PlatformSnapshot.contest_rating,
-        PlatformSnapshot.snapshot_date,
-        PlatformSnapshot.created_at,
-        PlatformAccount.platform_name,
-        PlatformAccount.username,
-        User.full_name.label("student_name"),
-        Student.register_number
-    ).join(PlatformAccount, PlatformSnapshot.platform_account_id == PlatformAccount.id)\
-     .join(Student, PlatformAccount.student_id == Student.id)\
-     .join(User, Student.user_id == User.id)\
-     .join(StudentCounsellor, Student.id == StudentCounsellor.student_id)\
-     .filter(
-         PlatformSnapshot.status == "pending",
-         StudentCounsellor.counsellor_user_id == current_user_id
-     ).order_by(PlatformSnapshot.created_at.desc()).all()
-     
-    data = []
-    for s in pending_snapshots:
-        data.append({
-            "snapshot_id": s.id,
-            "student_name": s.student_name,
-            "register_number": s.register_number,
-            "platform_name": s.platform_name,
-            "username": s.username,
-            "total_solved": s.total_solved,
-            "contest_rating": s.contest_rating,
-            "snapshot_date": s.snapshot_date.isoformat(),
-            "submitted_at": s.created_at.isoformat()
-        })
-        
-    return success_response(data)
+
+    args = request.args
+    try:
+        limit = min(int(args.get("limit", PENDING_PAGE_SIZE)), MAX_PENDING_PAGE_SIZE)
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return error_response("Invalid query parameters")
+
+    # Get pending snapshots for assigned students
+    pending = db.session.query(PlatformSnapshot.id)\
+        .join(PlatformAccount, PlatformSnapshot.platform_account_id == PlatformAccount.id)\
+        .join(StudentCounsellor, PlatformAccount.student_id == StudentCounsellor.student_id)\
+        .filter(
+            PlatformSnapshot.status == "pending",
+            StudentCounsellor.counsellor_user_id == current_user_id
+        )
+
+    previous = PreviousApproved(db.session.get_bind().dialect.name)
+    query = pending.join(Student, PlatformAccount.student_id == Student.id)\
+        .join(User, Student.user_id == User.id)\
+        .add_columns(
+            PlatformSnapshot.total_solved,
+            PlatformSnapshot.contest_rating,
+            PlatformSnapshot.snapshot_date,
+            PlatformSnapshot.created_at,
+            PlatformAccount.platform_name,
+            PlatformAccount.username,
+            User.full_name.label("student_name"),
+            Student.register_number,
+            *previous.columns
+        )
+    query = previous.join(query)
+
+    # Keyset pagination on the pending (created_at, id) index, newest first
+    if args.get("cursor"):
+        try:
+            query = query.filter(tuple_(PlatformSnapshot.created_at, PlatformSnapshot.id) < decode_pending_cursor(args["cursor"]))
+        except ValueError as e:
+            return error_response(str(e))
+    query = query.order_by(PlatformSnapshot.created_at.desc(), PlatformSnapshot.id.desc())
+
+    # Legacy clients: whole list in one response
+    if args.get("paginate") == "false":
+        return success_response([pending_item(s) for s in query.all()])
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    page = rows[:limit]
+    total = pending.with_entities(func.count(PlatformSnapshot.id)).scalar()
+
+    return success_response({
+        "snapshots": [pending_item(s) for s in page],
+        "next_cursor": encode_pending_cursor(page[-1]) if len(rows) > limit else None,
+        "total": total,
+        "limit": limit
+    })
 
 @review_bp.route("/snapshots/<snapshot_id>/approve", methods=["PUT"])
 @jwt_required()
 def approve_snapshot(snapshot_id):
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     
     if not is_counsellor(user):
         return error_response("Access denied.", 403)
@@ -96,8 +184,14 @@ def approve_snapshot(snapshot_id):
     snapshot.reviewed_by = current_user_id
     snapshot.reviewed_at = datetime.utcnow()
     
+    cache_tags = [f"account:{snapshot.platform_account_id}", *student_cache_tags(student)]
+
     try:
+        # Keep the derived stats in the same transaction as the approval
+        refresh_account_stats([snapshot.platform_account_id], since=snapshot.snapshot_date)
+        refresh_department_daily_stats([student.department_id], since=snapshot.snapshot_date)
         db.session.commit()
+        response_cache.invalidate(*cache_tags)
         return success_response(None, "Snapshot approved successfully.")
     except Exception as e:
         db.session.rollback()
@@ -107,7 +201,7 @@ def approve_snapshot(snapshot_id):
 @jwt_required()
 def reject_snapshot(snapshot_id):
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     
     if not is_counsellor(user):
         return error_response("Access denied.", 403)
@@ -135,10 +229,64 @@ def reject_snapshot(snapshot_id):
     snapshot.reviewed_by = current_user_id
     snapshot.reviewed_at = datetime.utcnow()
     snapshot.remarks = remarks
+    cache_tags = [f"account:{snapshot.platform_account_id}", *student_cache_tags(student)]
     
     try:
         db.session.commit()
+        response_cache.invalidate(*cache_tags)
         return success_response(None, "Snapshot rejected.")
     except Exception as e:
         db.session.rollback()
         return error_response("Failed to reject snapshot", 500)
+
+def _bulk_review(decision):
+    current_user_id = get_jwt_identity()
+    user = current_principal()
+
+    if not is_counsellor(user):
+        return error_response("Access denied.", 403)
+
+    data = request.get_json(silent=True) or {}
+    snapshot_ids = data.get("snapshot_ids")
+    student_id = data.get("student_id")
+    if student_id is None:
+        if not isinstance(snapshot_ids, list) or not snapshot_ids:
+            return error_response("Provide snapshot_ids or student_id")
+        if not all(isinstance(i, str) for i in snapshot_ids):
+            return error_response("snapshot_ids must be strings")
+        max_ids = current_app.config.get("REVIEW_BULK_MAX_IDS", 1000)
+        if len(snapshot_ids) > max_ids:
+            return error_response(f"At most {max_ids} snapshots per request", 413)
+    elif snapshot_ids is not None:
+        return error_response("Provide either snapshot_ids or student_id, not both")
+
+    try:
+        updated, skipped, cache_tags = review_snapshots(
+            current_user_id, decision,
+            snapshot_ids=snapshot_ids, student_id=student_id, remarks=data.get("remarks")
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return error_response("Failed to review snapshots", 500)
+
+    response_cache.invalidate(*cache_tags)
+    verb = "approved" if decision == "approved" else "rejected"
+    return success_response({
+        "updated": updated,
+        "skipped": skipped,
+        "summary": {"updated": len(updated), "skipped": len(skipped)}
+    }, f"{len(updated)} snapshots {verb}.")
+
+@review_bp.route("/snapshots/bulk-approve", methods=["PUT"])
+# Review (3) + account stats refresh (3) + one department's rollup refresh (5)
+@query_budget(11)
+@jwt_required()
+def bulk_approve_snapshots():
+    return _bulk_review("approved")
+
+@review_bp.route("/snapshots/bulk-reject", methods=["PUT"])
+@query_budget(3)
+@jwt_required()
+def bulk_reject_snapshots():
+    return _bulk_review("rejected")
@@ -4,6 +4,7 @@ from flask import Blueprint, request, current_app
 from app.extensions import db
 from app.auth.models import User, Role, UserRole
 from app.common.utils import hash_password, success_response, error_response
+from app.common.cache import response_cache
 
 setup_bp = Blueprint("setup_bp", __name__, url_prefix="/setup")
 
@@ -47,6 +48,7 @@ def bootstrap_admin():
             user_admin_role = UserRole(user_id=user.id, role_id=admin_role.id)
             db.session.add(user_admin_role)
             db.session.commit()
+            response_cache.invalidate(f"user:{user.id}")
             return success_response(None, "Admin role assigned to existing user")
         else:
             return success_response(None, "User already has admin role")
@@ -0,0 +1,187 @@
+"""
+Bulk snapshot submission.
+
+Rows are validated up front, account access is checked for every account in
+one query and rows are written with INSERT .. ON CONFLICT (platform_account_id,
+snapshot_date): conflicts are skipped, or with on_conflict="update" rewrite
+the values of a still-pending snapshot. Approved and rejected snapshots are
+never modified.
+"""
+
+import csv
+import io
+import uuid
+from datetime import datetime
+from sqlalchemy import select, tuple_, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from app.extensions import db
+from app.snapshots.models import PlatformSnapshot
+from app.platforms.models import PlatformAccount
+from app.students.models import Student, StudentAdvisor, StudentCounsellor
+from app.common.utils import is_admin, is_hod, is_advisor, is_counsellor
+
+CONFLICT_MODES = ("skip", "update")
+CSV_FIELDS = ("platform_account_id", "total_solved", "contest_rating", "global_rank", "snapshot_date")
+INSERT_CHUNK = 1000
+
+class BulkInputError(ValueError):
+    pass
+
+def parse_csv(text):
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or "platform_account_id" not in reader.fieldnames:
+        raise BulkInputError(f"CSV header must include: {', '.join(CSV_FIELDS)}")
+    # Blank cells mean "not provided", as a missing JSON key would
+    return [{k: v for k, v in row.items() if k and v not in (None, "")} for row in reader]
+
+def _int(row, field, required=False):
+    value = row.get(field)
+    if value is None or value == "":
+        if required:
+            raise BulkInputError(f"Missing {field}")
+        return None
+    if isinstance(value, bool):
+        raise BulkInputError(f"{field} must be an integer")
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise BulkInputError(f"{field} must be an integer")
+    if number < 0:
+        raise BulkInputError(f"{field} must not be negative")
+    return number
+
+def validate_row(row):
+    """Row dict -> insert values; raises BulkInputError"""
+    if not isinstance(row, dict):
+        raise BulkInputError("Row must be an object")
+    account_id = row.get("platform_account_id")
+    if not account_id:
+        raise BulkInputError("Missing platform_account_id")
+    if not row.get("snapshot_date"):
+        raise BulkInputError("Missing snapshot_date")
+    try:
+        snapshot_date = datetime.strptime(str(row["snapshot_date"]), "%Y-%m-%d").date()
+    except ValueError:
+        raise BulkInputError("Invalid date format. Use YYYY-MM-DD")
+
+    return {
+        "platform_account_id": str(account_id),
+        "total_solved": _int(row, "total_solved", required=True),
+        "contest_rating": _int(row, "contest_rating"),
+        "global_rank": _int(row, "global_rank"),
+        "snapshot_date": snapshot_date
+    }
+
+def student_scope(principal):
+    """
+    Condition on Student limiting the accounts `principal` may submit for, or
+    None for unrestricted (admin). Students submit for themselves; HODs for
+    their department; advisors and counsellors for assigned students.
+    """
+    if is_admin(principal):
+        return None
+
+    conditions = [Student.user_id == principal.id]
+    if is_hod(principal, None):
+        conditions.append(Student.department_id == principal.hod_department_id)
+    if is_advisor(principal):
+        conditions.append(Student.id.in_(
+            select(StudentAdvisor.student_id).where(StudentAdvisor.advisor_user_id == principal.id)))
+    if is_counsellor(principal):
+        conditions.append(Student.id.in_(
+            select(StudentCounsellor.student_id).where(StudentCounsellor.counsellor_user_id == principal.id)))
+    return or_(*conditions)
+
+def accessible_accounts(principal, account_ids):
+    """Subset of account_ids the principal may submit for (one query)"""
+    if not account_ids:
+        return set()
+    query = select(PlatformAccount.id)\
+        .join(Student, PlatformAccount.student_id == Student.id)\
+        .where(PlatformAccount.id.in_(account_ids))
+    scope = student_scope(principal)
+    if scope is not None:
+        query = query.where(scope)
+    return set(db.session.execute(query).scalars())
+
+def _upsert_statement(rows, on_conflict):
+    dialect = db.session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(PlatformSnapshot).values(rows)
+    keys = ["platform_account_id", "snapshot_date"]
+    if on_conflict == "update":
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={
+                "total_solved": stmt.excluded.total_solved,
+                "contest_rating": stmt.excluded.contest_rating,
+                "global_rank": stmt.excluded.global_rank,
+                "created_at": stmt.excluded.created_at
+            },
+            # Reviewed snapshots are final
+            where=PlatformSnapshot.status == "pending"
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+    return stmt.returning(PlatformSnapshot.id, PlatformSnapshot.platform_account_id, PlatformSnapshot.snapshot_date)
+
+def submit_snapshots(principal, rows, on_conflict="skip"):
+    """
+    Validate and upsert rows. Returns per-row results in input order:
+    {"row", "status": created|updated|skipped|error, "id"?, "error"?}.
+    The caller commits.
+    """
+    if on_conflict not in CONFLICT_MODES:
+        raise BulkInputError("on_conflict must be 'skip' or 'update'")
+
+    results = [None] * len(rows)
+    valid = {}  # (account_id, date) -> (index, values)
+    for i, row in enumerate(rows):
+        try:
+            values = validate_row(row)
+        except BulkInputError as e:
+            results[i] = {"row": i, "status": "error", "error": str(e)}
+            continue
+        key = (values["platform_account_id"], values["snapshot_date"])
+        if key in valid:
+            results[i] = {"row": i, "status": "error", "error": f"Duplicate of row {valid[key][0]}"}
+            continue
+        valid[key] = (i, values)
+
+    allowed = accessible_accounts(principal, {account_id for account_id, _ in valid})
+    for key in [k for k in valid if k[0] not in allowed]:
+        i, _ = valid.pop(key)
+        results[i] = {"row": i, "status": "error", "error": "Platform account not found or not accessible"}
+
+    if valid:
+        keys = list(valid)
+        existing = set()
+        for start in range(0, len(keys), INSERT_CHUNK):
+            chunk = keys[start:start + INSERT_CHUNK]
+            existing.update(tuple(r) for r in db.session.execute(
+                select(PlatformSnapshot.platform_account_id, PlatformSnapshot.snapshot_date)
+                .where(tuple_(PlatformSnapshot.platform_account_id, PlatformSnapshot.snapshot_date).in_(chunk))
+            ))
+
+        now = datetime.utcnow()
+        written = {}
+        for start in range(0, len(keys), INSERT_CHUNK):
+            chunk = [dict(valid[k][1], id=str(uuid.uuid4()), status="pending", created_at=now)
+                     for k in keys[start:start + INSERT_CHUNK]]
+            for r in db.session.execute(_upsert_statement(chunk, on_conflict)):
+                written[(r.platform_account_id, r.snapshot_date)] = r.id
+
+        for key, (i, _) in valid.items():
+            if key in written:
+                status = "updated" if key in existing else "created"
+                results[i] = {"row": i, "status": status, "id": written[key]}
+            else:
+                reason = "already reviewed" if on_conflict == "update" else "already exists"
+                results[i] = {"row": i, "status": "skipped", "error": f"Snapshot for this date {reason}"}
+    return results
+
+def summarize(results):
+    summary = {status: 0 for status in ("created", "updated", "skipped", "error")}
+    for result in results:
+        summary[result["status"]] += 1
+    return summary
@@ -0,0 +1,52 @@
+from datetime import datetime
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.extensions import db
+from app.snapshots.partitions import (
+    INTERVALS,
+    is_partitioned,
+    partition_end,
+    partition_start,
+    create_snapshot_partitions,
+    detach_snapshot_partitions
+)
+
+snapshots_cli = AppGroup("snapshots", help="Maintain platform_snapshots partitions.")
+
+def require_partitioned_table():
+    if not is_partitioned():
+        raise click.ClickException("platform_snapshots is not partitioned (Postgres with migration f3a9c2d8b614 required).")
+
+@snapshots_cli.command("create-partitions")
+@click.option("--ahead", type=int, default=None,
+              help="Partitions to create past the current one. Defaults to SNAPSHOT_PARTITIONS_AHEAD.")
+@click.option("--interval", type=click.Choice(INTERVALS), default=None,
+              help="Partition size. Defaults to SNAPSHOT_PARTITION_INTERVAL.")
+@click.option("--start", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="First day to cover. Defaults to today.")
+def create_partitions_command(ahead, interval, start):
+    """Pre-create future snapshot partitions (run from cron, e.g. monthly)."""
+    require_partitioned_table()
+    interval = interval or current_app.config["SNAPSHOT_PARTITION_INTERVAL"]
+    ahead = current_app.config["SNAPSHOT_PARTITIONS_AHEAD"] if ahead is None else ahead
+
+    first_day = start.date() if start else datetime.utcnow().date()
+    last_day = partition_start(first_day, interval)
+    for _ in range(ahead):
+        last_day = partition_end(last_day, interval)
+
+    created = create_snapshot_partitions(first_day, last_day, interval)
+    db.session.commit()
+    click.echo(f"Created {len(created)} partition(s){': ' + ', '.join(created) if created else ''}.")
+
+@snapshots_cli.command("detach-partitions")
+@click.option("--before", type=click.DateTime(formats=["%Y-%m-%d"]), required=True,
+              help="Detach partitions whose range ends on or before this date.")
+@click.option("--drop", is_flag=True, help="Drop the detached tables instead of keeping them.")
+def detach_partitions_command(before, drop):
+    """Detach old snapshot partitions. platform_account_stats is not affected."""
+    require_partitioned_table()
+    detached = detach_snapshot_partitions(before.date(), drop=drop)
+    db.session.commit()
+    click.echo(f"{'Dropped' if drop else 'Detached'} {len(detached)} partition(s){': ' + ', '.join(detached) if detached else ''}.")
@@ -24,8 +24,23 @@ class PlatformSnapshot(db.Model):
     reviewed_at = db.Column(db.DateTime, nullable=True)
     remarks = db.Column(db.Text, nullable=True)
 
+    # On Postgres the table is range-partitioned by snapshot_date (migration
+    # f3a9c2d8b614); the database primary key is then (id, snapshot_date).
     __table_args__ = (
         db.UniqueConstraint('platform_account_id', 'snapshot_date', name='unique_platform_snapshot_date'),
+        # Latest approved values per account (stats refresh, rollups, time series)
+        db.Index(
+            'ix_platform_snapshots_approved_account_date', 'platform_account_id', 'snapshot_date',
+            postgresql_where=db.text("status = 'approved'"),
+            postgresql_include=['total_solved', 'contest_rating', 'global_rank'],
+            sqlite_where=db.text("status = 'approved'")
+        ),
+        # Counsellor review queue
+        db.Index(
+            'ix_platform_snapshots_pending_created_at', 'created_at', 'id',
+            postgresql_where=db.text("status = 'pending'"),
+            sqlite_where=db.text("status = 'pending'")
+        ),
     )
 
     platform_account = db.relationship(
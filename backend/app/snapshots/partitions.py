@@ -0,0 +1,104 @@
+"""
+Range partitions of platform_snapshots by snapshot_date (Postgres only).
+
+Partitions are named platform_snapshots_y2025m01 (monthly) or
+platform_snapshots_y2025 (yearly). A platform_snapshots_default partition
+catches dates outside every range; create_snapshot_partitions moves such
+rows into the new partition before attaching it.
+"""
+
+from datetime import date
+from sqlalchemy import text
+from app.extensions import db
+
+TABLE = "platform_snapshots"
+DEFAULT_PARTITION = f"{TABLE}_default"
+INTERVALS = ("month", "year")
+
+def partition_start(day, interval):
+    return day.replace(day=1) if interval == "month" else date(day.year, 1, 1)
+
+def partition_end(start, interval):
+    if interval == "year":
+        return date(start.year + 1, 1, 1)
+    return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+def partition_name(start, interval):
+    if interval == "year":
+        return f"{TABLE}_y{start.year}"
+    return f"{TABLE}_y{start.year}m{start.month:02d}"
+
+def partition_ranges(first_day, last_day, interval):
+    """(name, start, end) for every partition overlapping [first_day, last_day]"""
+    start = partition_start(first_day, interval)
+    while start <= last_day:
+        end = partition_end(start, interval)
+        yield partition_name(start, interval), start, end
+        start = end
+
+def is_partitioned():
+    if db.session.get_bind().dialect.name != "postgresql":
+        return False
+    return db.session.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+    ), {"table": TABLE}).first() is not None
+
+def list_partitions():
+    """(name, lower bound, upper bound) of attached range partitions, oldest first"""
+    rows = db.session.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:table AS regclass)"
+    ), {"table": TABLE}).all()
+
+    partitions = []
+    for name, bound in rows:
+        if bound == "DEFAULT":
+            continue
+        # FOR VALUES FROM ('2025-01-01') TO ('2025-02-01')
+        lower, upper = [date.fromisoformat(part.split("'")[1]) for part in bound.split(" TO ")]
+        partitions.append((name, lower, upper))
+    return sorted(partitions, key=lambda p: p[1])
+
+def create_snapshot_partitions(first_day, last_day, interval="month"):
+    """
+    Create missing partitions covering [first_day, last_day]. Rows already in
+    the default partition for a new range are moved in the same transaction.
+    Returns the names created; the caller commits.
+    """
+    existing = {name for name, _, _ in list_partitions()}
+    created = []
+    for name, start, end in partition_ranges(first_day, last_day, interval):
+        if name in existing:
+            continue
+        bounds = {"start": start, "end": end}
+        db.session.execute(text(
+            f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        db.session.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE snapshot_date >= :start AND snapshot_date < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ), bounds)
+        db.session.execute(text(
+            f"ALTER TABLE {TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        created.append(name)
+    return created
+
+def detach_snapshot_partitions(before, drop=False):
+    """
+    Detach (and optionally drop) partitions that end on or before `before`.
+    Detaching is a catalog change; the data stays in a standalone table.
+    Returns the names detached; the caller commits.
+    """
+    detached = []
+    for name, _, end in list_partitions():
+        if end > before:
+            break
+        db.session.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+        if drop:
+            db.session.execute(text(f"DROP TABLE {name}"))
+        detached.append(name)
+    return detached
@@ -1,5 +1,5 @@
 
-from flask import Blueprint, request
+from flask import Blueprint, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from app.extensions import db
@@ -7,6 +7,9 @@ from app.snapshots.models import PlatformSnapshot
 from app.platforms.models import PlatformAccount
 from app.students.models import Student
 from app.common.utils import success_response, error_response
+from app.common.principal import current_principal
+from app.snapshots.bulk import submit_snapshots, summarize, parse_csv, BulkInputError, CONFLICT_MODES
+from app.jobs.queue import enqueue
 
 snapshots_bp = Blueprint("snapshots_bp", __name__, url_prefix="/snapshots")
 
@@ -69,6 +72,66 @@ def create_snapshot():
         db.session.rollback()
         return error_response(f"Failed to create snapshot: {str(e)}", 500)
 
+@snapshots_bp.route("/bulk", methods=["POST"])
+@jwt_required()
+def create_snapshots_bulk():
+    """
+    Submit many pending snapshots at once: a JSON array (or {"snapshots": [...]})
+    or CSV (text/csv body, or a multipart "file") with columns
+    platform_account_id,total_solved,contest_rating,global_rank,snapshot_date.
+    ?on_conflict=skip (default) keeps existing snapshots; update rewrites
+    pending ones. Students submit for their own accounts, staff for the
+    students they manage. With ?async=true the rows are imported by a job
+    worker and the response is the queued job (poll GET /jobs/<id>).
+    """
+    principal = current_principal()
+    if not principal:
+        return error_response("User not found", 404)
+
+    on_conflict = request.args.get("on_conflict", "skip")
+    try:
+        if "file" in request.files:
+            rows = parse_csv(request.files["file"].read().decode("utf-8-sig"))
+        elif request.mimetype == "text/csv":
+            rows = parse_csv(request.get_data(as_text=True))
+        else:
+            data = request.get_json(silent=True)
+            if isinstance(data, dict):
+                on_conflict = data.get("on_conflict", on_conflict)
+                data = data.get("snapshots")
+            if not isinstance(data, list):
+                return error_response("Provide a JSON array of snapshots or CSV")
+            rows = data
+    except (UnicodeDecodeError, BulkInputError) as e:
+        return error_response(f"Invalid CSV: {e}")
+
+    if not rows:
+        return error_response("No snapshots provided")
+    run_async = request.args.get("async", "false").lower() == "true"
+    max_rows = current_app.config.get("SNAPSHOT_BULK_ASYNC_MAX_ROWS" if run_async else "SNAPSHOT_BULK_MAX_ROWS",
+                                      100000 if run_async else 5000)
+    if len(rows) > max_rows:
+        return error_response(f"At most {max_rows} snapshots per request", 413)
+
+    if run_async:
+        if on_conflict not in CONFLICT_MODES:
+            return error_response("on_conflict must be 'skip' or 'update'")
+        job = enqueue("snapshots.import", {"user_id": principal.id, "rows": rows, "on_conflict": on_conflict},
+                      created_by=principal.id)
+        return success_response(job.to_dict(), "Snapshots queued for import", 202)
+
+    try:
+        results = submit_snapshots(principal, rows, on_conflict)
+        db.session.commit()
+    except BulkInputError as e:
+        db.session.rollback()
+        return error_response(str(e))
+    except Exception as e:
+        db.session.rollback()
+        return error_response(f"Failed to create snapshots: {str(e)}", 500)
+
+    return success_response({"summary": summarize(results), "results": results}, "Snapshots processed")
+
 @snapshots_bp.route("/<platform_account_id>", methods=["GET"])
 @jwt_required()
 def get_snapshots(platform_account_id):
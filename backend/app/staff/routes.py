@@ -7,6 +7,8 @@ from app.staff.models import StaffProfile
 from app.academics.models import Department
 from app.students.models import Student, StudentAdvisor, StudentCounsellor
 from app.common.utils import hash_password, success_response, error_response, is_admin, is_hod, is_advisor, is_counsellor
+from app.common.principal import current_principal, load_principal
+from app.common.cache import response_cache, student_cache_tags
 from datetime import datetime
 
 staff_bp = Blueprint("staff_bp", __name__, url_prefix="/staff")
@@ -25,7 +27,7 @@ def can_create_role(creator_user, new_role_type, target_department_id):
         return True
 
     # 2. HOD Logic
-    if creator_user.department_hod_of and creator_user.department_hod_of.id == target_department_id:
+    if creator_user.hod_department_id and creator_user.hod_department_id == target_department_id:
         if new_role_type == "advisor":
             return True
         if new_role_type == "counsellor":
@@ -33,8 +35,7 @@ def can_create_role(creator_user, new_role_type, target_department_id):
              return False
 
     # 3. Advisor Logic 
-    staff_profile = StaffProfile.query.filter_by(user_id=creator_user.id).first()
-    if staff_profile and staff_profile.role_type == "advisor" and staff_profile.department_id == target_department_id:
+    if creator_user.staff_role_type == "advisor" and creator_user.staff_department_id == target_department_id:
         if new_role_type == "counsellor":
             return True
 
@@ -44,7 +45,7 @@ def can_create_role(creator_user, new_role_type, target_department_id):
 @jwt_required()
 def create_staff():
     current_user_id = get_jwt_identity()
-    creator = User.query.get(current_user_id)
+    creator = current_principal()
     if not creator:
         return error_response("User not found", 404)
 
@@ -111,6 +112,7 @@ def create_staff():
             db.session.add(department)
 
         db.session.commit()
+        response_cache.invalidate(f"user:{new_user.id}")
 
         return success_response({
             "user_id": new_user.id,
@@ -126,7 +128,7 @@ def create_staff():
 @jwt_required()
 def get_my_team():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     if not user:
         return error_response("User not found", 404)
 
@@ -135,17 +137,16 @@ def get_my_team():
     
     if is_admin(user):
         pass 
-    elif user.department_hod_of: 
-        dept_id = user.department_hod_of.id
+    elif user.hod_department_id: 
+        dept_id = user.hod_department_id
         staff_query = staff_query.filter(
             StaffProfile.department_id == dept_id,
             StaffProfile.role_type.in_(["advisor", "counsellor"])
         )
     else:
-        my_profile = StaffProfile.query.filter_by(user_id=user.id).first()
-        if my_profile and my_profile.role_type == "advisor":
+        if user.staff_role_type == "advisor":
             staff_query = staff_query.filter(
-                StaffProfile.department_id == my_profile.department_id,
+                StaffProfile.department_id == user.staff_department_id,
                 StaffProfile.role_type == "counsellor"
             )
         else:
@@ -178,7 +179,7 @@ def get_my_team():
 def assign_advisor():
     """HOD assigns students to an Advisor"""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     
     # 1. HOD/Admin Check
     if not is_admin(user) and not is_hod(user, None):
@@ -192,22 +193,22 @@ def assign_advisor():
         return error_response("Missing advisor_id or student_ids")
         
     # 2. Verify Advisor
-    advisor = User.query.get(advisor_id)
+    advisor = load_principal(advisor_id)
     if not advisor or not is_advisor(advisor):
          return error_response("Invalid advisor selected", 400)
     
     # 3. Dept Match Check (for HOD)
     if not is_admin(user):
         # Ensure Advisor is in HOD's department
-        hod_dept_id = user.department_hod_of.id if user.department_hod_of else None
+        hod_dept_id = user.hod_department_id
         
         # Check advisor's profile for dept match
-        adv_profile = StaffProfile.query.filter_by(user_id=advisor.id).first()
-        if not adv_profile or adv_profile.department_id != hod_dept_id:
+        if advisor.staff_department_id is None or advisor.staff_department_id != hod_dept_id:
              return error_response("Advisor does not belong to your department", 403)
 
     count = 0
     skipped = 0
+    cache_tags = [f"advisor:{advisor_id}", f"user:{advisor_id}"]
     for sid in student_ids:
         student = Student.query.get(sid)
         if not student: 
@@ -215,10 +216,15 @@ def assign_advisor():
             continue
             
         # Ensure student is in same dept
-        if not is_admin(user) and student.department_id and student.department_id != user.department_hod_of.id:
+        if not is_admin(user) and student.department_id and student.department_id != user.hod_department_id:
             skipped += 1
             continue
             
+        # Previous advisor's views are invalidated along with the student's
+        cache_tags.extend(student_cache_tags(student))
+        if student.advisor_record:
+            cache_tags.append(f"user:{student.advisor_record.advisor_user_id}")
+
         # Upsert assignment
         assignment = StudentAdvisor.query.filter_by(student_id=sid).first()
         if assignment:
@@ -229,6 +235,7 @@ def assign_advisor():
         count += 1
         
     db.session.commit()
+    response_cache.invalidate(*cache_tags)
     return success_response({"assigned_count": count, "skipped_count": skipped}, f"Assigned {count} students to advisor")
 
 @staff_bp.route("/assign-counsellor", methods=["POST"])
@@ -236,7 +243,7 @@ def assign_advisor():
 def assign_counsellor():
     """Advisor assigns students to a Counsellor"""
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     
     # 1. Advisor Check
     if not is_advisor(user) and not is_admin(user) and not is_hod(user, None):
@@ -250,7 +257,7 @@ def assign_counsellor():
          return error_response("Missing counsellor_id or student_ids")
          
     # 2. Verify Counsellor
-    counsellor = User.query.get(counsellor_id)
+    counsellor = load_principal(counsellor_id)
     if not counsellor or not is_counsellor(counsellor):
          return error_response("Invalid counsellor selected", 400)
          
@@ -260,6 +267,7 @@ def assign_counsellor():
     
     count = 0
     skipped = 0
+    cache_tags = [f"counsellor:{counsellor_id}", f"user:{counsellor_id}"]
     for sid in student_ids:
         # Check permissions over student
         if not is_admin(user) and not is_hod(user, None):
@@ -272,6 +280,7 @@ def assign_counsellor():
         # Upsert Counsellor assignment
         assignment = StudentCounsellor.query.filter_by(student_id=sid).first()
         if assignment:
+            cache_tags += [f"counsellor:{assignment.counsellor_user_id}", f"user:{assignment.counsellor_user_id}"]
             assignment.counsellor_user_id = counsellor_id
         else:
             assignment = StudentCounsellor(student_id=sid, counsellor_user_id=counsellor_id)
@@ -279,4 +288,5 @@ def assign_counsellor():
         count += 1
         
     db.session.commit()
+    response_cache.invalidate(*cache_tags)
     return success_response({"assigned_count": count, "skipped_count": skipped}, f"Assigned {count} students to counsellor")
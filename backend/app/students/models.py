@@ -14,7 +14,7 @@ class Student(db.Model):
         nullable=False
     )
     
-    department_id = db.Column(db.String(36), db.ForeignKey("departments.id", ondelete="SET NULL"), nullable=True)
+    department_id = db.Column(db.String(36), db.ForeignKey("departments.id", ondelete="SET NULL"), nullable=True, index=True)
 
     register_number = db.Column(db.String(50), unique=True, nullable=False)
     phone = db.Column(db.String(20))
@@ -34,7 +34,7 @@ class StudentAdvisor(db.Model):
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(db.String(36), db.ForeignKey("students.id", ondelete="CASCADE"), unique=True, nullable=False)
-    advisor_user_id = db.Column(db.String(36), db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    advisor_user_id = db.Column(db.String(36), db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     assigned_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     student = db.relationship("Student", backref=db.backref("advisor_record", uselist=False))
@@ -45,7 +45,7 @@ class StudentCounsellor(db.Model):
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     student_id = db.Column(db.String(36), db.ForeignKey("students.id", ondelete="CASCADE"), unique=True, nullable=False)
-    counsellor_user_id = db.Column(db.String(36), db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    counsellor_user_id = db.Column(db.String(36), db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     assigned_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     student = db.relationship("Student", backref=db.backref("counsellor_record", uselist=False))
@@ -1,60 +1,131 @@
 
+import json
+import base64
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
-from app.students.models import Student
+from app.students.models import Student, StudentAdvisor, StudentCounsellor
 from app.academics.models import Department
 from app.auth.models import User
 from app.common.utils import success_response, error_response, is_admin, is_hod
+from app.common.principal import current_principal
+from app.analytics.services import refresh_department_daily_stats
+from app.common.cache import response_cache, student_cache_tags
+from app.common.instrumentation import query_budget
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload
 
 students_bp = Blueprint("students_bp", __name__, url_prefix="/students")
 
+STUDENT_PAGE_SIZE = 50
+MAX_STUDENT_PAGE_SIZE = 200
+
+def encode_cursor(student):
+    payload = json.dumps([student.register_number, student.id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+def decode_cursor(cursor):
+    try:
+        register_number, student_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(register_number), str(student_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def student_list_item(student, user):
+    advisor_name = "Unassigned"
+    if student.advisor_record and student.advisor_record.advisor:
+        advisor_name = student.advisor_record.advisor.full_name
+
+    counsellor_name = "Unassigned"
+    if student.counsellor_record and student.counsellor_record.counsellor:
+        counsellor_name = student.counsellor_record.counsellor.full_name
+
+    return {
+        "id": student.id,
+        "full_name": user.full_name,
+        "email": user.email,
+        "register_number": student.register_number,
+        "admission_year": student.admission_year,
+        "department_id": student.department_id,
+        "department_name": student.department.name if student.department else None,
+        "advisor_name": advisor_name,
+        "counsellor_name": counsellor_name
+    }
+
 @students_bp.route("/all", methods=["GET"])
+@query_budget(2)
 @jwt_required()
 def get_all_students():
+    """
+    Students ordered by register number. Returns the full list unless the
+    client opts into pages with ?paginate=true, ?limit= or ?cursor=; a page is
+    {students, next_cursor, limit} and ?cursor= continues from next_cursor.
+    Filters: department_id, admission_year, and assigned=true/false, which
+    selects students with/without a department (not advisor or counsellor
+    assignment).
+    """
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     
     # Logic: Admin sees all. HOD sees own dept.
-    query = db.session.query(Student, User).join(User, Student.user_id == User.id)
+    # Department, advisor and counsellor are loaded in the same query
+    query = db.session.query(Student, User).join(User, Student.user_id == User.id)\
+        .options(
+            joinedload(Student.department),
+            joinedload(Student.advisor_record).joinedload(StudentAdvisor.advisor),
+            joinedload(Student.counsellor_record).joinedload(StudentCounsellor.counsellor)
+        )
     
     if is_admin(user):
         pass # No filter
     elif is_hod(user, None): # Check if HOD of any dept
-        if not user.department_hod_of:
+        if not user.hod_department_id:
              return error_response("HOD has no department assigned", 400)
-        query = query.filter(Student.department_id == user.department_hod_of.id)
+        query = query.filter(Student.department_id == user.hod_department_id)
     else:
         return error_response("Access denied. Admin or HOD role required.", 403)
+
+    # Filters
+    args = request.args
+    try:
+        if args.get("department_id"):
+            query = query.filter(Student.department_id == args["department_id"])
+        if args.get("admission_year"):
+            query = query.filter(Student.admission_year == int(args["admission_year"]))
+        if args.get("assigned") in ("true", "false"):
+            assigned = Student.department_id.isnot(None)
+            query = query.filter(assigned if args["assigned"] == "true" else ~assigned)
+
+        limit = min(int(args.get("limit", STUDENT_PAGE_SIZE)), MAX_STUDENT_PAGE_SIZE)
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return error_response("Invalid query parameters")
+
+    # Keyset pagination: rows strictly after the last (register_number, id) seen
+    if args.get("cursor"):
+        try:
+            query = query.filter(tuple_(Student.register_number, Student.id) > decode_cursor(args["cursor"]))
+        except ValueError as e:
+            return error_response(str(e))
+
+    query = query.order_by(Student.register_number, Student.id)
     
     try:
-        students = query.all()
-        
-        response_data = []
-        for student, user in students:
-            dept_name = student.department.name if student.department else None
-            
-            advisor_name = "Unassigned"
-            if student.advisor_record and student.advisor_record.advisor:
-                advisor_name = student.advisor_record.advisor.full_name
-                
-            counsellor_name = "Unassigned"
-            if student.counsellor_record and student.counsellor_record.counsellor:
-                counsellor_name = student.counsellor_record.counsellor.full_name
-
-            response_data.append({
-                "id": student.id,
-                "full_name": user.full_name,
-                "email": user.email,
-                "register_number": student.register_number,
-                "admission_year": student.admission_year,
-                "department_id": student.department_id,
-                "department_name": dept_name,
-                "advisor_name": advisor_name,
-                "counsellor_name": counsellor_name
-            })
-            
-        return success_response(response_data, "Students fetched successfully")
+        paginate = args.get("paginate") == "true" or "limit" in args or "cursor" in args
+        if not paginate:
+            response_data = [student_list_item(student, u) for student, u in query.all()]
+            return success_response(response_data, "Students fetched successfully")
+
+        # Fetch one extra row to know whether another page exists
+        rows = query.limit(limit + 1).all()
+        page = rows[:limit]
+
+        return success_response({
+            "students": [student_list_item(student, u) for student, u in page],
+            "next_cursor": encode_cursor(page[-1][0]) if len(rows) > limit else None,
+            "limit": limit
+        }, "Students fetched successfully")
     except Exception as e:
         return error_response(f"Failed to fetch students: {str(e)}", 500)
 
@@ -62,7 +133,7 @@ def get_all_students():
 @jwt_required()
 def assign_department(student_id):
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
     
     # Check Admin Role
     if not is_admin(user):
@@ -89,8 +160,12 @@ def assign_department(student_id):
 
     # Update Student Department
     try:
+        previous_department_id = student.department_id
+        cache_tags = [f"department:{department_id}", *student_cache_tags(student)]
         student.department_id = department_id
+        refresh_department_daily_stats([previous_department_id, department_id])
         db.session.commit()
+        response_cache.invalidate(*cache_tags)
         
         # Return response in exact format requested
         response_data = {
@@ -109,7 +184,7 @@ def assign_department(student_id):
 @jwt_required()
 def unassign_department(student_id):
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
 
     if not is_admin(user):
         return error_response("Access denied. Admin role required.", 403)
@@ -119,8 +194,12 @@ def unassign_department(student_id):
         return error_response("Student not found", 404)
 
     try:
+        previous_department_id = student.department_id
+        cache_tags = student_cache_tags(student)
         student.department_id = None
+        refresh_department_daily_stats([previous_department_id])
         db.session.commit()
+        response_cache.invalidate(*cache_tags)
 
         response_data = {
             "student_id": student.id,
@@ -134,12 +213,13 @@ def unassign_department(student_id):
 from app.platforms.models import PlatformAccount
 from app.snapshots.models import PlatformSnapshot
 from app.auth.models import UserRole
+from app.analytics.models import PlatformAccountStats
 
 @students_bp.route("/<student_id>", methods=["DELETE"])
 @jwt_required()
 def delete_student(student_id):
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_principal()
 
     if not is_admin(user):
         return error_response("Access denied. Admin role required.", 403)
@@ -150,12 +230,15 @@ def delete_student(student_id):
     
     try:
         user_id = student.user_id
+        department_id = student.department_id
         
         # 1. Get Account IDs
         account_ids = [acc.id for acc in student.platform_accounts]
+        cache_tags = student_cache_tags(student) + [f"account:{account_id}" for account_id in account_ids]
         
-        # 2. Delete Snapshots (Bulk)
+        # 2. Delete Snapshots and derived stats (Bulk)
         if account_ids:
+            PlatformAccountStats.query.filter(PlatformAccountStats.platform_account_id.in_(account_ids)).delete(synchronize_session=False)
             PlatformSnapshot.query.filter(PlatformSnapshot.platform_account_id.in_(account_ids)).delete(synchronize_session=False)
         
         # 3. Delete Platform Accounts (Bulk)
@@ -172,8 +255,10 @@ def delete_student(student_id):
         # 6. Delete User (Bulk)
         if user_id:
             User.query.filter(User.id == user_id).delete(synchronize_session=False)
-            
+
+        refresh_department_daily_stats([department_id])
         db.session.commit()
+        response_cache.invalidate(*cache_tags)
         return success_response(None, "Student deleted successfully")
     except Exception as e:
         db.session.rollback()
@@ -0,0 +1,143 @@
+"""
+Per-platform adapters for the sync engine.
+
+An adapter turns a username into PlatformStats with one or more HTTP calls
+on the engine's shared aiohttp session. `concurrency` and `rate` (requests
+per second) are the defaults the engine enforces per platform; SYNC_PLATFORMS
+overrides them along with `base_url`, so tests can point every adapter at a
+local stub server.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+class AccountNotFound(Exception):
+    pass
+
+class SyncHTTPError(Exception):
+    """Non-success response; retryable for 429 and 5xx"""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self):
+        return self.status == 429 or self.status >= 500
+
+@dataclass
+class PlatformStats:
+    total_solved: int
+    contest_rating: Optional[int] = None
+    global_rank: Optional[int] = None
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+class PlatformAdapter:
+    name = None
+    base_url = None
+    concurrency = 8
+    rate = 5.0
+
+    def __init__(self, base_url=None, concurrency=None, rate=None, headers=None):
+        self.base_url = (base_url or self.base_url).rstrip("/")
+        self.concurrency = concurrency or self.concurrency
+        self.rate = rate or self.rate
+        self.headers = headers or {}
+
+    async def request(self, session, method, path, **kwargs):
+        """JSON body of one call; raises AccountNotFound or SyncHTTPError"""
+        kwargs["headers"] = {**self.headers, **kwargs.get("headers", {})}
+        async with session.request(method, self.base_url + path, **kwargs) as response:
+            if response.status == 404:
+                raise AccountNotFound()
+            if response.status != 200:
+                raise SyncHTTPError(response.status, _retry_after(response))
+            return await response.json(content_type=None)
+
+    async def fetch(self, session, username):
+        raise NotImplementedError
+
+class LeetCodeAdapter(PlatformAdapter):
+    name = "leetcode"
+    base_url = "https://leetcode.com"
+    concurrency = 4
+    rate = 2.0
+
+    QUERY = """
+    query userStats($username: String!) {
+      matchedUser(username: $username) {
+        profile { ranking }
+        submitStats { acSubmissionNum { difficulty count } }
+      }
+      userContestRanking(username: $username) { rating globalRanking }
+    }
+    """
+
+    async def fetch(self, session, username):
+        body = await self.request(session, "POST", "/graphql",
+                                  json={"query": self.QUERY, "variables": {"username": username}})
+        data = body.get("data") or {}
+        user = data.get("matchedUser")
+        if not user:
+            raise AccountNotFound()
+
+        solved = {s["difficulty"]: s["count"] for s in user["submitStats"]["acSubmissionNum"]}
+        contest = data.get("userContestRanking") or {}
+        rating = contest.get("rating")
+        return PlatformStats(
+            total_solved=solved.get("All", 0),
+            contest_rating=round(rating) if rating is not None else None,
+            global_rank=contest.get("globalRanking") or user["profile"].get("ranking")
+        )
+
+class CodeforcesAdapter(PlatformAdapter):
+    name = "codeforces"
+    base_url = "https://codeforces.com/api"
+    # Codeforces allows about one call per two seconds per client
+    concurrency = 1
+    rate = 0.5
+
+    async def fetch(self, session, username):
+        try:
+            info = await self.request(session, "GET", "/user.info", params={"handles": username})
+        except SyncHTTPError as e:
+            # Unknown handles are a 400 with status FAILED
+            if e.status == 400:
+                raise AccountNotFound()
+            raise
+        if info.get("status") != "OK" or not info.get("result"):
+            raise AccountNotFound()
+        submissions = await self.request(session, "GET", "/user.status", params={"handle": username})
+
+        solved = {(s["problem"].get("contestId"), s["problem"].get("index"))
+                  for s in submissions.get("result", []) if s.get("verdict") == "OK"}
+        return PlatformStats(total_solved=len(solved), contest_rating=info["result"][0].get("rating"))
+
+class HackerRankAdapter(PlatformAdapter):
+    name = "hackerrank"
+    base_url = "https://www.hackerrank.com"
+    concurrency = 4
+    rate = 2.0
+
+    async def fetch(self, session, username):
+        badges = await self.request(session, "GET", f"/rest/hackers/{username}/badges")
+        return PlatformStats(total_solved=sum(b.get("solved", 0) for b in badges.get("models", [])))
+
+# GitHub has no solve count, so its accounts are not synced into snapshots
+ADAPTERS = {adapter.name: adapter for adapter in
+            (LeetCodeAdapter, CodeforcesAdapter, HackerRankAdapter)}
+
+def build_adapters(config):
+    """Adapter instances with SYNC_PLATFORMS overrides ({"codeforces": {"rate": 0.25}, ...})"""
+    overrides = config.get("SYNC_PLATFORMS") or {}
+    adapters = {}
+    for name, adapter in ADAPTERS.items():
+        adapters[name] = adapter(**overrides.get(name, {}))
+    return adapters
@@ -0,0 +1,18 @@
+import click
+from flask.cli import AppGroup
+from app.sync.adapters import ADAPTERS
+from app.sync.services import sync_accounts
+
+sync_cli = AppGroup("sync", help="Fetch linked platform accounts' stats.")
+
+@sync_cli.command("run")
+@click.option("--platform", "platforms", multiple=True, type=click.Choice(sorted(ADAPTERS)),
+              help="Platform to sync. Repeatable; defaults to all supported platforms.")
+@click.option("--account", "account_ids", multiple=True, help="Platform account id. Repeatable.")
+@click.option("--limit", type=int, default=None, help="Sync at most this many accounts.")
+def sync_run_command(platforms, account_ids, limit):
+    """Fetch current stats for linked accounts and store today's snapshots (run from cron, e.g. daily)."""
+    summary = sync_accounts(platforms or None, account_ids or None, limit)
+    click.echo(f"Synced {summary['ok']}/{summary['accounts']} accounts "
+               f"({summary['not_found']} not found, {summary['failed']} failed); "
+               f"wrote {summary['written']} snapshots.")
@@ -0,0 +1,136 @@
+"""
+Asynchronous platform sync engine.
+
+All accounts are fetched on one event loop through a single aiohttp session
+whose connector pools keep-alive connections (SYNC_MAX_CONNECTIONS overall).
+Each platform has its own semaphore (concurrent requests) and rate limiter
+(requests per second), so a slow or strict platform never starves the
+others. 429, 5xx and network errors are retried with exponential backoff
+and jitter, honouring Retry-After; unknown usernames are reported, not
+retried.
+
+Results are handed to `on_batch` every SYNC_BATCH_SIZE accounts, so
+snapshots are written in batches while fetching continues.
+"""
+
+import time
+import asyncio
+import random
+import logging
+from dataclasses import dataclass
+from typing import Optional
+import aiohttp
+from app.sync.adapters import AccountNotFound, SyncHTTPError, PlatformStats
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class SyncResult:
+    account_id: str
+    platform_name: str
+    status: str  # "ok", "not_found", "failed"
+    stats: Optional[PlatformStats] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+class RateLimiter:
+    """Spaces acquisitions at least 1/rate seconds apart"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            now = time.monotonic()
+            wait = max(0.0, self.next_at - now)
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait:
+            await asyncio.sleep(wait)
+
+class SyncEngine:
+    def __init__(self, adapters, max_connections=100, timeout=15.0, max_retries=3,
+                 backoff=0.5, max_backoff=30.0, batch_size=500):
+        self.adapters = adapters
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_config(cls, config, adapters):
+        return cls(
+            adapters,
+            max_connections=config.get("SYNC_MAX_CONNECTIONS", 100),
+            timeout=config.get("SYNC_TIMEOUT_SECONDS", 15),
+            max_retries=config.get("SYNC_MAX_RETRIES", 3),
+            backoff=config.get("SYNC_BACKOFF_SECONDS", 0.5),
+            batch_size=config.get("SYNC_BATCH_SIZE", 500)
+        )
+
+    def backoff_delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def fetch_account(self, session, account, semaphore, limiter):
+        """account is (id, platform_name, username)"""
+        account_id, platform_name, username = account
+        adapter = self.adapters[platform_name]
+        error = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            async with semaphore:
+                await limiter.acquire()
+                try:
+                    stats = await adapter.fetch(session, username)
+                    return SyncResult(account_id, platform_name, "ok", stats=stats, attempts=attempt + 1)
+                except AccountNotFound:
+                    return SyncResult(account_id, platform_name, "not_found", attempts=attempt + 1)
+                except SyncHTTPError as e:
+                    error = str(e)
+                    if not e.retryable:
+                        break
+                    retry_after = e.retry_after
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = f"{type(e).__name__}: {e}"
+                except (KeyError, TypeError, ValueError) as e:
+                    # Unexpected payload shape: retrying will not help
+                    error = f"Bad response: {type(e).__name__}: {e}"
+                    break
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.backoff_delay(attempt, retry_after))
+
+        logger.warning("Sync failed for %s account %s (%s): %s", platform_name, account_id, username, error)
+        return SyncResult(account_id, platform_name, "failed", error=error, attempts=attempt + 1)
+
+    async def run(self, accounts, on_batch=None):
+        """
+        Fetch stats for (id, platform_name, username) tuples. on_batch(results)
+        is called with every batch_size results as they complete and once
+        with the remainder. Returns every SyncResult.
+        """
+        accounts = [a for a in accounts if a[1] in self.adapters]
+        semaphores = {name: asyncio.Semaphore(a.concurrency) for name, a in self.adapters.items()}
+        limiters = {name: RateLimiter(a.rate) for name, a in self.adapters.items()}
+
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        results, batch = [], []
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            tasks = [asyncio.create_task(self.fetch_account(session, a, semaphores[a[1]], limiters[a[1]]))
+                     for a in accounts]
+            for done in asyncio.as_completed(tasks):
+                result = await done
+                results.append(result)
+                batch.append(result)
+                if on_batch and len(batch) >= self.batch_size:
+                    on_batch(batch)
+                    batch = []
+        if on_batch and batch:
+            on_batch(batch)
+        return results
@@ -0,0 +1,133 @@
+"""
+Sync linked platform accounts into platform_snapshots.
+
+sync_accounts runs the SyncEngine over the selected accounts and writes each
+batch of results as it arrives: one upsert for the batch's snapshots (dated
+today, approved, since the values come from the platform itself), one
+refresh of the derived stats and one cache invalidation. The writes run on
+the event loop thread between fetches; a batch is a single round of
+statements, so fetching resumes quickly.
+
+A later sync overwrites only the same-day snapshots an earlier sync wrote
+and no counsellor has reviewed since; a student's own submission for the
+day (pending or reviewed) is left as it is.
+"""
+
+import asyncio
+import uuid
+from collections import Counter
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, and_
+from sqlalchemy.dialects import postgresql, sqlite
+from app.extensions import db
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.students.models import Student, StudentAdvisor, StudentCounsellor
+from app.analytics.services import refresh_account_stats, refresh_department_daily_stats
+from app.common.cache import response_cache, assignment_cache_tags
+from app.sync.adapters import ADAPTERS, build_adapters
+from app.sync.engine import SyncEngine
+
+SYNC_REMARKS = "Synced from platform"
+
+def syncable_accounts(platforms=None, account_ids=None, limit=None):
+    """(id, platform_name, username) of active accounts on supported platforms"""
+    query = select(PlatformAccount.id, PlatformAccount.platform_name, PlatformAccount.username)\
+        .where(PlatformAccount.is_active.isnot(False),
+               PlatformAccount.platform_name.in_(platforms or list(ADAPTERS)))
+    if account_ids:
+        query = query.where(PlatformAccount.id.in_(account_ids))
+    query = query.order_by(PlatformAccount.id)
+    if limit:
+        query = query.limit(limit)
+    return [tuple(row) for row in db.session.execute(query)]
+
+def _upsert_statement(rows):
+    dialect = db.session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(PlatformSnapshot).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["platform_account_id", "snapshot_date"],
+        set_={
+            "total_solved": stmt.excluded.total_solved,
+            "contest_rating": stmt.excluded.contest_rating,
+            "global_rank": stmt.excluded.global_rank,
+            "status": stmt.excluded.status,
+            "reviewed_at": stmt.excluded.reviewed_at,
+            "remarks": stmt.excluded.remarks
+        },
+        # Student submissions and counsellor decisions are final
+        where=and_(PlatformSnapshot.remarks == SYNC_REMARKS, PlatformSnapshot.reviewed_by.is_(None))
+    )
+    return stmt.returning(PlatformSnapshot.platform_account_id)
+
+def write_sync_results(results, snapshot_date=None):
+    """Upsert today's snapshot for every successful result and refresh derived data; commits"""
+    now = datetime.utcnow()
+    snapshot_date = snapshot_date or now.date()
+    rows = [{
+        "id": str(uuid.uuid4()),
+        "platform_account_id": r.account_id,
+        "total_solved": r.stats.total_solved,
+        "contest_rating": r.stats.contest_rating,
+        "global_rank": r.stats.global_rank,
+        "snapshot_date": snapshot_date,
+        "status": "approved",
+        "reviewed_at": now,
+        "remarks": SYNC_REMARKS,
+        "created_at": now
+    } for r in results if r.status == "ok"]
+    if not rows:
+        return 0
+
+    try:
+        written = set(db.session.execute(_upsert_statement(rows)).scalars())
+        if not written:
+            db.session.commit()
+            return 0
+
+        owners = db.session.execute(
+            select(PlatformAccount.id, Student.id.label("student_id"), Student.user_id, Student.department_id,
+                   StudentAdvisor.advisor_user_id, StudentCounsellor.counsellor_user_id)
+            .join(Student, PlatformAccount.student_id == Student.id)
+            .outerjoin(StudentAdvisor, StudentAdvisor.student_id == Student.id)
+            .outerjoin(StudentCounsellor, StudentCounsellor.student_id == Student.id)
+            .where(PlatformAccount.id.in_(written))
+        ).all()
+
+        refresh_account_stats(written, since=snapshot_date)
+        refresh_department_daily_stats([o.department_id for o in owners], since=snapshot_date)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    cache_tags = set()
+    for o in owners:
+        cache_tags.add(f"account:{o.id}")
+        cache_tags.update(assignment_cache_tags(o.student_id, o.user_id, o.department_id,
+                                                o.advisor_user_id, o.counsellor_user_id))
+    response_cache.invalidate(*cache_tags)
+    return len(written)
+
+def sync_accounts(platforms=None, account_ids=None, limit=None):
+    """
+    Fetch and store current stats for the selected accounts. Returns a
+    summary {"accounts", "ok", "not_found", "failed", "written"}.
+    """
+    config = current_app.config
+    accounts = syncable_accounts(platforms, account_ids, limit)
+    engine = SyncEngine.from_config(config, build_adapters(config))
+
+    written = []
+    results = asyncio.run(engine.run(accounts, on_batch=lambda batch: written.append(write_sync_results(batch))))
+
+    counts = Counter(r.status for r in results)
+    return {
+        "accounts": len(accounts),
+        "ok": counts["ok"],
+        "not_found": counts["not_found"],
+        "failed": counts["failed"],
+        "written": sum(written)
+    }
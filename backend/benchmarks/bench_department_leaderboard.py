@@ -0,0 +1,51 @@
+"""
+Benchmark: /analytics/department/<id>/leaderboard
+
+Shows that the leaderboard issues a constant number of queries regardless of
+department size.
+
+Usage:
+    python benchmarks/bench_department_leaderboard.py
+    python benchmarks/bench_department_leaderboard.py --scales 100 1000 50000
+    python benchmarks/bench_department_leaderboard.py --database-url postgresql://...
+"""
+
+import argparse
+
+from common import make_app, build_department, create_user_with_role, timed_get, DEFAULT_DATABASE_URL
+from app.extensions import db
+
+DEFAULT_SCALES = [100, 1000, 10000, 50000]
+
+
+def run(scales, database_url):
+    print(f"{'students':>10} {'queries':>8} {'time_ms':>10} {'rows':>8}")
+    query_counts = set()
+    for n_students in scales:
+        app = make_app(database_url, CACHE_TYPE="null")
+        with app.app_context():
+            department_id = build_department(n_students)
+            _, token = create_user_with_role("admin")
+            engine = db.engine
+
+        # Requests run outside the setup context so each gets a fresh session
+        client = app.test_client()
+        url = f"/analytics/department/{department_id}/leaderboard"
+
+        # Warm-up request so connection setup is not measured
+        timed_get(client, url, token, engine)
+        response, elapsed_ms, queries = timed_get(client, url, token, engine)
+        assert response.status_code == 200, response.get_json()
+        rows = len(response.get_json()["data"]["leaderboard"])
+        query_counts.add(queries)
+        print(f"{n_students:>10} {queries:>8} {elapsed_ms:>10.1f} {rows:>8}")
+
+    print(f"\nQuery count constant across scales: {len(query_counts) == 1}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    args = parser.parse_args()
+    run(args.scales, args.database_url)
@@ -0,0 +1,264 @@
+"""
+Benchmark suite: every dashboard endpoint against synthetic institutions
+
+Builds an institution shaped like scripts/config.py (DEPARTMENTS,
+GENERATOR_CONFIG, PLATFORMS) at each scale with a year of weekly snapshots,
+then times the analytics, advisor, counsellor, review and students endpoints
+as the role that uses them. For every endpoint it records latency
+(median/p95), SQL statement count, response size and peak Python memory
+(tracemalloc) of one request. The response cache is disabled so every
+request does its full work.
+
+Results are written as JSON (default benchmarks/results/endpoints-<time>.json)
+so runs can be compared; --compare prints median ratios against an earlier
+file.
+
+Usage:
+    python benchmarks/bench_endpoints.py
+    python benchmarks/bench_endpoints.py --scales 1000 --repeats 10
+    python benchmarks/bench_endpoints.py --database-url sqlite:////tmp/bench.db --scales 100000
+    python benchmarks/bench_endpoints.py --database-url postgresql://localhost/codelens_bench
+    python benchmarks/bench_endpoints.py --compare benchmarks/results/endpoints-20260101-120000.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from common import make_app, build_institution, create_user_with_role, QueryCounter, DEFAULT_DATABASE_URL
+from app.extensions import db
+from app.snapshots.models import PlatformSnapshot
+from app.platforms.models import PlatformAccount
+from app.students.models import StudentCounsellor
+from scripts.config import DEPARTMENTS, GENERATOR_CONFIG, PLATFORMS
+from flask_jwt_extended import create_access_token
+
+DEFAULT_SCALES = [1000, 10000, 100000]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# (name, role, method, path); {placeholders} are filled from the built institution
+ENDPOINTS = [
+    ("analytics.institution_summary", "admin", "GET", "/analytics/institution-summary"),
+    ("analytics.department_performance", "admin", "GET", "/analytics/department-performance"),
+    ("analytics.top_performers", "admin", "GET", "/analytics/top-performers?limit=20"),
+    ("analytics.top_performers_by_department", "admin", "GET", "/analytics/top-performers?partition=department&limit=10"),
+    ("analytics.at_risk", "admin", "GET", "/analytics/at-risk"),
+    ("analytics.department_leaderboard", "hod", "GET", "/analytics/department/{department_id}/leaderboard"),
+    ("analytics.department_trend", "hod", "GET", "/analytics/department/{department_id}/trend"),
+    ("analytics.department_series", "hod", "GET", "/analytics/timeseries/department/{department_id}?interval=month"),
+    ("analytics.student_series", "student", "GET", "/analytics/timeseries/student/{student_id}"),
+    ("analytics.account_series", "student", "GET", "/analytics/timeseries/account/{account_id}"),
+    ("analytics.my_summary", "student", "GET", "/analytics/my-summary"),
+    ("analytics.my_growth", "student", "GET", "/analytics/my-growth/{account_id}"),
+    ("advisor.my_students", "advisor", "GET", "/analytics/advisor/my-students"),
+    ("advisor.student_detail", "advisor", "GET", "/analytics/advisor/student/{student_id}"),
+    ("counsellor.summary", "counsellor", "GET", "/analytics/counsellor/summary"),
+    ("counsellor.students", "counsellor", "GET", "/analytics/counsellor/students"),
+    ("counsellor.at_risk", "counsellor", "GET", "/analytics/counsellor/at-risk"),
+    ("review.pending_snapshots", "counsellor", "GET", "/counsellor/pending-snapshots"),
+    ("review.approve_snapshot", "counsellor", "PUT", "/counsellor/snapshots/{pending_id}/approve"),
+    ("review.reject_snapshot", "counsellor", "PUT", "/counsellor/snapshots/{pending_id}/reject"),
+    ("students.all_page", "admin", "GET", "/students/all?limit=50"),
+    ("students.all_department", "hod", "GET", "/students/all?limit=200"),
+    ("students.all_unpaginated", "admin", "GET", "/students/all"),
+]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def pending_snapshot_ids(counsellor_id, count):
+    rows = db.session.query(PlatformSnapshot.id)\
+        .join(PlatformAccount, PlatformSnapshot.platform_account_id == PlatformAccount.id)\
+        .join(StudentCounsellor, StudentCounsellor.student_id == PlatformAccount.student_id)\
+        .filter(PlatformSnapshot.status == "pending", StudentCounsellor.counsellor_user_id == counsellor_id)\
+        .limit(count).all()
+    return [r.id for r in rows]
+
+
+def request_once(client, method, url, token, engine):
+    with QueryCounter(engine) as counter:
+        start = time.perf_counter()
+        body = {"remarks": "benchmark"} if method != "GET" else None
+        response = client.open(url, method=method, json=body, headers={"Authorization": f"Bearer {token}"})
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    return response, elapsed_ms, counter.count
+
+
+def measure(app, client, engine, method, url_for, token, repeats):
+    """Time one endpoint; url_for(i) gives the URL of the i-th call"""
+    if method == "GET":
+        request_once(client, method, url_for(0), token, engine)  # warm-up
+
+    times, queries, status, size = [], [], None, 0
+    for i in range(repeats):
+        response, elapsed_ms, count = request_once(client, method, url_for(i + 1), token, engine)
+        status = response.status_code
+        size = len(response.get_data())
+        times.append(elapsed_ms)
+        queries.append(count)
+
+    tracemalloc.start()
+    request_once(client, method, url_for(repeats + 1), token, engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    path = url_for(0).split("?")[0]
+    endpoint, _ = app.url_map.bind("localhost").match(path, method=method)
+    budget = getattr(app.view_functions[endpoint], "query_budget", None)
+
+    times.sort()
+    return {
+        "method": method,
+        "path": url_for(0),
+        "status": status,
+        "median_ms": round(statistics.median(times), 2),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 2),
+        "min_ms": round(times[0], 2),
+        "queries": max(queries),
+        "query_budget": budget,
+        "response_bytes": size,
+        "peak_memory_kb": round(peak / 1024, 1)
+    }
+
+
+def run_scale(n_students, args):
+    app = make_app(args.database_url, CACHE_TYPE="null", SQL_ENFORCE_QUERY_BUDGETS=False)
+
+    with app.app_context():
+        start = time.perf_counter()
+        built = build_institution(n_students, DEPARTMENTS, GENERATOR_CONFIG, PLATFORMS,
+                                  weeks=args.weeks, accounts_per_student=args.accounts_per_student,
+                                  pending_ratio=args.pending_ratio)
+        build_seconds = time.perf_counter() - start
+        snapshot_count = PlatformSnapshot.query.count()
+
+        student = built["students"][0]
+        _, admin_token = create_user_with_role("admin")
+        tokens = {
+            "admin": admin_token,
+            "hod": create_access_token(identity=built["hods"][0]),
+            "advisor": create_access_token(identity=built["advisors"][0]),
+            "counsellor": create_access_token(identity=built["counsellors"][0]),
+            "student": create_access_token(identity=student["user_id"])
+        }
+        # Approve and reject each consume distinct pending snapshots
+        pending = pending_snapshot_ids(built["counsellors"][0], 2 * (args.repeats + 2))
+        engine = db.engine
+
+    print(f"\n{n_students} students, {snapshot_count} snapshots (built in {build_seconds:.1f}s)")
+    print(f"{'endpoint':<42} {'status':>6} {'median_ms':>10} {'p95_ms':>9} {'queries':>8} {'peak_kb':>9}")
+
+    placeholders = {
+        "department_id": built["departments"][0],
+        "student_id": student["id"],
+        "account_id": student["account_ids"][0]
+    }
+    pending_for = {"review.approve_snapshot": pending[0::2], "review.reject_snapshot": pending[1::2]}
+    client = app.test_client()
+    results = {}
+    for name, role, method, path in ENDPOINTS:
+        if name in pending_for:
+            ids = pending_for[name]
+            if len(ids) < args.repeats + 2:
+                print(f"{name:<42} skipped: not enough pending snapshots")
+                continue
+            url_for = lambda i, ids=ids, path=path: path.format(pending_id=ids[i], **placeholders)
+        else:
+            url = path.format(**placeholders)
+            url_for = lambda i, url=url: url
+
+        result = measure(app, client, engine, method, url_for, tokens[role], args.repeats)
+        results[name] = result
+        over = " over budget" if result["query_budget"] is not None and result["queries"] > result["query_budget"] else ""
+        print(f"{name:<42} {result['status']:>6} {result['median_ms']:>10.2f} {result['p95_ms']:>9.2f} "
+              f"{result['queries']:>8} {result['peak_memory_kb']:>9.1f}{over}")
+
+    return {
+        "students": n_students,
+        "snapshots": snapshot_count,
+        "build_seconds": round(build_seconds, 2),
+        "endpoints": results
+    }
+
+
+def compare(current, previous_path):
+    with open(previous_path) as f:
+        previous = json.load(f)
+    before = {s["students"]: s["endpoints"] for s in previous["scales"]}
+    print(f"\nCompared with {previous_path} ({previous['meta'].get('git_revision')}): median ratio, query delta")
+    for scale in current["scales"]:
+        old = before.get(scale["students"])
+        if not old:
+            continue
+        print(f"  {scale['students']} students")
+        for name, result in scale["endpoints"].items():
+            if name in old and old[name]["median_ms"]:
+                ratio = result["median_ms"] / old[name]["median_ms"]
+                delta = result["queries"] - old[name]["queries"]
+                print(f"    {name:<40} {ratio:>6.2f}x {delta:>+5d} queries")
+
+
+def run(args):
+    # Latencies are in the report; keep slow-query warnings out of the table
+    logging.getLogger("app.common.instrumentation").setLevel(logging.ERROR)
+    report = {
+        "meta": {
+            "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "git_revision": git_revision(),
+            "database": args.database_url.split("://")[0],
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": args.repeats,
+            "weeks": args.weeks,
+            "accounts_per_student": args.accounts_per_student,
+            "pending_ratio": args.pending_ratio
+        },
+        "scales": []
+    }
+    for n_students in args.scales:
+        report["scales"].append(run_scale(n_students, args))
+    report["meta"]["peak_rss_mb"] = peak_rss_mb()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"endpoints-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nPeak RSS {report['meta']['peak_rss_mb']} MB; results written to {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--accounts-per-student", type=int, default=1)
+    parser.add_argument("--pending-ratio", type=float, default=0.25, help="share of accounts with a pending snapshot")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--output", help="JSON results path")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    run(parser.parse_args())
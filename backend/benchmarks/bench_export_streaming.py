@@ -0,0 +1,65 @@
+"""
+Benchmark: /exports/snapshots
+
+Streams the full snapshot history as CSV and NDJSON and reports the time to
+the first byte, the total time and Python's peak traced memory while the
+response is consumed. Peak memory should stay flat as the row count grows
+(it is bounded by EXPORT_BATCH_SIZE), and the first byte should arrive in
+constant time.
+
+Usage:
+    python benchmarks/bench_export_streaming.py
+    python benchmarks/bench_export_streaming.py --scales 1000 10000 50000 --snapshots-per-account 30
+    python benchmarks/bench_export_streaming.py --database-url postgresql://...
+"""
+
+import time
+import argparse
+import tracemalloc
+
+from common import make_app, build_department, create_user_with_role, DEFAULT_DATABASE_URL
+
+DEFAULT_SCALES = [1000, 5000, 20000]
+
+
+def consume(client, url, token):
+    """(first_byte_ms, total_ms, bytes, peak_mb) for one streamed download"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get(url, headers={"Authorization": f"Bearer {token}"}, buffered=False)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    chunks = iter(response.response)
+    size = len(next(chunks))
+    first_byte = time.perf_counter() - started
+    for chunk in chunks:
+        size += len(chunk)
+    response.close()
+    total = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_byte * 1000, total * 1000, size, peak / 1024 / 1024
+
+
+def run(scales, snapshots_per_account, database_url):
+    print(f"{'students':>10} {'rows':>10} {'format':>7} {'first_ms':>9} {'total_ms':>10} {'MB_out':>8} {'peak_MB':>8}")
+    for n_students in scales:
+        app = make_app(database_url)
+        with app.app_context():
+            build_department(n_students, snapshots_per_account=snapshots_per_account)
+            _, token = create_user_with_role("admin")
+        client = app.test_client()
+        rows = n_students * 3 * snapshots_per_account
+
+        for fmt in ("csv", "ndjson"):
+            first_ms, total_ms, size, peak_mb = consume(client, f"/exports/snapshots?format={fmt}", token)
+            print(f"{n_students:>10} {rows:>10} {fmt:>7} {first_ms:>9.1f} {total_ms:>10.1f} "
+                  f"{size / 1024 / 1024:>8.1f} {peak_mb:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--snapshots-per-account", type=int, default=10)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    args = parser.parse_args()
+    run(args.scales, args.snapshots_per_account, args.database_url)
@@ -0,0 +1,105 @@
+"""
+Benchmark: /analytics/institution-summary total_growth
+
+Loads ~1M approved snapshot rows, then times the endpoint and the growth
+aggregate it runs. The aggregate reads platform_account_stats, so its cost
+depends on the number of accounts, not on snapshot history. The result is
+checked against a one-pass LAG() window over the raw snapshots.
+
+Usage:
+    python benchmarks/bench_institution_summary.py
+    python benchmarks/bench_institution_summary.py --snapshots 200000 --budget-ms 50
+"""
+
+import argparse
+import statistics
+import time
+
+from sqlalchemy import func, select
+
+from common import make_app, build_department, create_user_with_role, timed_get, DEFAULT_DATABASE_URL
+from app.extensions import db
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.models import PlatformAccountStats
+
+SNAPSHOTS_PER_ACCOUNT = 52  # one year of weekly snapshots
+ACCOUNTS_PER_STUDENT = 3
+
+
+def lag_total_growth():
+    """Reference implementation: latest minus previous via LAG() over raw snapshots"""
+    ranked = select(
+        PlatformSnapshot.total_solved,
+        (PlatformSnapshot.total_solved - func.lag(PlatformSnapshot.total_solved).over(
+            partition_by=PlatformSnapshot.platform_account_id,
+            order_by=PlatformSnapshot.snapshot_date
+        )).label("delta"),
+        func.row_number().over(
+            partition_by=PlatformSnapshot.platform_account_id,
+            order_by=PlatformSnapshot.snapshot_date.desc()
+        ).label("rn")
+    ).where(PlatformSnapshot.status == "approved").subquery()
+    return db.session.execute(
+        select(func.coalesce(func.sum(ranked.c.delta), 0)).where(ranked.c.rn == 1)
+    ).scalar()
+
+
+def stats_total_growth():
+    return db.session.execute(
+        select(func.coalesce(func.sum(PlatformAccountStats.solved_growth), 0))
+    ).scalar()
+
+
+def run(n_snapshots, repeats, budget_ms, database_url):
+    n_students = max(1, n_snapshots // (SNAPSHOTS_PER_ACCOUNT * ACCOUNTS_PER_STUDENT))
+    app = make_app(database_url, CACHE_TYPE="null")
+
+    with app.app_context():
+        start = time.perf_counter()
+        build_department(n_students, snapshots_per_account=SNAPSHOTS_PER_ACCOUNT)
+        load_s = time.perf_counter() - start
+        total_rows = PlatformSnapshot.query.count()
+        print(f"Loaded {total_rows} snapshots for {n_students} students in {load_s:.1f}s")
+
+        query_times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            growth = stats_total_growth()
+            query_times.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        reference = lag_total_growth()
+        lag_ms = (time.perf_counter() - start) * 1000
+
+        _, token = create_user_with_role("admin")
+        engine = db.engine
+
+    client = app.test_client()
+    endpoint_times = []
+    for _ in range(repeats):
+        response, elapsed_ms, queries = timed_get(client, "/analytics/institution-summary", token, engine)
+        assert response.status_code == 200, response.get_json()
+        endpoint_times.append(elapsed_ms)
+    endpoint_growth = response.get_json()["data"]["total_growth"]
+
+    query_ms = statistics.median(query_times)
+    endpoint_ms = statistics.median(endpoint_times)
+    print(f"total_growth (stats table):    {growth}")
+    print(f"total_growth (LAG reference):  {reference}")
+    print(f"total_growth (endpoint):       {endpoint_growth}")
+    print(f"growth aggregate median:       {query_ms:.2f} ms")
+    print(f"endpoint median:               {endpoint_ms:.2f} ms ({queries} queries)")
+    print(f"LAG() over full history:       {lag_ms:.2f} ms (reference only)")
+
+    assert growth == reference == endpoint_growth, "growth mismatch"
+    print(f"\nWithin {budget_ms} ms budget: {endpoint_ms <= budget_ms}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshots", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    args = parser.parse_args()
+    run(args.snapshots, args.repeats, args.budget_ms, args.database_url)
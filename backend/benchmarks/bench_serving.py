@@ -0,0 +1,156 @@
+"""
+Benchmark: requests/second under the Werkzeug dev server vs gunicorn
+
+Seeds a file-backed database, then starts each server in a subprocess and
+drives one endpoint with concurrent keep-alive clients for a fixed time:
+
+    dev        python run.py as before (Werkzeug, debug=True)
+    gunicorn   gunicorn -c gunicorn.conf.py wsgi:app
+
+The response cache is disabled so every request does its database work.
+SQLite serialises writers but not readers, so read endpoints scale with
+workers much as they would on Postgres.
+
+Usage:
+    python benchmarks/bench_serving.py
+    python benchmarks/bench_serving.py --workers 4 --worker-class gthread --threads 4 --concurrency 32
+    python benchmarks/bench_serving.py --path /health --duration 5
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from common import make_app, build_department, create_user_with_role
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEV_SERVER = "from run import app; app.run(host='127.0.0.1', port={port}, debug=True, use_reloader=False)"
+
+
+def seed(database_url, n_students):
+    app = make_app(database_url)
+    with app.app_context():
+        build_department(n_students)
+        _, token = create_user_with_role("admin")
+    return app.config["JWT_SECRET_KEY"], token
+
+
+def wait_until_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def load(port, path, token, concurrency, duration):
+    """Drive `path` from `concurrency` keep-alive clients; returns (count, errors, latencies_ms)"""
+    latencies, errors = [], []
+    stop_at = time.monotonic() + duration
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        mine, failed = [], 0
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            mine.append((time.perf_counter() - start) * 1000)
+        latencies.extend(mine)
+        errors.append(failed)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return len(latencies), sum(errors), latencies
+
+
+def run_server(name, command, env, port, path, token, concurrency, duration):
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port)
+        load(port, path, token, concurrency, 1)  # warm up connections and caches
+        count, errors, latencies = load(port, path, token, concurrency, duration)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    result = {
+        "server": name,
+        "requests_per_second": count / duration,
+        "p50_ms": statistics.median(latencies) if latencies else 0,
+        "p95_ms": p95,
+        "errors": errors
+    }
+    print(f"{name:<10} {result['requests_per_second']:>10.1f} req/s   "
+          f"p50 {result['p50_ms']:>7.1f} ms   p95 {result['p95_ms']:>7.1f} ms   errors {errors}")
+    return result
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="codelens-serving-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    secret, token = seed(database_url, args.students)
+
+    env = dict(os.environ,
+               DATABASE_URL=database_url,
+               JWT_SECRET_KEY=secret,
+               CACHE_TYPE="null",
+               FLASK_DEBUG="0",
+               GUNICORN_LOG_LEVEL="warning",
+               WEB_CONCURRENCY=str(args.workers),
+               GUNICORN_WORKER_CLASS=args.worker_class,
+               GUNICORN_THREADS=str(args.threads))
+
+    print(f"GET {args.path}: {args.concurrency} clients for {args.duration}s, {args.students} students")
+    dev = run_server("dev", [sys.executable, "-c", DEV_SERVER.format(port=args.port)],
+                     env, args.port, args.path, token, args.concurrency, args.duration)
+
+    gunicorn_env = dict(env, GUNICORN_BIND=f"127.0.0.1:{args.port + 1}")
+    label = f"gunicorn ({args.workers}x {args.worker_class}"
+    label += f", {args.threads} threads)" if args.worker_class == "gthread" else ")"
+    prod = run_server("gunicorn", [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+                      gunicorn_env, args.port + 1, args.path, token, args.concurrency, args.duration)
+
+    print(f"\n{label}: {prod['requests_per_second'] / max(dev['requests_per_second'], 1e-9):.1f}x dev server throughput")
+    return dev, prod
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/analytics/institution-summary")
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--worker-class", default="gthread", choices=["sync", "gthread"])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--database-url", help="defaults to a scratch SQLite file")
+    run(parser.parse_args())
@@ -0,0 +1,287 @@
+"""
+Shared helpers for the CodeLens benchmarks.
+
+Benchmarks run against an in-memory SQLite database by default. Pass
+--database-url to run them against a local Postgres instead.
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+from datetime import date, timedelta
+
+# Add backend directory to path so imports work when run as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event, insert
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import db
+from app.auth.models import User, Role, UserRole
+from app.auth.seed import seed_roles
+from app.academics.models import Department
+from app.students.models import Student, StudentAdvisor, StudentCounsellor
+from app.staff.models import StaffProfile
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.services import rebuild_account_stats, refresh_department_daily_stats
+
+DEFAULT_DATABASE_URL = "sqlite:///:memory:"
+BATCH_SIZE = 5000
+PLATFORMS = ["leetcode", "codeforces", "hackerrank"]
+
+
+def make_app(database_url=DEFAULT_DATABASE_URL, **overrides):
+    """Create an app bound to a scratch database with a fresh schema"""
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "JWT_SECRET_KEY": "benchmark-secret-key-not-for-production",
+        "TESTING": True,
+        **overrides
+    })
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed_roles()
+    return app
+
+
+class QueryCounter:
+    """Counts statements issued on the engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def _insert_batched(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+
+def create_user_with_role(role_name, email=None, full_name="Bench User"):
+    """Create a user holding `role_name` and return (user_id, access_token)"""
+    role = Role.query.filter_by(name=role_name).first()
+    user = User(
+        email=email or f"{role_name}-{uuid.uuid4().hex[:8]}@bench.local",
+        password_hash="!",
+        full_name=full_name
+    )
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(UserRole(user_id=user.id, role_id=role.id))
+    db.session.commit()
+    return user.id, create_access_token(identity=user.id)
+
+
+def build_department(n_students, code="BENCH", platforms=PLATFORMS,
+                     snapshots_per_account=4, snapshot_interval_days=7,
+                     end_date=None, seed=42):
+    """
+    Bulk-load a department with `n_students`, one account per platform and
+    `snapshots_per_account` approved snapshots per account. Returns the
+    department id.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+
+    department = Department(name=f"Benchmark {code}", code=code)
+    db.session.add(department)
+    db.session.flush()
+
+    users, students, accounts, snapshots = [], [], [], []
+    for i in range(n_students):
+        user_id = str(uuid.uuid4())
+        student_id = str(uuid.uuid4())
+        users.append({
+            "id": user_id,
+            "email": f"{code.lower()}.{i}@bench.local",
+            "password_hash": "!",
+            "full_name": f"{code} Student {i}"
+        })
+        students.append({
+            "id": student_id,
+            "user_id": user_id,
+            "department_id": department.id,
+            "register_number": f"{code}{i:07d}",
+            "admission_year": 2021 + i % 4
+        })
+        for platform_name in platforms:
+            account_id = str(uuid.uuid4())
+            accounts.append({
+                "id": account_id,
+                "student_id": student_id,
+                "platform_name": platform_name,
+                "username": f"{code.lower()}_{i}_{platform_name}"
+            })
+            solved = rng.randint(20, 200)
+            for k in range(snapshots_per_account):
+                solved += rng.randint(0, 15)
+                snapshots.append({
+                    "id": str(uuid.uuid4()),
+                    "platform_account_id": account_id,
+                    "total_solved": solved,
+                    "contest_rating": rng.randint(1200, 2200),
+                    "snapshot_date": end_date - timedelta(
+                        days=(snapshots_per_account - 1 - k) * snapshot_interval_days
+                    ),
+                    "status": "approved"
+                })
+
+        # Flush in chunks to keep memory bounded at the larger scales
+        if len(snapshots) >= BATCH_SIZE * 4:
+            _insert_batched(User, users)
+            _insert_batched(Student, students)
+            _insert_batched(PlatformAccount, accounts)
+            _insert_batched(PlatformSnapshot, snapshots)
+            users, students, accounts, snapshots = [], [], [], []
+
+    _insert_batched(User, users)
+    _insert_batched(Student, students)
+    _insert_batched(PlatformAccount, accounts)
+    _insert_batched(PlatformSnapshot, snapshots)
+    db.session.commit()
+    rebuild_account_stats()
+    refresh_department_daily_stats([department.id])
+    db.session.commit()
+    return department.id
+
+
+def _role_ids():
+    return {role.name: role.id for role in Role.query.all()}
+
+
+def build_institution(n_students, departments, generator_config, platforms,
+                      weeks=52, accounts_per_student=1, pending_ratio=0.1,
+                      end_date=None, seed=42):
+    """
+    Bulk-load a whole institution shaped like scripts/config.py: every
+    department gets a HOD, advisors and counsellors (with staff profiles),
+    students spread evenly and assigned round-robin to them, accounts on
+    `platforms` and `weeks` of weekly approved snapshots. A `pending_ratio`
+    share of accounts also has a pending snapshot for review.
+
+    Returns a dict of ids the endpoint benchmarks need.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    roles = _role_ids()
+    years = generator_config["admission_years"]
+    staff_rows, user_roles = [], []
+
+    def staff_user(role_name, code, i):
+        user_id = str(uuid.uuid4())
+        staff_rows.append({"id": user_id, "email": f"{role_name}.{code.lower()}.{i}@bench.local",
+                           "password_hash": "!", "full_name": f"{code} {role_name.title()} {i}"})
+        user_roles.append({"user_id": user_id, "role_id": roles[role_name]})
+        return user_id
+
+    result = {"departments": [], "hods": [], "advisors": [], "counsellors": [], "students": []}
+    staff = []
+    for dept in departments:
+        hod_id = staff_user("hod", dept["code"], 0)
+        advisors = [staff_user("advisor", dept["code"], i) for i in range(generator_config["advisors_per_department"])]
+        counsellors = [staff_user("counsellor", dept["code"], i) for i in range(generator_config["counsellors_per_department"])]
+        staff.append((dept, hod_id, advisors, counsellors))
+        result["hods"].append(hod_id)
+        result["advisors"] += advisors
+        result["counsellors"] += counsellors
+
+    _insert_batched(User, staff_rows)
+    _insert_batched(UserRole, user_roles)
+    profiles = []
+    for dept, hod_id, advisors, counsellors in staff:
+        department = Department(name=dept["name"], code=dept["code"], hod_id=hod_id)
+        db.session.add(department)
+        db.session.flush()
+        result["departments"].append(department.id)
+        for role_type, user_ids in (("hod", [hod_id]), ("advisor", advisors), ("counsellor", counsellors)):
+            profiles += [{"id": str(uuid.uuid4()), "user_id": user_id, "department_id": department.id,
+                          "role_type": role_type} for user_id in user_ids]
+    _insert_batched(StaffProfile, profiles)
+
+    batches = {model: [] for model in (User, UserRole, Student, StudentAdvisor, StudentCounsellor,
+                                       PlatformAccount, PlatformSnapshot)}
+
+    def flush_batches():
+        for model, rows in batches.items():
+            _insert_batched(model, rows)
+            rows.clear()
+
+    for i in range(n_students):
+        d = i % len(staff)
+        dept, _, advisors, counsellors = staff[d]
+        user_id, student_id = str(uuid.uuid4()), str(uuid.uuid4())
+        batches[User].append({"id": user_id, "email": f"student.{i}@bench.local",
+                              "password_hash": "!", "full_name": f"{dept['code']} Student {i}"})
+        batches[UserRole].append({"user_id": user_id, "role_id": roles["student"]})
+        batches[Student].append({"id": student_id, "user_id": user_id,
+                                 "department_id": result["departments"][d],
+                                 "register_number": f"{dept['code']}{i:07d}",
+                                 "admission_year": years[i % len(years)]})
+        batches[StudentAdvisor].append({"id": str(uuid.uuid4()), "student_id": student_id,
+                                        "advisor_user_id": advisors[(i // len(staff)) % len(advisors)]})
+        batches[StudentCounsellor].append({"id": str(uuid.uuid4()), "student_id": student_id,
+                                           "counsellor_user_id": counsellors[(i // len(staff)) % len(counsellors)]})
+
+        account_ids = []
+        for platform_name in rng.sample(platforms, min(accounts_per_student, len(platforms))):
+            account_id = str(uuid.uuid4())
+            account_ids.append(account_id)
+            batches[PlatformAccount].append({"id": account_id, "student_id": student_id,
+                                             "platform_name": platform_name,
+                                             "username": f"student{i}_{platform_name.lower()}"})
+            solved = rng.randint(0, 150)
+            rating = rng.randint(1200, 1800)
+            # Some students stall partway through the year so at-risk lists are not empty
+            stall_after = rng.randint(weeks // 2, weeks) if rng.random() < 0.2 else weeks
+            for k in range(weeks):
+                if k < stall_after:
+                    solved += rng.randint(0, 12)
+                    rating += rng.randint(-30, 45)
+                batches[PlatformSnapshot].append({
+                    "id": str(uuid.uuid4()), "platform_account_id": account_id,
+                    "total_solved": solved, "contest_rating": rating,
+                    "snapshot_date": end_date - timedelta(weeks=weeks - 1 - k), "status": "approved"
+                })
+            if rng.random() < pending_ratio:
+                batches[PlatformSnapshot].append({
+                    "id": str(uuid.uuid4()), "platform_account_id": account_id,
+                    "total_solved": solved + rng.randint(0, 12), "contest_rating": rating,
+                    "snapshot_date": end_date + timedelta(days=1), "status": "pending"
+                })
+
+        if i < 10:
+            result["students"].append({"id": student_id, "user_id": user_id, "account_ids": account_ids})
+        if len(batches[PlatformSnapshot]) >= BATCH_SIZE * 4:
+            flush_batches()
+
+    flush_batches()
+    db.session.commit()
+    rebuild_account_stats()
+    refresh_department_daily_stats(result["departments"])
+    db.session.commit()
+    return result
+
+
+def timed_get(client, url, token, engine):
+    """Issue a GET and return (response, elapsed_ms, query_count)"""
+    with QueryCounter(engine) as counter:
+        start = time.perf_counter()
+        response = client.get(url, headers={"Authorization": f"Bearer {token}"})
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    return response, elapsed_ms, counter.count
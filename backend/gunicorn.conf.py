@@ -0,0 +1,60 @@
+"""
+Gunicorn settings for the production backend.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden from the environment:
+
+    GUNICORN_BIND           address to listen on (0.0.0.0:5000)
+    WEB_CONCURRENCY         worker processes (2 * cores + 1)
+    GUNICORN_WORKER_CLASS   sync or gthread (default)
+    GUNICORN_THREADS        threads per gthread worker (4)
+    GUNICORN_TIMEOUT        seconds before a silent worker is restarted (60)
+    GUNICORN_MAX_REQUESTS   recycle a worker after this many requests (1000)
+
+Size DB_POOL_SIZE + DB_MAX_OVERFLOW against threads per worker; Postgres
+sees workers * (pool size + overflow) connections at most.
+
+CACHE_TYPE=memory keeps the response cache inside one process, so an
+invalidation in one worker never reaches the others; it is refused when
+more than one worker is configured. Use Redis (REDIS_URL) or null.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+if workers > 1 and os.environ.get("CACHE_TYPE") == "memory":
+    raise RuntimeError("CACHE_TYPE=memory is per process; use redis or null with WEB_CONCURRENCY > 1")
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5  # nginx keeps upstream connections open between requests
+
+# Recycle workers to cap slow memory growth; jitter avoids restarting all at once
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = max_requests // 10
+
+# Import the app once in the master so workers fork with it already loaded
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+# nginx sits in front; trust its X-Forwarded-* headers
+forwarded_allow_ips = "*"
+
+
+def post_fork(server, worker):
+    # Connections opened in the master during preload must not be shared
+    # across processes; each worker starts with an empty pool.
+    from app.extensions import db
+    from app.common.replicas import replica_router
+    app = worker.app.wsgi()
+    with app.app_context():
+        db.engine.dispose(close=False)
+        replica_router.dispose(close=False)
@@ -0,0 +1,59 @@
+"""add jobs table
+
+Revision ID: a8d4e6f2c391
+Revises: f3a9c2d8b614
+Create Date: 2026-10-18 19:05:12.418306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d4e6f2c391'
+down_revision = 'f3a9c2d8b614'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('task', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('key', sa.String(length=200), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.DateTime(), nullable=False),
+    sa.Column('interval_seconds', sa.Integer(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('locked_by', sa.String(length=100), nullable=True),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_by', sa.String(length=36), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_queued_priority_run_at', 'jobs', [sa.text('priority DESC'), 'run_at'], unique=False,
+                    postgresql_where=sa.text("status = 'queued'"), sqlite_where=sa.text("status = 'queued'"))
+    op.create_index('ix_jobs_running_locked_at', 'jobs', ['locked_at'], unique=False,
+                    postgresql_where=sa.text("status = 'running'"), sqlite_where=sa.text("status = 'running'"))
+    op.create_index('ix_jobs_key', 'jobs', ['key'], unique=False)
+    op.create_index('ux_jobs_active_key', 'jobs', ['key'], unique=True,
+                    postgresql_where=sa.text("status IN ('queued', 'running')"),
+                    sqlite_where=sa.text("status IN ('queued', 'running')"))
+    op.create_index('ix_jobs_created_at', 'jobs', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_jobs_created_at', table_name='jobs')
+    op.drop_index('ux_jobs_active_key', table_name='jobs')
+    op.drop_index('ix_jobs_key', table_name='jobs')
+    op.drop_index('ix_jobs_running_locked_at', table_name='jobs')
+    op.drop_index('ix_jobs_queued_priority_run_at', table_name='jobs')
+    op.drop_table('jobs')
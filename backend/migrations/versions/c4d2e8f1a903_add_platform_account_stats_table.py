@@ -0,0 +1,67 @@
+"""add platform account stats table
+
+Revision ID: c4d2e8f1a903
+Revises: 81aa95498de8
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d2e8f1a903'
+down_revision = '81aa95498de8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('platform_account_stats',
+    sa.Column('platform_account_id', sa.String(length=36), nullable=False),
+    sa.Column('latest_snapshot_date', sa.Date(), nullable=False),
+    sa.Column('latest_total_solved', sa.Integer(), nullable=False),
+    sa.Column('latest_contest_rating', sa.Integer(), nullable=True),
+    sa.Column('latest_global_rank', sa.Integer(), nullable=True),
+    sa.Column('previous_snapshot_date', sa.Date(), nullable=True),
+    sa.Column('previous_total_solved', sa.Integer(), nullable=True),
+    sa.Column('previous_contest_rating', sa.Integer(), nullable=True),
+    sa.Column('previous_global_rank', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['platform_account_id'], ['platform_accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('platform_account_id')
+    )
+
+    # Backfill from existing approved snapshots (same as `flask analytics rebuild-stats`)
+    op.execute("""
+        INSERT INTO platform_account_stats (
+            platform_account_id,
+            latest_snapshot_date, latest_total_solved, latest_contest_rating, latest_global_rank,
+            previous_snapshot_date, previous_total_solved, previous_contest_rating, previous_global_rank,
+            updated_at
+        )
+        SELECT
+            platform_account_id,
+            MAX(CASE WHEN rn = 1 THEN snapshot_date END),
+            MAX(CASE WHEN rn = 1 THEN total_solved END),
+            MAX(CASE WHEN rn = 1 THEN contest_rating END),
+            MAX(CASE WHEN rn = 1 THEN global_rank END),
+            MAX(CASE WHEN rn = 2 THEN snapshot_date END),
+            MAX(CASE WHEN rn = 2 THEN total_solved END),
+            MAX(CASE WHEN rn = 2 THEN contest_rating END),
+            MAX(CASE WHEN rn = 2 THEN global_rank END),
+            CURRENT_TIMESTAMP
+        FROM (
+            SELECT
+                platform_account_id, snapshot_date, total_solved, contest_rating, global_rank,
+                ROW_NUMBER() OVER (PARTITION BY platform_account_id ORDER BY snapshot_date DESC) AS rn
+            FROM platform_snapshots
+            WHERE status = 'approved'
+        ) ranked
+        WHERE rn <= 2
+        GROUP BY platform_account_id
+    """)
+
+
+def downgrade():
+    op.drop_table('platform_account_stats')
@@ -0,0 +1,63 @@
+"""add department daily stats table
+
+Revision ID: d7a1b3c5e926
+Revises: c4d2e8f1a903
+Create Date: 2026-10-18 11:47:03.552871
+
+"""
+from datetime import date, timedelta
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a1b3c5e926'
+down_revision = 'c4d2e8f1a903'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('department_daily_stats',
+    sa.Column('department_id', sa.String(length=36), nullable=False),
+    sa.Column('stat_date', sa.Date(), nullable=False),
+    sa.Column('student_count', sa.Integer(), nullable=False),
+    sa.Column('linked_accounts', sa.Integer(), nullable=False),
+    sa.Column('total_solved', sa.Integer(), nullable=False),
+    sa.Column('average_rating', sa.Float(), nullable=True),
+    sa.Column('active_students', sa.Integer(), nullable=False),
+    sa.Column('growth', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('department_id', 'stat_date')
+    )
+
+    # Seed today's row per department from platform_account_stats so the
+    # dashboard has data straight away; earlier days come from
+    # `flask analytics backfill-department-stats`
+    today = date.today()
+    op.get_bind().execute(sa.text("""
+        INSERT INTO department_daily_stats (
+            department_id, stat_date, student_count, linked_accounts, total_solved,
+            average_rating, active_students, growth, updated_at
+        )
+        SELECT
+            d.id,
+            :today,
+            COUNT(DISTINCT s.id),
+            COUNT(pa.id),
+            COALESCE(SUM(st.latest_total_solved), 0),
+            AVG(st.latest_contest_rating),
+            COUNT(DISTINCT CASE WHEN st.latest_snapshot_date >= :cutoff THEN s.id END),
+            COALESCE(SUM(st.latest_total_solved - COALESCE(st.previous_total_solved, st.latest_total_solved)), 0),
+            CURRENT_TIMESTAMP
+        FROM departments d
+        LEFT JOIN students s ON s.department_id = d.id
+        LEFT JOIN platform_accounts pa ON pa.student_id = s.id
+        LEFT JOIN platform_account_stats st ON st.platform_account_id = pa.id
+        GROUP BY d.id
+    """), {"today": today, "cutoff": today - timedelta(days=30)})
+
+
+def downgrade():
+    op.drop_table('department_daily_stats')
@@ -0,0 +1,53 @@
+"""add snapshot and assignment indexes
+
+Revision ID: e5b8f2a4c710
+Revises: d7a1b3c5e926
+Create Date: 2026-10-18 14:21:37.204915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8f2a4c710'
+down_revision = 'd7a1b3c5e926'
+branch_labels = None
+depends_on = None
+
+# platform_accounts.student_id is already covered by unique_student_platform
+INDEXES = [
+    ('ix_platform_snapshots_approved_account_date', 'platform_snapshots', ['platform_account_id', 'snapshot_date'], dict(
+        postgresql_where=sa.text("status = 'approved'"),
+        postgresql_include=['total_solved', 'contest_rating', 'global_rank'],
+        sqlite_where=sa.text("status = 'approved'")
+    )),
+    ('ix_platform_snapshots_pending_created_at', 'platform_snapshots', ['created_at', 'id'], dict(
+        postgresql_where=sa.text("status = 'pending'"),
+        sqlite_where=sa.text("status = 'pending'")
+    )),
+    ('ix_student_counsellors_counsellor_user_id', 'student_counsellors', ['counsellor_user_id'], {}),
+    ('ix_student_advisors_advisor_user_id', 'student_advisors', ['advisor_user_id'], {}),
+    ('ix_students_department_id', 'students', ['department_id'], {}),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside the migration transaction
+        with op.get_context().autocommit_block():
+            for name, table, columns, kwargs in INDEXES:
+                op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+    else:
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, unique=False, **kwargs)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, columns, kwargs in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, columns, kwargs in reversed(INDEXES):
+            op.drop_index(name, table_name=table)
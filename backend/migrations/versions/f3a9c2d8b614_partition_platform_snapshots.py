@@ -0,0 +1,132 @@
+"""partition platform_snapshots by snapshot_date
+
+Revision ID: f3a9c2d8b614
+Revises: e5b8f2a4c710
+Create Date: 2026-10-18 15:02:44.918263
+
+"""
+import os
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a9c2d8b614'
+down_revision = 'e5b8f2a4c710'
+branch_labels = None
+depends_on = None
+
+# Postgres only. Rewrites the table under an exclusive lock: run in a
+# maintenance window. Afterwards keep partitions ahead of time with
+# `flask snapshots create-partitions` (cron).
+INTERVAL = os.environ.get('SNAPSHOT_PARTITION_INTERVAL', 'month')
+PARTITIONS_AHEAD = int(os.environ.get('SNAPSHOT_PARTITIONS_AHEAD', 3))
+
+COLUMNS = """
+    id VARCHAR(36) NOT NULL,
+    platform_account_id VARCHAR(36) NOT NULL,
+    total_solved INTEGER NOT NULL,
+    contest_rating INTEGER,
+    global_rank INTEGER,
+    snapshot_date DATE NOT NULL,
+    created_at TIMESTAMP WITHOUT TIME ZONE,
+    status VARCHAR(20) NOT NULL,
+    reviewed_by VARCHAR(36),
+    reviewed_at TIMESTAMP WITHOUT TIME ZONE,
+    remarks TEXT
+"""
+COLUMN_NAMES = ('id, platform_account_id, total_solved, contest_rating, global_rank, snapshot_date, '
+                'created_at, status, reviewed_by, reviewed_at, remarks')
+
+# Frozen copies of partition_end/partition_name from app/snapshots/partitions.py,
+# on purpose: a migration must keep producing the same schema even if the
+# application module changes later.
+
+
+def _next_start(start):
+    if INTERVAL == 'year':
+        return date(start.year + 1, 1, 1)
+    return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+
+def _partition_name(start):
+    if INTERVAL == 'year':
+        return f'platform_snapshots_y{start.year}'
+    return f'platform_snapshots_y{start.year}m{start.month:02d}'
+
+
+def _create_indexes():
+    # Partitioned indexes cascade to every partition, present and future
+    op.execute("CREATE INDEX ix_platform_snapshots_approved_account_date ON platform_snapshots "
+               "(platform_account_id, snapshot_date) INCLUDE (total_solved, contest_rating, global_rank) "
+               "WHERE status = 'approved'")
+    op.execute("CREATE INDEX ix_platform_snapshots_pending_created_at ON platform_snapshots "
+               "(created_at, id) WHERE status = 'pending'")
+
+
+def _rename_old_table(suffix):
+    op.execute(f"ALTER TABLE platform_snapshots RENAME TO platform_snapshots_{suffix}")
+    op.execute(f"ALTER TABLE platform_snapshots_{suffix} RENAME CONSTRAINT platform_snapshots_pkey TO platform_snapshots_{suffix}_pkey")
+    op.execute(f"ALTER TABLE platform_snapshots_{suffix} RENAME CONSTRAINT unique_platform_snapshot_date TO unique_platform_snapshot_date_{suffix}")
+    op.execute(f"ALTER INDEX ix_platform_snapshots_approved_account_date RENAME TO ix_platform_snapshots_{suffix}_approved")
+    op.execute(f"ALTER INDEX ix_platform_snapshots_pending_created_at RENAME TO ix_platform_snapshots_{suffix}_pending")
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _rename_old_table('unpartitioned')
+
+    # The partition key must be part of every unique constraint
+    op.execute(f"""
+        CREATE TABLE platform_snapshots ({COLUMNS},
+            CONSTRAINT platform_snapshots_pkey PRIMARY KEY (id, snapshot_date),
+            CONSTRAINT unique_platform_snapshot_date UNIQUE (platform_account_id, snapshot_date),
+            FOREIGN KEY (platform_account_id) REFERENCES platform_accounts (id) ON DELETE CASCADE,
+            FOREIGN KEY (reviewed_by) REFERENCES users (id)
+        ) PARTITION BY RANGE (snapshot_date)
+    """)
+
+    first = op.get_bind().execute(sa.text("SELECT min(snapshot_date) FROM platform_snapshots_unpartitioned")).scalar()
+    today = date.today()
+    start = (first or today).replace(day=1) if INTERVAL == 'month' else date((first or today).year, 1, 1)
+    last = today
+    for _ in range(PARTITIONS_AHEAD):
+        last = _next_start(last.replace(day=1))
+
+    while start <= last:
+        end = _next_start(start)
+        op.execute(f"CREATE TABLE {_partition_name(start)} PARTITION OF platform_snapshots "
+                   f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')")
+        start = end
+    op.execute("CREATE TABLE platform_snapshots_default PARTITION OF platform_snapshots DEFAULT")
+
+    _create_indexes()
+
+    op.execute(f"INSERT INTO platform_snapshots ({COLUMN_NAMES}) "
+               f"SELECT {COLUMN_NAMES} FROM platform_snapshots_unpartitioned")
+    op.execute("DROP TABLE platform_snapshots_unpartitioned")
+    op.execute("ANALYZE platform_snapshots")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _rename_old_table('partitioned')
+
+    op.execute(f"""
+        CREATE TABLE platform_snapshots ({COLUMNS},
+            CONSTRAINT platform_snapshots_pkey PRIMARY KEY (id),
+            CONSTRAINT unique_platform_snapshot_date UNIQUE (platform_account_id, snapshot_date),
+            FOREIGN KEY (platform_account_id) REFERENCES platform_accounts (id) ON DELETE CASCADE,
+            FOREIGN KEY (reviewed_by) REFERENCES users (id)
+        )
+    """)
+    _create_indexes()
+
+    op.execute(f"INSERT INTO platform_snapshots ({COLUMN_NAMES}) "
+               f"SELECT {COLUMN_NAMES} FROM platform_snapshots_partitioned")
+    op.execute("DROP TABLE platform_snapshots_partitioned CASCADE")
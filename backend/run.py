@@ -1,6 +1,8 @@
+import os
 from app import create_app
 
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", debug=True)
+    # Development server only; production runs gunicorn (gunicorn.conf.py)
+    app.run(host="0.0.0.0", debug=os.environ.get("FLASK_DEBUG") == "1")
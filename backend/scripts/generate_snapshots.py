@@ -1,4 +1,16 @@
-"""Generate random performance snapshots for testing"""
+"""
+Generate performance snapshots for testing, benchmarks and capacity sizing
+
+Creates missing platform accounts for every student, then writes NumPy growth
+curves for each account (see scripts/seeds/growth.py) in chunks through
+COPY on Postgres or bulk INSERT elsewhere, and rebuilds the derived stats
+and department rollups.
+
+Usage:
+    python scripts/generate_snapshots.py                                   # last 90 days, weekly
+    python scripts/generate_snapshots.py --years 3 --interval daily --seed 7
+    python scripts/generate_snapshots.py --start 2023-01-01 --end 2025-12-31 --pending-ratio 0.1
+"""
 
 import sys
 import os
@@ -6,87 +18,56 @@ import os
 # Add parent directory to path so imports work
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import csv
-import random
-from datetime import datetime, timedelta
+import argparse
+import time
+from datetime import date, datetime, timedelta
 from app import create_app, db
-from app.students.models import Student
-from app.platforms.models import PlatformAccount
-from app.snapshots.models import PlatformSnapshot
+from app.analytics.services import rebuild_account_stats, backfill_department_daily_stats
 from scripts.config import PLATFORMS
+from scripts.seeds.growth import generate_snapshots, ensure_accounts, INTERVAL_DAYS, CHUNK_ROWS
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=parse_date, help="first snapshot date (default: --days/--years before --end)")
+    parser.add_argument("--end", type=parse_date, default=date.today(), help="last snapshot date (default: today)")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--years", type=float, help="period length in years, overrides --days")
+    parser.add_argument("--interval", choices=sorted(INTERVAL_DAYS), default="weekly")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--students", type=int, help="only the first N students by register number")
+    parser.add_argument("--pending-ratio", type=float, default=0.0, help="share of accounts whose last snapshot stays pending")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="snapshots generated and committed per chunk")
+    args = parser.parse_args()
 
-app = create_app()
+    days = round(args.years * 365) if args.years else args.days
+    start = args.start or args.end - timedelta(days=days)
 
-def generate_snapshots():
+    app = create_app()
     with app.app_context():
         print("[INFO] Generating performance snapshots...\n")
-        
-        students = Student.query.limit(100).all()  # First 100 students
-        total_snapshots = 0
-        
-        for student in students:
-            # Create platform accounts
-            try:
-                for platform_name in PLATFORMS:
-                    existing = PlatformAccount.query.filter_by(
-                        student_id=student.id,
-                        platform_name=platform_name
-                    ).first()
-                    
-                    if existing:
-                        account = existing
-                    else:
-                        account = PlatformAccount(
-                            student_id=student.id,
-                            platform_name=platform_name,
-                            username=f"{student.register_number.lower()}_{platform_name.lower()}",
-                            profile_url=f"https://{platform_name.lower()}.com/user/{student.register_number}"
-                        )
-                        db.session.add(account)
-                        db.session.flush()
-                    
-                    # Generate snapshots for last 3 months
-                    start_date = datetime.now() - timedelta(days=90)
-                    current_solved = random.randint(50, 100)
-                    
-                    for day_offset in range(0, 90, 7):  # Weekly snapshots
-                        snapshot_date = start_date + timedelta(days=day_offset)
-                        
-                        # Ensure no duplicates
-                        existing_snap = PlatformSnapshot.query.filter_by(
-                            platform_account_id=account.id,
-                            snapshot_date=snapshot_date.date()
-                        ).first()
-                        
-                        if existing_snap:
-                            continue
-                        
-                        # Progressive increase
-                        current_solved += random.randint(5, 15)
-                        
-                        snapshot = PlatformSnapshot(
-                            platform_account_id=account.id,
-                            total_solved=current_solved,
-                            contest_rating=random.randint(1200, 2000),
-                            global_rank=random.randint(1000, 50000),
-                            snapshot_date=snapshot_date.date(),
-                            status='approved'  # Auto-approve for testing
-                        )
-                        db.session.add(snapshot)
-                        total_snapshots += 1
-                
-                if student.id % 10 == 0:
-                    db.session.commit()
-                    print(f"  Processed {len([s for s in students if students.index(s) <= students.index(student)])} students...")
-            
-            except Exception as e:
-                print(f"[WARN] Error for student {student.id}: {e}")
-                db.session.rollback()
-        
-        db.session.commit()
-        print(f"\n[OK] Generated {total_snapshots} snapshots for {len(students)} students")
+        began = time.perf_counter()
+
+        created = ensure_accounts(db, PLATFORMS, students=args.students)
+        print(f"[OK] Created {created} platform accounts")
+
+        accounts, snapshots = generate_snapshots(
+            db, start, args.end, interval=args.interval, seed=args.seed, platforms=PLATFORMS,
+            students=args.students, pending_ratio=args.pending_ratio, chunk_rows=args.chunk_rows
+        )
+        elapsed = time.perf_counter() - began
+        print(f"\n[OK] Generated {snapshots} snapshots for {accounts} accounts in {elapsed:.1f}s")
+
+        # Snapshots are inserted pre-approved, so rebuild the derived stats
+        stats_count = rebuild_account_stats()
+        print(f"[OK] Rebuilt stats for {stats_count} platform accounts")
+        # Through today, so department-performance reads a current row
+        rollup_count = backfill_department_daily_stats(start, max(args.end, date.today()))
+        print(f"[OK] Backfilled {rollup_count} department daily stats rows")
         print(f"  Platforms: {', '.join(PLATFORMS)}")
-        print(f"  Period: Last 90 days (weekly)")
+        print(f"  Period: {start} to {args.end} ({args.interval})")
 
 if __name__ == '__main__':
-    generate_snapshots()
+    main()
@@ -1,9 +1,15 @@
 """
 CodeLens Database Seeder
+
+Usage:
+    python scripts/run_seeds.py
+    python scripts/run_seeds.py --bulk             # prefetch, pooled hashing, COPY/bulk inserts
+    python scripts/run_seeds.py --bulk --workers 8
 """
 
 import sys
 import os
+import argparse
 
 # Add parent directory to path so imports work
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -14,7 +20,7 @@ from seeds.utils import log_start, log_done, log_error
 
 app = create_app()
 
-def run(app, db):
+def run(app, db, bulk=False, workers=None):
     """Run seeding logic"""
     try:
         # 1. Departments
@@ -24,10 +30,16 @@ def run(app, db):
         users.seed_admin(app, db)
         
         # 3. Bulk Users
-        users.seed_users_bulk(app, db, 'students.csv', 'student', 'students')
-        users.seed_users_bulk(app, db, 'hods.csv', 'hod', 'HODs')
-        users.seed_users_bulk(app, db, 'counsellors.csv', 'counsellor', 'counsellors')
-        users.seed_users_bulk(app, db, 'advisors.csv', 'advisor', 'advisors')
+        for filename, role_name, user_type in [
+            ('students.csv', 'student', 'students'),
+            ('hods.csv', 'hod', 'HODs'),
+            ('counsellors.csv', 'counsellor', 'counsellors'),
+            ('advisors.csv', 'advisor', 'advisors')
+        ]:
+            if bulk:
+                users.seed_users_fast(app, db, filename, role_name, user_type, workers=workers)
+            else:
+                users.seed_users_bulk(app, db, filename, role_name, user_type)
         
         # 4. Relationships
         relationships.assign_hods(app, db)
@@ -44,9 +56,14 @@ def run(app, db):
         sys.exit(1)
 
 def main():
+    parser = argparse.ArgumentParser(description="CodeLens Database Seeder")
+    parser.add_argument("--bulk", action="store_true", help="fast path for large CSVs")
+    parser.add_argument("--workers", type=int, default=None, help="password hashing processes (default: CPU count)")
+    args = parser.parse_args()
+
     log_start("CodeLens Database Seeder")
     with app.app_context():
-        run(app, db)
+        run(app, db, bulk=args.bulk, workers=args.workers)
 
 if __name__ == '__main__':
     main()
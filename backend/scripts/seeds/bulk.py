@@ -0,0 +1,76 @@
+"""
+Bulk write helpers for seeding large datasets
+"""
+
+import csv
+import io
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import insert
+from app.common.utils import hash_password
+
+BATCH_SIZE = 5000
+
+def with_defaults(table, rows):
+    """Fill Python-side column defaults (ids, timestamps) that COPY would not apply"""
+    defaults = {}
+    for column in table.columns:
+        if column.default is not None and column.default.is_scalar:
+            defaults[column.name] = lambda arg=column.default.arg: arg
+        elif column.default is not None and column.default.is_callable:
+            defaults[column.name] = lambda fn=column.default.arg: fn(None)
+    for row in rows:
+        for name, value in defaults.items():
+            if name not in row:
+                row[name] = value()
+    return rows
+
+def _copy(db, table, columns, rows):
+    buffer = io.StringIO()
+    # Strings are quoted, so only None is written as an unquoted empty field (NULL)
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    writer.writerows(rows)
+    buffer.seek(0)
+
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+    finally:
+        cursor.close()
+
+def insert_rows(db, model, columns, rows, batch_size=BATCH_SIZE):
+    """
+    Insert value tuples ordered as `columns` in batches inside the session's
+    transaction: COPY on Postgres, executemany INSERT elsewhere. Column
+    defaults are not applied. The caller commits.
+    """
+    table = model.__table__
+    use_copy = db.session.get_bind().dialect.name == "postgresql"
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        if use_copy:
+            _copy(db, table, columns, batch)
+        else:
+            db.session.execute(insert(table), [dict(zip(columns, row)) for row in batch])
+    return len(rows)
+
+def bulk_insert(db, model, rows, batch_size=BATCH_SIZE):
+    """insert_rows for row dicts (all with the same keys), filling column defaults"""
+    if not rows:
+        return 0
+    rows = with_defaults(model.__table__, rows)
+    columns = list(rows[0])
+    return insert_rows(db, model, columns, [[row[c] for c in columns] for row in rows], batch_size)
+
+def hash_passwords(passwords, workers=None):
+    """
+    {password: hash} for the distinct passwords. Rows sharing a password
+    share its hash, and distinct passwords are hashed across a process pool
+    since each PBKDF2 hash is deliberately slow.
+    """
+    distinct = sorted(set(passwords))
+    if len(distinct) <= 1 or workers == 1:
+        return {p: hash_password(p) for p in distinct}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(distinct, pool.map(hash_password, distinct, chunksize=16)))
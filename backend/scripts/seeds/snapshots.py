@@ -2,88 +2,31 @@
 Generate Performance Snapshots
 """
 
-import sys
-import random
-from datetime import datetime, timedelta
-from .utils import log_info, log_ok, log_warn, log_error
+from datetime import date, timedelta
+from .utils import log_info, log_ok, log_error
+from .growth import generate_snapshots, ensure_accounts
 
 # Platforms supported
 PLATFORMS = ['LeetCode', 'Codeforces', 'CodeChef']
 
-def run(app, db):
-    """Generate snapshots"""
-    from app.students.models import Student
-    from app.platforms.models import PlatformAccount
-    from app.snapshots.models import PlatformSnapshot
-    
+def run(app, db, days=90, interval='weekly', seed=42):
+    """Generate weekly snapshots for the last `days` days for every student"""
     log_info("Generating performance snapshots...")
-    
+
     try:
-        students = Student.query.limit(100).all()  # First 100 students
-        total_snapshots = 0
-        
-        for index, student in enumerate(students):
-            # Create platform accounts
-            try:
-                for platform_name in PLATFORMS:
-                    existing = PlatformAccount.query.filter_by(
-                        student_id=student.id,
-                        platform_name=platform_name
-                    ).first()
-                    
-                    if existing:
-                        account = existing
-                    else:
-                        account = PlatformAccount(
-                            student_id=student.id,
-                            platform_name=platform_name,
-                            username=f"{student.register_number.lower()}_{platform_name.lower()}",
-                            profile_url=f"https://{platform_name.lower()}.com/user/{student.register_number}"
-                        )
-                        db.session.add(account)
-                        db.session.flush()
-                    
-                    # Generate snapshots for last 3 months
-                    start_date = datetime.now() - timedelta(days=90)
-                    current_solved = random.randint(50, 100)
-                    
-                    for day_offset in range(0, 90, 7):  # Weekly snapshots
-                        snapshot_date = start_date + timedelta(days=day_offset)
-                        
-                        # Ensure no duplicates
-                        existing_snap = PlatformSnapshot.query.filter_by(
-                            platform_account_id=account.id,
-                            snapshot_date=snapshot_date.date()
-                        ).first()
-                        
-                        if existing_snap:
-                            continue
-                        
-                        # Progressive increase
-                        current_solved += random.randint(5, 15)
-                        
-                        snapshot = PlatformSnapshot(
-                            platform_account_id=account.id,
-                            total_solved=current_solved,
-                            contest_rating=random.randint(1200, 2000),
-                            global_rank=random.randint(1000, 50000),
-                            snapshot_date=snapshot_date.date(),
-                            status='approved'  # Auto-approve for testing
-                        )
-                        db.session.add(snapshot)
-                        total_snapshots += 1
-                
-                # Commit every 10 students
-                if (index + 1) % 10 == 0:
-                    db.session.commit()
-                    log_info(f"Processed {index + 1} students...")
-            
-            except Exception as e:
-                log_warn(f"Error for student {student.id}: {e}")
-                db.session.rollback()
-        
-        db.session.commit()
-        log_ok(f"Generated {total_snapshots} snapshots for {len(students)} students")
-        
+        created = ensure_accounts(db, PLATFORMS)
+        log_info(f"Created {created} platform accounts")
+
+        end = date.today()
+        generate_snapshots(db, end - timedelta(days=days), end, interval=interval, seed=seed, platforms=PLATFORMS)
+
+        # Snapshots are inserted pre-approved, so rebuild the derived stats
+        from app.analytics.services import rebuild_account_stats, backfill_department_daily_stats
+        stats_count = rebuild_account_stats()
+        log_ok(f"Rebuilt stats for {stats_count} platform accounts")
+        rollup_count = backfill_department_daily_stats(end - timedelta(days=days), end)
+        log_ok(f"Backfilled {rollup_count} department daily stats rows")
+
     except Exception as e:
+        db.session.rollback()
         log_error(f"Snapshot generation failed: {e}")
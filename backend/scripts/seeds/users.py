@@ -4,8 +4,10 @@ Import Users: Admin, Students, Staff
 
 import csv
 import sys
+import uuid
 from datetime import datetime
 from .utils import get_data_file, log_info, log_ok, log_warn, log_error, log_key
+from .bulk import bulk_insert, hash_passwords, BATCH_SIZE
 from app.common.utils import hash_password
 
 def seed_admin(app, db):
@@ -140,3 +142,107 @@ def seed_users_bulk(app, db, filename, role_name, user_type):
         
     except FileNotFoundError:
         log_error(f"File not found: {csv_file}")
+
+def seed_users_fast(app, db, filename, role_name, user_type, batch_size=BATCH_SIZE, workers=None):
+    """
+    Bulk-mode seed_users_bulk for large CSVs.
+
+    Existing emails and register numbers are prefetched into sets and
+    departments into a code -> id dict, passwords are hashed once per
+    distinct value across a process pool, and users, roles and profiles are
+    written with bulk_insert (COPY on Postgres), committing once per batch.
+    """
+    from app.auth.models import User, Role, UserRole
+    from app.students.models import Student
+    from app.academics.models import Department
+    from app.staff.models import StaffProfile
+    
+    csv_file = get_data_file(filename)
+    log_info(f"Importing {user_type} (bulk)...")
+    
+    role = Role.query.filter_by(name=role_name).first()
+    if not role:
+        log_error(f"Role '{role_name}' not found")
+        return
+    
+    try:
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+    except FileNotFoundError:
+        log_error(f"File not found: {csv_file}")
+        return
+
+    is_student = role_name == 'student'
+    existing_emails = _existing(db, User.email, [r['email'] for r in rows])
+    existing_registers = _existing(db, Student.register_number, [r['register_number'] for r in rows]) if is_student else set()
+    departments = dict(db.session.query(Department.code, Department.id).all())
+
+    # Skip rows already seeded, and repeats within the file
+    new_rows = []
+    for row in rows:
+        if row['email'] in existing_emails or (is_student and row['register_number'] in existing_registers):
+            continue
+        existing_emails.add(row['email'])
+        if is_student:
+            existing_registers.add(row['register_number'])
+        new_rows.append(row)
+    skipped = len(rows) - len(new_rows)
+
+    hashes = hash_passwords([r.get('password') or 'TempPass@123' for r in new_rows], workers)
+
+    count = 0
+    for start in range(0, len(new_rows), batch_size):
+        users, user_roles, profiles = [], [], []
+        for row in new_rows[start:start + batch_size]:
+            user_id = str(uuid.uuid4())
+            users.append({
+                'id': user_id,
+                'email': row['email'],
+                'password_hash': hashes[row.get('password') or 'TempPass@123'],
+                'full_name': row['full_name']
+            })
+            user_roles.append({'user_id': user_id, 'role_id': role.id})
+
+            if is_student:
+                dob = None
+                if row.get('date_of_birth'):
+                    try:
+                        dob = datetime.strptime(row['date_of_birth'], '%Y-%m-%d').date()
+                    except ValueError:
+                        pass
+                profiles.append({
+                    'id': str(uuid.uuid4()),
+                    'user_id': user_id,
+                    'register_number': row['register_number'],
+                    'department_id': departments.get(row.get('department_code')),
+                    'admission_year': int(row.get('admission_year') or datetime.now().year),
+                    'phone': row.get('phone') or None,
+                    'gender': row.get('gender') or None,
+                    'date_of_birth': dob
+                })
+            elif role_name in ['hod', 'counsellor', 'advisor']:
+                profiles.append({
+                    'id': str(uuid.uuid4()),
+                    'user_id': user_id,
+                    'department_id': departments.get(row.get('department_code')),
+                    'role_type': role_name
+                })
+
+        bulk_insert(db, User, users)
+        bulk_insert(db, UserRole, user_roles)
+        bulk_insert(db, Student if is_student else StaffProfile, profiles)
+        db.session.commit()
+        count += len(users)
+        log_info(f"Processed {count} {user_type}...")
+
+    log_ok(f"Imported {count} {user_type} (skipped {skipped} existing)\n")
+    return count
+
+def _existing(db, column, values, chunk_size=1000):
+    """Subset of values already present in column"""
+    found = set()
+    values = list(set(values))
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        found.update(v for (v,) in db.session.query(column).filter(column.in_(chunk)))
+    return found
@@ -0,0 +1,145 @@
+import unittest
+import uuid
+from datetime import date
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.students.models import Student, StudentCounsellor
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.models import PlatformAccountStats
+from app.analytics.services import rebuild_account_stats
+
+class TestPlatformAccountStats(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length"
+        })
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+
+            counsellor_role = Role(name="counsellor")
+            db.session.add(counsellor_role)
+
+            counsellor = User(email="counsellor@test.com", password_hash="!", full_name="Counsellor")
+            student_user = User(email="student@test.com", password_hash="!", full_name="Student")
+            db.session.add_all([counsellor, student_user])
+            db.session.flush()
+            db.session.add(UserRole(user_id=counsellor.id, role_id=counsellor_role.id))
+
+            student = Student(user_id=student_user.id, register_number="REG001", admission_year=2024)
+            db.session.add(student)
+            db.session.flush()
+            db.session.add(StudentCounsellor(student_id=student.id, counsellor_user_id=counsellor.id))
+
+            account = PlatformAccount(student_id=student.id, platform_name="leetcode", username="stats_user")
+            db.session.add(account)
+            db.session.commit()
+
+            self.account_id = account.id
+            self.token = create_access_token(identity=counsellor.id)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def add_snapshot(self, day, total_solved, status="pending"):
+        with self.app.app_context():
+            snapshot = PlatformSnapshot(
+                platform_account_id=self.account_id,
+                total_solved=total_solved,
+                contest_rating=1500,
+                snapshot_date=day,
+                status=status
+            )
+            db.session.add(snapshot)
+            db.session.commit()
+            return snapshot.id
+
+    def approve(self, snapshot_id):
+        return self.client.put(
+            f"/counsellor/snapshots/{snapshot_id}/approve",
+            headers={"Authorization": f"Bearer {self.token}"}
+        )
+
+    def test_approval_updates_stats(self):
+        first = self.add_snapshot(date(2025, 1, 1), 10)
+        second = self.add_snapshot(date(2025, 1, 8), 25)
+
+        self.assertEqual(self.approve(first).status_code, 200)
+        with self.app.app_context():
+            stats = PlatformAccountStats.query.get(self.account_id)
+            self.assertEqual(stats.latest_total_solved, 10)
+            self.assertIsNone(stats.previous_total_solved)
+            self.assertEqual(stats.solved_growth, 0)
+
+        self.assertEqual(self.approve(second).status_code, 200)
+        with self.app.app_context():
+            stats = PlatformAccountStats.query.get(self.account_id)
+            self.assertEqual(stats.latest_total_solved, 25)
+            self.assertEqual(stats.previous_total_solved, 10)
+            self.assertEqual(stats.latest_snapshot_date, date(2025, 1, 8))
+            self.assertEqual(stats.solved_growth, 15)
+
+    def test_approving_older_snapshot_keeps_latest(self):
+        newest = self.add_snapshot(date(2025, 2, 1), 40)
+        oldest = self.add_snapshot(date(2025, 1, 1), 30)
+
+        self.approve(newest)
+        self.approve(oldest)
+        with self.app.app_context():
+            stats = PlatformAccountStats.query.get(self.account_id)
+            self.assertEqual(stats.latest_total_solved, 40)
+            self.assertEqual(stats.previous_total_solved, 30)
+
+    def test_rebuild_ignores_unapproved_snapshots(self):
+        self.add_snapshot(date(2025, 1, 1), 10, status="approved")
+        self.add_snapshot(date(2025, 1, 8), 20, status="approved")
+        self.add_snapshot(date(2025, 1, 15), 99, status="pending")
+
+        with self.app.app_context():
+            self.assertEqual(rebuild_account_stats(), 1)
+            stats = PlatformAccountStats.query.get(self.account_id)
+            self.assertEqual(stats.latest_total_solved, 20)
+            self.assertEqual(stats.previous_total_solved, 10)
+
+    def test_approval_reads_only_recent_snapshots(self):
+        self.add_snapshot(date(2024, 6, 1), 5, status="approved")
+        self.add_snapshot(date(2025, 1, 1), 10, status="approved")
+        self.add_snapshot(date(2025, 1, 15), 30, status="approved")
+        middle = self.add_snapshot(date(2025, 1, 10), 25)
+        backdated = self.add_snapshot(date(2024, 12, 1), 8)
+        with self.app.app_context():
+            rebuild_account_stats()
+            engine = db.engine
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            self.assertEqual(self.approve(middle).status_code, 200)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        # Bounded by the previous snapshot date, so old partitions are pruned
+        refresh = [st for st in statements if st.startswith("INSERT INTO platform_account_stats")]
+        self.assertEqual(len(refresh), 1)
+        self.assertIn("platform_snapshots.snapshot_date >=", refresh[0])
+
+        with self.app.app_context():
+            stats = PlatformAccountStats.query.get(self.account_id)
+            self.assertEqual((stats.latest_total_solved, stats.previous_total_solved), (30, 25))
+
+        self.approve(backdated)
+        with self.app.app_context():
+            stats = PlatformAccountStats.query.get(self.account_id)
+            self.assertEqual((stats.latest_total_solved, stats.previous_total_solved), (30, 25))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from datetime import date, timedelta
+from app import create_app, db
+from app.auth.models import User
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.services import rebuild_account_stats
+from app.analytics.risk import evaluate_at_risk
+
+TODAY = date(2025, 6, 30)
+
+class TestAtRiskEngine(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "AT_RISK_INACTIVITY_DAYS": 30,
+            "AT_RISK_MIN_GROWTH": 0,
+            "AT_RISK_DECLINE_THRESHOLD": 0
+        })
+
+        with self.app.app_context():
+            db.create_all()
+            # name -> list of accounts, each a list of (days_ago, total_solved)
+            self.students = {}
+            self.add_student("growing", [[(14, 10), (2, 20)]])
+            self.add_student("inactive", [[(90, 10), (60, 30)]])
+            self.add_student("declining", [[(14, 30), (2, 20)], [(14, 5), (2, 8)]])
+            self.add_student("flat", [[(14, 10), (2, 10)]])
+            self.add_student("no_accounts", [])
+            rebuild_account_stats()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def add_student(self, name, accounts):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name)
+        db.session.add(user)
+        db.session.flush()
+        student = Student(user_id=user.id, register_number=name.upper(), admission_year=2024)
+        db.session.add(student)
+        db.session.flush()
+        for i, snapshots in enumerate(accounts):
+            account = PlatformAccount(student_id=student.id, platform_name=f"p{i}", username=name)
+            db.session.add(account)
+            db.session.flush()
+            for days_ago, total_solved in snapshots:
+                db.session.add(PlatformSnapshot(
+                    platform_account_id=account.id,
+                    total_solved=total_solved,
+                    snapshot_date=TODAY - timedelta(days=days_ago),
+                    status="approved"
+                ))
+        db.session.commit()
+        self.students[name] = student.id
+
+    def rows_by_name(self, **kwargs):
+        report = evaluate_at_risk(today=TODAY, **kwargs)
+        return {row["full_name"]: row for row in report.rows()}
+
+    def test_flags(self):
+        with self.app.app_context():
+            rows = self.rows_by_name()
+
+        self.assertFalse(rows["growing"]["is_risk"])
+        self.assertEqual(rows["growing"]["growth"], 10)
+
+        self.assertTrue(rows["inactive"]["is_inactive"])
+        self.assertEqual(rows["inactive"]["last_snapshot_date"], TODAY - timedelta(days=60))
+
+        self.assertTrue(rows["declining"]["is_declining"])
+        self.assertEqual(rows["declining"]["growth"], -7)
+        self.assertEqual(rows["declining"]["total_solved"], 28)
+
+        self.assertTrue(rows["flat"]["has_no_growth"])
+        self.assertFalse(rows["flat"]["is_declining"])
+
+        self.assertTrue(rows["no_accounts"]["is_inactive"])
+        self.assertIsNone(rows["no_accounts"]["last_snapshot_date"])
+
+    def test_thresholds_are_configurable(self):
+        with self.app.app_context():
+            rows = self.rows_by_name(inactivity_days=90, min_growth=15)
+
+        self.assertFalse(rows["inactive"]["is_inactive"])
+        self.assertTrue(rows["growing"]["has_no_growth"])
+
+    def test_scope_and_account_filter(self):
+        with self.app.app_context():
+            report = evaluate_at_risk(
+                student_scope=[self.students["inactive"], self.students["no_accounts"]],
+                today=TODAY
+            )
+            names = [row["full_name"] for row in report.rows(only_risk=True, require_accounts=True)]
+
+        self.assertEqual(len(report), 2)
+        self.assertEqual(names, ["inactive"])
+
+if __name__ == '__main__':
+    unittest.main()
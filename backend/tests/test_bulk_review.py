@@ -0,0 +1,157 @@
+import unittest
+from datetime import date, timedelta
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.academics.models import Department
+from app.students.models import Student, StudentCounsellor
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.models import PlatformAccountStats, DepartmentDailyStats
+
+class TestBulkReview(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null",
+            "REVIEW_BULK_MAX_IDS": 50
+        })
+        self.client = self.app.test_client()
+        self.start = date(2026, 1, 5)
+
+        with self.app.app_context():
+            db.create_all()
+            roles = {name: Role(name=name) for name in ["student", "counsellor"]}
+            db.session.add_all(roles.values())
+            db.session.flush()
+            counsellor = self.create_user("counsellor", roles["counsellor"])
+            other_counsellor = self.create_user("other_counsellor", roles["counsellor"])
+            students = [Student(user_id=self.create_user(f"student{i}", roles["student"]),
+                                register_number=f"REG00{i}", admission_year=2024) for i in range(3)]
+            db.session.add_all(students)
+            db.session.flush()
+            db.session.add_all([
+                StudentCounsellor(student_id=students[0].id, counsellor_user_id=counsellor),
+                StudentCounsellor(student_id=students[1].id, counsellor_user_id=counsellor),
+                StudentCounsellor(student_id=students[2].id, counsellor_user_id=other_counsellor)
+            ])
+            accounts = [PlatformAccount(student_id=s.id, platform_name="leetcode", username=f"lc{i}")
+                        for i, s in enumerate(students)]
+            db.session.add_all(accounts)
+            db.session.flush()
+
+            self.snapshots = {}
+            for account, student in zip(accounts, students):
+                snapshots = [PlatformSnapshot(platform_account_id=account.id, total_solved=10 * (k + 1),
+                                              snapshot_date=self.start + timedelta(weeks=k), status="pending")
+                             for k in range(4)]
+                db.session.add_all(snapshots)
+                db.session.flush()
+                self.snapshots[student.id] = [s.id for s in snapshots]
+            db.session.commit()
+            self.student_ids = [s.id for s in students]
+            self.account_ids = [a.id for a in accounts]
+            self.headers = {"Authorization": f"Bearer {create_access_token(identity=counsellor)}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, name, role):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name.title())
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserRole(user_id=user.id, role_id=role.id))
+        return user.id
+
+    def put(self, action, payload):
+        with self.app.app_context():
+            engine = db.engine
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = self.client.put(f"/counsellor/snapshots/bulk-{action}", json=payload, headers=self.headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        return response, statements
+
+    def statuses(self, student_index):
+        with self.app.app_context():
+            ids = self.snapshots[self.student_ids[student_index]]
+            return [db.session.get(PlatformSnapshot, i).status for i in ids]
+
+    def test_approve_ids_reports_skipped(self):
+        mine = self.snapshots[self.student_ids[0]]
+        foreign = self.snapshots[self.student_ids[2]][0]
+        with self.app.app_context():
+            db.session.get(PlatformSnapshot, mine[3]).status = "rejected"
+            db.session.commit()
+
+        response, statements = self.put("approve", {"snapshot_ids": mine + [foreign, "missing", mine[0]]})
+        self.assertEqual(response.status_code, 200, response.get_json())
+        data = response.get_json()["data"]
+        self.assertEqual(sorted(data["updated"]), sorted(mine[:3]))
+        self.assertEqual(data["skipped"], [
+            {"id": mine[3], "reason": "already rejected"},
+            {"id": foreign, "reason": "student not assigned to you"},
+            {"id": "missing", "reason": "not found"}
+        ])
+        self.assertEqual(self.statuses(0), ["approved", "approved", "approved", "rejected"])
+        self.assertEqual(self.statuses(2), ["pending"] * 4)
+
+        # One assignment query and one UPDATE, whatever the number of ids
+        updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE PLATFORM_SNAPSHOTS")]
+        self.assertEqual(len(updates), 1)
+        with self.app.app_context():
+            stats = db.session.get(PlatformAccountStats, self.account_ids[0])
+            self.assertEqual((stats.latest_total_solved, stats.previous_total_solved), (30, 20))
+
+    def test_approve_refreshes_department_rollup_within_budget(self):
+        with self.app.app_context():
+            department = Department(name="Computer Science", code="CSE")
+            db.session.add(department)
+            db.session.flush()
+            for student_id in self.student_ids:
+                db.session.get(Student, student_id).department_id = department.id
+            db.session.commit()
+            department_id = department.id
+
+        # Back-dated snapshots, so the refresh recomputes from the earliest one
+        response, statements = self.put("approve", {"student_id": self.student_ids[0]})
+        self.assertEqual(response.status_code, 200, response.get_json())
+        self.assertLessEqual(len(statements), 11)
+        with self.app.app_context():
+            rollup = DepartmentDailyStats.query.filter_by(department_id=department_id)\
+                .order_by(DepartmentDailyStats.stat_date.desc()).first()
+            self.assertEqual(rollup.total_solved, 40)
+
+    def test_reject_all_pending_for_student(self):
+        response, statements = self.put("reject", {"student_id": self.student_ids[1], "remarks": "Screenshots missing"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["data"]["summary"], {"updated": 4, "skipped": 0})
+        self.assertLessEqual(len(statements), 3)
+        with self.app.app_context():
+            remarks = {s.remarks for s in PlatformSnapshot.query.filter_by(status="rejected")}
+        self.assertEqual(remarks, {"Screenshots missing"})
+        self.assertEqual(self.statuses(0), ["pending"] * 4)
+
+        again, _ = self.put("reject", {"student_id": self.student_ids[1]})
+        self.assertEqual(again.get_json()["data"]["summary"], {"updated": 0, "skipped": 0})
+
+        foreign, _ = self.put("approve", {"student_id": self.student_ids[2]})
+        self.assertEqual(foreign.get_json()["data"]["summary"], {"updated": 0, "skipped": 4})
+        self.assertEqual(self.statuses(2), ["pending"] * 4)
+
+    def test_invalid_payloads(self):
+        self.assertEqual(self.put("approve", {})[0].status_code, 400)
+        self.assertEqual(self.put("approve", {"snapshot_ids": [1, 2]})[0].status_code, 400)
+        self.assertEqual(self.put("approve", {"snapshot_ids": ["a"], "student_id": self.student_ids[0]})[0].status_code, 400)
+        self.assertEqual(self.put("reject", {"snapshot_ids": [str(i) for i in range(51)]})[0].status_code, 413)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import csv
+import shutil
+import tempfile
+import unittest
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.auth.seed import seed_roles
+from app.academics.models import Department
+from app.students.models import Student
+from app.staff.models import StaffProfile
+from app.common.utils import verify_password
+from scripts.seeds.users import seed_users_fast
+
+STUDENT_FIELDS = ['email', 'full_name', 'register_number', 'department_code',
+                  'admission_year', 'phone', 'gender', 'date_of_birth', 'password']
+
+class TestBulkSeeding(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null"
+        })
+        self.data_dir = tempfile.mkdtemp()
+        with self.app.app_context():
+            db.create_all()
+            seed_roles()
+            db.session.add_all([Department(name="Computer Science", code="CSE"),
+                                Department(name="Information Technology", code="IT")])
+            db.session.commit()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def write_csv(self, name, fields, rows):
+        path = os.path.join(self.data_dir, name)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def student_row(self, n, **overrides):
+        row = {'email': f'student{n}@test.com', 'full_name': f'Student {n}', 'register_number': f'REG{n:04d}',
+               'department_code': 'CSE' if n % 2 else 'IT', 'admission_year': 2024, 'phone': '',
+               'gender': 'Female', 'date_of_birth': '2005-04-01', 'password': 'TempPass@123'}
+        row.update(overrides)
+        return row
+
+    def test_students_are_bulk_inserted_and_existing_rows_skipped(self):
+        with self.app.app_context():
+            user = User(email='student0@test.com', password_hash='!', full_name='Existing')
+            other = User(email='taken@test.com', password_hash='!', full_name='Taken')
+            db.session.add_all([user, other])
+            db.session.flush()
+            db.session.add(Student(user_id=other.id, register_number='REG0001', admission_year=2023))
+            db.session.commit()
+
+        rows = [self.student_row(n) for n in range(40)]
+        rows.append(self.student_row(2, email='again@test.com'))  # register number repeated in file
+        rows[5]['password'] = 'Different@123'
+        path = self.write_csv('students.csv', STUDENT_FIELDS, rows)
+
+        with self.app.app_context():
+            count = seed_users_fast(self.app, db, path, 'student', 'students', batch_size=16, workers=1)
+            self.assertEqual(count, 38)
+            self.assertEqual(Student.query.count(), 39)
+
+            students = {s.register_number: s for s in Student.query.all()}
+            cse = Department.query.filter_by(code='CSE').one()
+            self.assertEqual(students['REG0003'].department_id, cse.id)
+            self.assertEqual(students['REG0003'].date_of_birth.isoformat(), '2005-04-01')
+            self.assertIsNone(students['REG0003'].phone)
+
+            role = Role.query.filter_by(name='student').one()
+            self.assertEqual(UserRole.query.filter_by(role_id=role.id).count(), 38)
+            seeded = {u.email: u for u in User.query.filter(User.email.like('student%')).all()}
+            self.assertEqual(seeded['student3@test.com'].password_hash, seeded['student4@test.com'].password_hash)
+            self.assertTrue(verify_password('Different@123', seeded['student5@test.com'].password_hash))
+            self.assertTrue(seeded['student3@test.com'].is_active)
+
+            # A second run finds everything already seeded
+            self.assertEqual(seed_users_fast(self.app, db, path, 'student', 'students', workers=1), 0)
+
+    def test_staff_profiles_with_pooled_hashing(self):
+        rows = [{'email': f'advisor{n}@test.com', 'full_name': f'Advisor {n}', 'department_code': 'CSE',
+                 'password': f'Advisor@{n % 3}'} for n in range(6)]
+        rows.append({'email': 'nodept@test.com', 'full_name': 'No Dept', 'department_code': 'XYZ', 'password': ''})
+        path = self.write_csv('advisors.csv', ['email', 'full_name', 'department_code', 'password'], rows)
+
+        with self.app.app_context():
+            self.assertEqual(seed_users_fast(self.app, db, path, 'advisor', 'advisors', workers=2), 7)
+            profiles = {p.user.email: p for p in StaffProfile.query.all()}
+            self.assertEqual({p.role_type for p in profiles.values()}, {'advisor'})
+            self.assertIsNone(profiles['nodept@test.com'].department_id)
+            self.assertTrue(verify_password('Advisor@2', profiles['advisor5@test.com'].user.password_hash))
+            self.assertTrue(verify_password('TempPass@123', profiles['nodept@test.com'].user.password_hash))
+
+if __name__ == "__main__":
+    unittest.main()
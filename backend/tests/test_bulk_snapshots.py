@@ -0,0 +1,150 @@
+import io
+import unittest
+from datetime import date, timedelta
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.students.models import Student, StudentCounsellor
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+
+class TestBulkSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null",
+            "SNAPSHOT_BULK_MAX_ROWS": 100
+        })
+        self.client = self.app.test_client()
+        self.start = date(2026, 1, 5)
+
+        with self.app.app_context():
+            db.create_all()
+            roles = {name: Role(name=name) for name in ["student", "counsellor"]}
+            db.session.add_all(roles.values())
+            db.session.flush()
+            owner = self.create_user("owner", roles["student"])
+            other = self.create_user("other", roles["student"])
+            counsellor = self.create_user("counsellor", roles["counsellor"])
+            students = [Student(user_id=owner, register_number="REG001", admission_year=2024),
+                        Student(user_id=other, register_number="REG002", admission_year=2024)]
+            db.session.add_all(students)
+            db.session.flush()
+            db.session.add(StudentCounsellor(student_id=students[1].id, counsellor_user_id=counsellor))
+            accounts = [PlatformAccount(student_id=students[0].id, platform_name="leetcode", username="owner_lc"),
+                        PlatformAccount(student_id=students[0].id, platform_name="codeforces", username="owner_cf"),
+                        PlatformAccount(student_id=students[1].id, platform_name="leetcode", username="other_lc")]
+            db.session.add_all(accounts)
+            db.session.commit()
+            self.account_ids = [a.id for a in accounts]
+            self.owner_headers = {"Authorization": f"Bearer {create_access_token(identity=owner)}"}
+            self.counsellor_headers = {"Authorization": f"Bearer {create_access_token(identity=counsellor)}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, name, role):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name.title())
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserRole(user_id=user.id, role_id=role.id))
+        return user.id
+
+    def weekly(self, account_id, weeks, solved=10):
+        return [{"platform_account_id": account_id, "total_solved": solved + 5 * k,
+                 "snapshot_date": (self.start + timedelta(weeks=k)).isoformat()} for k in range(weeks)]
+
+    def post(self, payload, headers=None, query=""):
+        with self.app.app_context():
+            engine = db.engine
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = self.client.post(f"/snapshots/bulk{query}", headers=headers or self.owner_headers, **payload)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        return response, len(statements)
+
+    def test_backfill_in_one_request_with_per_row_results(self):
+        rows = self.weekly(self.account_ids[0], 18) + self.weekly(self.account_ids[1], 18)
+        rows += [
+            {"platform_account_id": self.account_ids[2], "total_solved": 1, "snapshot_date": "2026-01-05"},
+            {"platform_account_id": self.account_ids[0], "total_solved": 1, "snapshot_date": "05-01-2026"},
+            {"platform_account_id": self.account_ids[0], "total_solved": -1, "snapshot_date": "2026-01-05"},
+            dict(rows[0])
+        ]
+        response, queries = self.post({"json": rows})
+        self.assertEqual(response.status_code, 200, response.get_json())
+        data = response.get_json()["data"]
+        self.assertEqual(data["summary"], {"created": 36, "updated": 0, "skipped": 0, "error": 4})
+        errors = [r["error"] for r in data["results"] if r["status"] == "error"]
+        self.assertEqual(errors, ["Platform account not found or not accessible",
+                                  "Invalid date format. Use YYYY-MM-DD",
+                                  "total_solved must not be negative",
+                                  "Duplicate of row 0"])
+        self.assertEqual([r["row"] for r in data["results"]], list(range(len(rows))))
+
+        # Statement count does not grow with the number of rows
+        _, small_queries = self.post({"json": self.weekly(self.account_ids[0], 2, solved=500)})
+        self.assertEqual(queries, small_queries)
+
+        with self.app.app_context():
+            self.assertEqual(PlatformSnapshot.query.filter_by(status="pending").count(), 36)
+
+    def test_conflicts_skip_or_update_pending_only(self):
+        with self.app.app_context():
+            db.session.add(PlatformSnapshot(platform_account_id=self.account_ids[0], total_solved=7,
+                                            snapshot_date=self.start, status="approved"))
+            db.session.commit()
+        rows = self.weekly(self.account_ids[0], 3)
+        first, _ = self.post({"json": rows})
+        self.assertEqual(first.get_json()["data"]["summary"], {"created": 2, "updated": 0, "skipped": 1, "error": 0})
+
+        changed = self.weekly(self.account_ids[0], 3, solved=100)
+        skipped, _ = self.post({"json": changed})
+        self.assertEqual(skipped.get_json()["data"]["summary"]["skipped"], 3)
+
+        updated, _ = self.post({"json": {"snapshots": changed, "on_conflict": "update"}})
+        results = updated.get_json()["data"]["results"]
+        self.assertEqual([r["status"] for r in results], ["skipped", "updated", "updated"])
+        self.assertEqual(results[0]["error"], "Snapshot for this date already reviewed")
+        self.assertEqual(results[1]["id"], first.get_json()["data"]["results"][1]["id"])
+
+        with self.app.app_context():
+            values = {s.snapshot_date: (s.total_solved, s.status) for s in PlatformSnapshot.query.all()}
+        self.assertEqual(values[self.start], (7, "approved"))
+        self.assertEqual(values[self.start + timedelta(weeks=1)], (105, "pending"))
+
+    def test_csv_import_by_counsellor_is_scoped_to_assigned_students(self):
+        csv_text = "platform_account_id,total_solved,contest_rating,global_rank,snapshot_date\n"
+        csv_text += f"{self.account_ids[2]},40,1500,,2026-01-05\n"
+        csv_text += f"{self.account_ids[2]},45,,,2026-01-12\n"
+        csv_text += f"{self.account_ids[0]},45,,,2026-01-12\n"
+
+        response, _ = self.post({"data": csv_text, "content_type": "text/csv"}, headers=self.counsellor_headers)
+        data = response.get_json()["data"]
+        self.assertEqual([r["status"] for r in data["results"]], ["created", "created", "error"])
+
+        upload = {"data": {"file": (io.BytesIO(csv_text.encode()), "snapshots.csv")},
+                  "content_type": "multipart/form-data"}
+        response, _ = self.post(upload, headers=self.counsellor_headers)
+        self.assertEqual(response.get_json()["data"]["summary"], {"created": 0, "updated": 0, "skipped": 2, "error": 1})
+
+        with self.app.app_context():
+            snapshot = PlatformSnapshot.query.filter_by(snapshot_date=self.start).one()
+            self.assertEqual((snapshot.total_solved, snapshot.contest_rating, snapshot.global_rank), (40, 1500, None))
+
+    def test_invalid_payloads(self):
+        self.assertEqual(self.post({"json": {"rows": []}})[0].status_code, 400)
+        self.assertEqual(self.post({"data": "a,b\n1,2\n", "content_type": "text/csv"})[0].status_code, 400)
+        self.assertEqual(self.post({"json": self.weekly(self.account_ids[0], 2)}, query="?on_conflict=merge")[0].status_code, 400)
+        self.assertEqual(self.post({"json": self.weekly(self.account_ids[0], 101)})[0].status_code, 413)
+
+if __name__ == "__main__":
+    unittest.main()
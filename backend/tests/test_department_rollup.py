@@ -0,0 +1,212 @@
+import unittest
+from datetime import date, timedelta
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.academics.models import Department
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.models import PlatformAccountStats, DepartmentDailyStats
+from app.analytics.services import (
+    compute_department_daily_stats,
+    backfill_department_daily_stats,
+    refresh_department_daily_stats
+)
+
+START = date(2025, 1, 1)
+
+class TestDepartmentDailyRollup(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "AT_RISK_INACTIVITY_DAYS": 5
+        })
+
+        with self.app.app_context():
+            db.create_all()
+            department = Department(name="Computer Science", code="CSE")
+            db.session.add(department)
+            db.session.flush()
+            self.department_id = department.id
+
+            # student -> accounts -> [(day offset, total_solved, rating)]
+            self.add_student("alice", [
+                [(0, 10, 1400), (3, 15, 1450), (10, 30, None)],
+                [(2, 5, None)]
+            ])
+            self.add_student("bob", [[(1, 100, 1600)]])
+            self.add_student("carol", [])
+            db.session.add(PlatformSnapshot(
+                platform_account_id=self.bob_account,
+                total_solved=999,
+                snapshot_date=START + timedelta(days=4),
+                status="pending"
+            ))
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def add_student(self, name, accounts):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name)
+        db.session.add(user)
+        db.session.flush()
+        student = Student(user_id=user.id, register_number=name.upper(), admission_year=2024, department_id=self.department_id)
+        db.session.add(student)
+        db.session.flush()
+        for i, snapshots in enumerate(accounts):
+            account = PlatformAccount(student_id=student.id, platform_name=f"p{i}", username=name)
+            db.session.add(account)
+            db.session.flush()
+            if name == "bob":
+                self.bob_account = account.id
+            for offset, solved, rating in snapshots:
+                db.session.add(PlatformSnapshot(
+                    platform_account_id=account.id,
+                    total_solved=solved,
+                    contest_rating=rating,
+                    snapshot_date=START + timedelta(days=offset),
+                    status="approved"
+                ))
+
+    def test_daily_values(self):
+        with self.app.app_context():
+            rows = compute_department_daily_stats(self.department_id, START, START + timedelta(days=12))
+        by_day = {(r["stat_date"] - START).days: r for r in rows}
+
+        self.assertEqual(len(rows), 13)
+        self.assertEqual(by_day[0]["student_count"], 3)
+        self.assertEqual(by_day[0]["linked_accounts"], 3)
+
+        self.assertEqual(by_day[0]["total_solved"], 10)
+        self.assertEqual(by_day[2]["total_solved"], 10 + 100 + 5)
+        self.assertEqual(by_day[4]["total_solved"], 15 + 100 + 5)  # pending snapshot ignored
+        self.assertEqual(by_day[12]["total_solved"], 30 + 100 + 5)
+
+        self.assertEqual(by_day[3]["growth"], 5)
+        self.assertEqual(by_day[10]["growth"], 15)
+
+        self.assertAlmostEqual(by_day[1]["average_rating"], 1500)
+        self.assertAlmostEqual(by_day[10]["average_rating"], 1600)
+
+        # Window of 5 days: bob's only snapshot (day 1) covers days 1-6
+        self.assertEqual(by_day[1]["active_students"], 2)
+        self.assertEqual(by_day[7]["active_students"], 1)
+        self.assertEqual(by_day[9]["active_students"], 0)
+        self.assertEqual(by_day[10]["active_students"], 1)
+
+    def test_range_start_uses_prior_snapshots(self):
+        with self.app.app_context():
+            full = compute_department_daily_stats(self.department_id, START, START + timedelta(days=12))
+            tail = compute_department_daily_stats(self.department_id, START + timedelta(days=8), START + timedelta(days=12))
+        strip = lambda r: {k: v for k, v in r.items() if k != "updated_at"}
+        self.assertEqual([strip(r) for r in full[8:]], [strip(r) for r in tail])
+
+    def test_backfill_and_refresh(self):
+        with self.app.app_context():
+            today = date.today()
+            written = backfill_department_daily_stats(today - timedelta(days=2), today)
+            self.assertEqual(written, 3)
+
+            refresh_department_daily_stats([self.department_id])
+            db.session.commit()
+            self.assertEqual(DepartmentDailyStats.query.count(), 3)
+            latest = DepartmentDailyStats.query.filter_by(stat_date=today).one()
+            self.assertEqual(latest.total_solved, 135)
+
+class TestDepartmentPerformanceFreshness(unittest.TestCase):
+    """Roster and account changes refresh today's rollup row, not only approvals"""
+
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null"
+        })
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            roles = {name: Role(name=name) for name in ("admin", "student")}
+            db.session.add_all(roles.values())
+            department = Department(name="Computer Science", code="CSE")
+            db.session.add(department)
+            db.session.flush()
+            self.department_id = department.id
+
+            admin = User(email="admin@test.com", password_hash="!", full_name="Admin")
+            student_user = User(email="student@test.com", password_hash="!", full_name="Student")
+            db.session.add_all([admin, student_user])
+            db.session.flush()
+            db.session.add_all([UserRole(user_id=admin.id, role_id=roles["admin"].id),
+                                UserRole(user_id=student_user.id, role_id=roles["student"].id)])
+            student = Student(user_id=student_user.id, register_number="REG001", admission_year=2024,
+                              department_id=department.id)
+            db.session.add(student)
+            db.session.commit()
+            self.student_id = student.id
+            self.admin = {"Authorization": f"Bearer {create_access_token(identity=admin.id)}"}
+            self.student = {"Authorization": f"Bearer {create_access_token(identity=student_user.id)}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def performance(self):
+        response = self.client.get("/analytics/department-performance", headers=self.admin)
+        return {d["department_id"]: d for d in response.get_json()["data"]}
+
+    def test_department_without_rollup_row_is_aggregated_live(self):
+        # Students added outside the API (seeding, registration) leave no rollup row
+        with self.app.app_context():
+            self.assertEqual(DepartmentDailyStats.query.count(), 0)
+            account = PlatformAccount(student_id=self.student_id, platform_name="leetcode", username="lc")
+            db.session.add(account)
+            db.session.flush()
+            db.session.add(PlatformAccountStats(platform_account_id=account.id, latest_snapshot_date=date.today(),
+                                                latest_total_solved=25, previous_total_solved=20))
+            db.session.commit()
+
+        row = self.performance()[self.department_id]
+        self.assertEqual(row["total_students"], 1)
+        self.assertEqual(row["linked_accounts"], 1)
+        self.assertEqual(row["total_solved"], 25)
+        self.assertEqual(row["growth"], 5)
+        self.assertEqual(row["active_students"], 1)
+
+    def test_mutations_refresh_department_performance(self):
+        # Created through the admin API: the department appears without any approval
+        response = self.client.post("/admin/create-user", headers=self.admin, json={
+            "email": "new@test.com", "password": "secret123", "full_name": "New",
+            "role": "student", "department_id": self.department_id})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.performance()[self.department_id]["total_students"], 2)
+
+        response = self.client.post("/platforms/link", headers=self.student,
+                                    json={"platform_name": "leetcode", "username": "lc"})
+        self.assertEqual(response.status_code, 201)
+        account_id = response.get_json()["data"]["id"]
+        self.assertEqual(self.performance()[self.department_id]["linked_accounts"], 1)
+
+        with self.app.app_context():
+            db.session.add(PlatformSnapshot(platform_account_id=account_id, total_solved=40,
+                                             snapshot_date=date.today(), status="approved"))
+            refresh_department_daily_stats([self.department_id])
+            db.session.commit()
+        self.assertEqual(self.performance()[self.department_id]["total_solved"], 40)
+
+        self.assertEqual(self.client.delete(f"/platforms/{account_id}", headers=self.student).status_code, 200)
+        stats = self.performance()[self.department_id]
+        self.assertEqual((stats["linked_accounts"], stats["total_solved"]), (0, 0))
+
+        self.assertEqual(self.client.delete(f"/students/{self.student_id}", headers=self.admin).status_code, 200)
+        self.assertEqual(self.performance()[self.department_id]["total_students"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
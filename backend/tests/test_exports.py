@@ -0,0 +1,199 @@
+import csv
+import io
+import json
+import unittest
+from datetime import date, timedelta
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.academics.models import Department
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.services import rebuild_account_stats, get_student_metrics
+
+class TestExports(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null",
+            "EXPORT_BATCH_SIZE": 5
+        })
+        self.client = self.app.test_client()
+        self.start = date(2026, 1, 5)
+
+        with self.app.app_context():
+            db.create_all()
+            roles = {name: Role(name=name) for name in ("admin", "hod", "counsellor", "student")}
+            db.session.add_all(roles.values())
+            db.session.flush()
+            admin = self.create_user("admin", roles["admin"])
+            hod = self.create_user("hod", roles["hod"])
+            counsellor = self.create_user("counsellor", roles["counsellor"])
+
+            cse = Department(name="Computer Science", code="CSE", hod_id=hod)
+            ece = Department(name="Electronics", code="ECE")
+            db.session.add_all([cse, ece])
+            db.session.flush()
+
+            self.students = []
+            for i in range(12):
+                department = cse if i < 8 else ece
+                user_id = self.create_user(f"student{i}", roles["student"])
+                student = Student(user_id=user_id, register_number=f"REG{i:03d}", admission_year=2023 + i % 2,
+                                  department_id=department.id)
+                db.session.add(student)
+                db.session.flush()
+                self.students.append(student.id)
+                if i == 11:
+                    continue  # no linked accounts
+                for platform in ("leetcode", "codeforces")[:1 + i % 2]:
+                    account = PlatformAccount(student_id=student.id, platform_name=platform, username=f"{platform}{i}")
+                    db.session.add(account)
+                    db.session.flush()
+                    for k in range(3):
+                        db.session.add(PlatformSnapshot(
+                            platform_account_id=account.id, total_solved=10 * i + 7 * k + len(platform),
+                            contest_rating=(1400 + 10 * i + k) if platform == "codeforces" else None,
+                            snapshot_date=self.start + timedelta(weeks=k),
+                            status="approved" if k < 2 or i % 3 else "pending"))
+            db.session.commit()
+            rebuild_account_stats()
+            self.cse, self.ece = cse.id, ece.id
+            self.tokens = {name: create_access_token(identity=user_id)
+                           for name, user_id in (("admin", admin), ("hod", hod), ("counsellor", counsellor),
+                                                 ("student", self.create_user("viewer", roles["student"])))}
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, name, role):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name.title())
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserRole(user_id=user.id, role_id=role.id))
+        return user.id
+
+    def get(self, url, as_user="admin", **kwargs):
+        return self.client.get(url, headers={"Authorization": f"Bearer {self.tokens[as_user]}"}, **kwargs)
+
+    def read_csv(self, response):
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        return list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+    def test_roster_matches_student_metrics(self):
+        response = self.get("/exports/students")
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, "text/csv")
+        self.assertIn('filename="students.csv"', response.headers["Content-Disposition"])
+        rows = self.read_csv(response)
+        self.assertEqual([r["register_number"] for r in rows], [f"REG{i:03d}" for i in range(12)])
+
+        with self.app.app_context():
+            metrics = get_student_metrics(self.students)
+        for row in rows:
+            expected = metrics[row["student_id"]]
+            self.assertEqual(int(row["total_solved"]), expected["total_solved"])
+            self.assertEqual(int(row["growth"]), expected["growth"])
+            self.assertEqual(int(row["linked_platforms"]), len(expected["platforms"]))
+            self.assertEqual(float(row["rating_average"] or 0), round(expected["rating_average"], 2))
+            self.assertEqual(row["last_active"], expected["last_active"].isoformat() if expected["last_active"] else "")
+            solved = {p["platform_name"]: p["latest_total_solved"] for p in expected["platforms"]}
+            self.assertEqual(int(row["codeforces_solved"]), solved.get("codeforces", 0))
+
+    def test_roster_ndjson_and_filters(self):
+        response = self.get("/exports/students?format=ndjson&admission_year=2024")
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([r["register_number"] for r in rows], [f"REG{i:03d}" for i in range(1, 12, 2)])
+        self.assertIsInstance(rows[0]["total_solved"], int)
+
+        self.assertEqual(self.get("/exports/students?format=xml").status_code, 400)
+        self.assertEqual(self.get("/exports/students?admission_year=soon").status_code, 400)
+
+    def test_hod_exports_only_their_department(self):
+        rows = self.read_csv(self.get("/exports/students", as_user="hod"))
+        self.assertEqual(len(rows), 8)
+        self.assertEqual({r["department_name"] for r in rows}, {"Computer Science"})
+        self.assertEqual(self.get(f"/exports/snapshots?department_id={self.ece}", as_user="hod").status_code, 403)
+        self.assertEqual(self.get("/exports/students", as_user="student").status_code, 403)
+        self.assertEqual(self.get("/exports/snapshots", as_user="counsellor").status_code, 403)
+
+    def test_leaderboard_matches_analytics_endpoint(self):
+        url = f"/analytics/department/{self.cse}/leaderboard"
+        expected = self.get(url).get_json()["data"]["leaderboard"]
+        response = self.get(f"/exports/departments/{self.cse}/leaderboard", as_user="counsellor")
+        self.assertIn('filename="leaderboard-CSE.csv"', response.headers["Content-Disposition"])
+        rows = self.read_csv(response)
+        self.assertEqual([(int(r["rank"]), r["student_id"], int(r["total_solved"])) for r in rows],
+                         [(e["rank"], e["student_id"], e["total_solved"]) for e in expected])
+
+        self.assertEqual(self.get("/exports/departments/missing/leaderboard").status_code, 404)
+        self.assertEqual(self.get(f"/exports/departments/{self.cse}/leaderboard", as_user="student").status_code, 403)
+        with self.app.app_context():
+            self.tokens["ghost"] = create_access_token(identity="deleted-user")
+        self.assertEqual(self.get(f"/exports/departments/{self.cse}/leaderboard", as_user="ghost").status_code, 404)
+
+    def test_snapshot_history_streams_from_a_server_side_cursor(self):
+        with self.app.app_context():
+            engine = db.engine
+        executed = []
+        listener = lambda conn, cursor, statement, params, context, many: executed.append(
+            (statement, context.execution_options.get("stream_results")))
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = self.get("/exports/snapshots", buffered=False)
+            chunks = iter(response.response)
+            header = next(chunks)
+            # The header is sent before the export query runs
+            self.assertFalse(any("platform_snapshots" in s for s, _ in executed))
+            body = (header if isinstance(header, bytes) else header.encode()) + b"".join(
+                c if isinstance(c, bytes) else c.encode() for c in chunks)
+            response.close()
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        self.assertEqual([stream for statement, stream in executed if "FROM platform_snapshots" in statement], [True])
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual(len(rows), 16 * 3)
+        keys = [(r["platform_account_id"], r["snapshot_date"]) for r in rows]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_csv_neutralises_formula_cells(self):
+        with self.app.app_context():
+            user = db.session.get(Student, self.students[0]).user
+            user.full_name = "=HYPERLINK(\"http://evil\",\"x\")"
+            account = PlatformAccount.query.filter_by(username="leetcode0").one()
+            account.username = "@SUM(1+1)"
+            db.session.commit()
+
+        roster = self.read_csv(self.get("/exports/students"))
+        self.assertEqual(roster[0]["full_name"], "'=HYPERLINK(\"http://evil\",\"x\")")
+        self.assertEqual(roster[1]["full_name"], "Student1")
+        snapshots = self.read_csv(self.get("/exports/snapshots?platform=leetcode&department_id=" + self.cse))
+        self.assertEqual({r["username"] for r in snapshots if r["student_id"] == self.students[0]}, {"'@SUM(1+1)"})
+
+        # NDJSON is data, not a spreadsheet: values are exported unchanged
+        response = self.get("/exports/students?format=ndjson")
+        self.assertEqual(json.loads(response.get_data(as_text=True).splitlines()[0])["full_name"],
+                         "=HYPERLINK(\"http://evil\",\"x\")")
+
+    def test_snapshot_filters(self):
+        rows = self.read_csv(self.get(f"/exports/snapshots?status=approved&platform=codeforces"
+                                      f"&start={self.start + timedelta(weeks=1)}&department_id={self.cse}"))
+        # Odd CSE students link codeforces; weeks 1 and 2, less REG003's pending week 2
+        self.assertEqual(len(rows), 4 * 2 - 1)
+        self.assertEqual({(r["platform_name"], r["status"]) for r in rows}, {("codeforces", "approved")})
+        self.assertTrue(all(r["snapshot_date"] >= (self.start + timedelta(weeks=1)).isoformat() for r in rows))
+
+        self.assertEqual(self.get("/exports/snapshots?status=lost").status_code, 400)
+        self.assertEqual(self.get("/exports/snapshots?start=yesterday").status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
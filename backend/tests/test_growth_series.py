@@ -0,0 +1,120 @@
+import unittest
+from datetime import date
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User
+from app.academics.models import Department
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.timeseries import growth_series
+
+class TestGrowthSeries(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length"
+        })
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            department = Department(name="Computer Science", code="CSE")
+            db.session.add(department)
+            db.session.flush()
+            self.department_id = department.id
+
+            self.alice, (self.alice_lc, _) = self.add_student("alice", [
+                [(date(2024, 12, 30), 10), (date(2025, 1, 7), 15), (date(2025, 1, 9), 20), (date(2025, 1, 21), 40)],
+                [(date(2025, 1, 14), 5)]
+            ])
+            self.bob, (bob_account,) = self.add_student("bob", [[(date(2025, 1, 8), 100)]])
+            db.session.add(PlatformSnapshot(
+                platform_account_id=bob_account,
+                total_solved=999,
+                snapshot_date=date(2025, 1, 15),
+                status="pending"
+            ))
+            db.session.commit()
+
+            self.alice_token = create_access_token(identity=Student.query.get(self.alice).user_id)
+            self.bob_token = create_access_token(identity=Student.query.get(self.bob).user_id)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def add_student(self, name, accounts):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name)
+        db.session.add(user)
+        db.session.flush()
+        student = Student(user_id=user.id, register_number=name.upper(), admission_year=2024, department_id=self.department_id)
+        db.session.add(student)
+        db.session.flush()
+        account_ids = []
+        for i, snapshots in enumerate(accounts):
+            account = PlatformAccount(student_id=student.id, platform_name=f"p{i}", username=name)
+            db.session.add(account)
+            db.session.flush()
+            account_ids.append(account.id)
+            for day, solved in snapshots:
+                db.session.add(PlatformSnapshot(
+                    platform_account_id=account.id,
+                    total_solved=solved,
+                    snapshot_date=day,
+                    status="approved"
+                ))
+        return student.id, account_ids
+
+    def series(self, scope, scope_id, interval, start, end):
+        with self.app.app_context():
+            return [
+                (p["period_start"], p["total_solved"], p["solved_delta"])
+                for p in growth_series(scope, scope_id, interval, start, end)
+            ]
+
+    def test_weekly_student_series(self):
+        self.assertEqual(self.series("student", self.alice, "week", date(2025, 1, 6), date(2025, 2, 2)), [
+            ("2025-01-06", 20, 10),
+            ("2025-01-13", 25, 0),   # new account counts toward the total, not growth
+            ("2025-01-20", 45, 20),
+            ("2025-01-27", 45, 0)    # empty week carries the total forward
+        ])
+
+    def test_weekly_department_series_ignores_pending(self):
+        self.assertEqual(self.series("department", self.department_id, "week", date(2025, 1, 8), date(2025, 1, 26)), [
+            ("2025-01-06", 120, 10),
+            ("2025-01-13", 125, 0),
+            ("2025-01-20", 145, 20)
+        ])
+
+    def test_monthly_account_series(self):
+        self.assertEqual(self.series("account", self.alice_lc, "month", date(2024, 12, 1), date(2025, 1, 31)), [
+            ("2024-12-01", 10, 0),
+            ("2025-01-01", 40, 30)
+        ])
+        self.assertEqual(self.series("account", self.alice_lc, "month", date(2025, 1, 1), date(2025, 1, 31)), [
+            ("2025-01-01", 40, 30)
+        ])
+
+    def test_endpoints(self):
+        alice = {"Authorization": f"Bearer {self.alice_token}"}
+        bob = {"Authorization": f"Bearer {self.bob_token}"}
+
+        response = self.client.get(f"/analytics/timeseries/student/{self.alice}?interval=month&from=2025-01-01&to=2025-01-31", headers=alice)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["data"]["series"][0]["total_solved"], 45)
+
+        response = self.client.get(f"/analytics/timeseries/account/{self.alice_lc}?from=2025-01-06&to=2025-01-12", headers=alice)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["data"]["series"]), 1)
+
+        self.assertEqual(self.client.get(f"/analytics/timeseries/student/{self.alice}", headers=bob).status_code, 403)
+        self.assertEqual(self.client.get(f"/analytics/timeseries/department/{self.department_id}", headers=alice).status_code, 403)
+        self.assertEqual(self.client.get(f"/analytics/timeseries/student/{self.alice}?interval=day", headers=alice).status_code, 400)
+        self.assertEqual(self.client.get(f"/analytics/timeseries/student/{self.alice}?from=2025-02-01&to=2025-01-01", headers=alice).status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from sqlalchemy import text
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.common.instrumentation import metrics, query_budget, QueryBudgetExceeded
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null",
+            "METRICS_ENABLED": True
+        })
+
+        @self.app.route("/test/n-plus-one")
+        @query_budget(20)
+        def n_plus_one():
+            for _ in range(12):
+                db.session.execute(text("SELECT 1")).scalar()
+            return {"ok": True}
+
+        @self.app.route("/test/over-budget")
+        @query_budget(2)
+        def over_budget():
+            for i in range(3):
+                db.session.execute(text(f"SELECT {i}")).scalar()
+            return {"ok": True}
+
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            role = Role(name="admin")
+            user = User(email="admin@test.com", password_hash="!", full_name="Admin")
+            db.session.add_all([role, user])
+            db.session.flush()
+            db.session.add(UserRole(user_id=user.id, role_id=role.id))
+            db.session.commit()
+            self.headers = {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_headers_and_metrics(self):
+        response = self.client.get("/analytics/institution-summary", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-Query-Count"], "5")
+        self.assertIn('db;dur=', response.headers["Server-Timing"])
+        self.assertIn('desc="5 queries"', response.headers["Server-Timing"])
+
+        body = self.client.get("/metrics").get_data(as_text=True)
+        self.assertIn("# TYPE codelens_request_queries histogram", body)
+        self.assertIn('codelens_request_queries_bucket{endpoint="analytics_bp.get_institution_summary",le="5"}', body)
+        self.assertIn('codelens_request_duration_seconds_count{endpoint="analytics_bp.get_institution_summary",'
+                      'method="GET",status="200"}', body)
+
+    def test_metrics_endpoint_is_opt_in_and_token_protected(self):
+        for config, headers, status in [
+            ({}, {}, 404),
+            ({"METRICS_ENABLED": True, "METRICS_TOKEN": "scrape"}, {}, 401),
+            ({"METRICS_ENABLED": True, "METRICS_TOKEN": "scrape"}, {"Authorization": "Bearer wrong"}, 401),
+            ({"METRICS_ENABLED": True, "METRICS_TOKEN": "scrape"}, {"Authorization": "Bearer scrape"}, 200)
+        ]:
+            app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+                              "CACHE_TYPE": "null", **config})
+            with self.subTest(config=config, headers=headers):
+                self.assertEqual(app.test_client().get("/metrics", headers=headers).status_code, status)
+
+    def test_repeated_statement_is_reported(self):
+        before = metrics.n_plus_one.values[("n_plus_one",)]
+        with self.assertLogs("app.common.instrumentation", level="WARNING") as logs:
+            response = self.client.get("/test/n-plus-one")
+        self.assertEqual(response.headers["X-Query-Count"], "12")
+        self.assertIn("issued 12 times", logs.output[0])
+        self.assertEqual(metrics.n_plus_one.values[("n_plus_one",)], before + 1)
+
+    def test_query_budget_is_enforced_in_testing(self):
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            self.client.get("/test/over-budget")
+        self.assertIn("issued 3 queries (budget 2)", str(ctx.exception))
+
+if __name__ == "__main__":
+    unittest.main()
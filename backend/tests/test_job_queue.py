@@ -0,0 +1,280 @@
+import os
+import time
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.jobs.models import Job
+from app.jobs.tasks import task
+from app.jobs import queue
+from app.jobs.queue import enqueue, claim_job, requeue_stale, complete_job
+from app.jobs.worker import Worker
+
+CALLS = Counter()
+CALLS_LOCK = threading.Lock()
+
+@task("tests.record")
+def record(name, sleep=0):
+    time.sleep(sleep)
+    with CALLS_LOCK:
+        CALLS[name] += 1
+    return {"name": name}
+
+@task("tests.flaky")
+def flaky(name, failures):
+    CALLS[name] += 1
+    if CALLS[name] <= failures:
+        raise RuntimeError(f"attempt {CALLS[name]} failed")
+    return {"attempts": CALLS[name]}
+
+class JobTestCase(unittest.TestCase):
+    database_uri = "sqlite:///:memory:"
+
+    def setUp(self):
+        CALLS.clear()
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": self.database_uri,
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null",
+            "JOB_POLL_INTERVAL": 0,
+            "JOB_RETRY_BACKOFF_SECONDS": 60
+        })
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def make_due(self, job_id):
+        db.session.get(Job, job_id).run_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+class TestJobQueue(JobTestCase):
+    def test_claims_by_priority_then_due_time(self):
+        with self.app.app_context():
+            low = enqueue("tests.record", {"name": "low"}).id
+            high = enqueue("tests.record", {"name": "high"}, priority=10).id
+            later = enqueue("tests.record", {"name": "later"}, priority=20, delay=3600).id
+
+            self.assertEqual(claim_job("w1"), high)
+            self.assertEqual(claim_job("w2"), low)
+            self.assertIsNone(claim_job("w3"))
+
+            job = db.session.get(Job, high)
+            self.assertEqual((job.status, job.locked_by, job.attempts), ("running", "w1", 1))
+            self.assertEqual(db.session.get(Job, later).status, "queued")
+
+    def test_failed_attempts_back_off_then_fail(self):
+        worker = Worker(self.app, name="w1")
+        with self.app.app_context():
+            job_id = enqueue("tests.flaky", {"name": "flaky", "failures": 5}, max_attempts=3).id
+
+        self.assertEqual(worker.run_once(), "queued")
+        with self.app.app_context():
+            job = db.session.get(Job, job_id)
+            self.assertIn("attempt 1 failed", job.error)
+            self.assertAlmostEqual((job.run_at - datetime.utcnow()).total_seconds(), 60, delta=5)
+        self.assertIsNone(worker.run_once())
+
+        with self.app.app_context():
+            self.make_due(job_id)
+        self.assertEqual(worker.run_once(), "queued")
+        with self.app.app_context():
+            # Backoff doubles per attempt
+            job = db.session.get(Job, job_id)
+            self.assertAlmostEqual((job.run_at - datetime.utcnow()).total_seconds(), 120, delta=5)
+            self.make_due(job_id)
+        self.assertEqual(worker.run_once(), "failed")
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Job, job_id).attempts, 3)
+
+    def test_retry_succeeds(self):
+        worker = Worker(self.app, name="w1")
+        with self.app.app_context():
+            job_id = enqueue("tests.flaky", {"name": "flaky", "failures": 1}).id
+        self.assertEqual(worker.run_once(), "queued")
+        with self.app.app_context():
+            self.make_due(job_id)
+        self.assertEqual(worker.run_once(), "succeeded")
+        with self.app.app_context():
+            job = db.session.get(Job, job_id)
+            self.assertEqual((job.result, job.attempts, job.error), ({"attempts": 2}, 2, None))
+
+    def test_unknown_task_is_rejected(self):
+        with self.app.app_context():
+            with self.assertRaises(ValueError):
+                enqueue("tests.missing")
+
+    def test_recurring_job_schedules_its_next_run(self):
+        worker = Worker(self.app, name="w1")
+        with self.app.app_context():
+            first = enqueue("tests.record", {"name": "tick"}, interval=3600, key="hourly")
+            first_id, first_run_at = first.id, first.run_at
+            # One active job per key
+            self.assertEqual(enqueue("tests.record", {"name": "tick"}, interval=3600, key="hourly").id, first_id)
+
+        self.assertEqual(worker.run_once(), "succeeded")
+        with self.app.app_context():
+            upcoming = Job.query.filter_by(key="hourly", status="queued").one()
+            self.assertNotEqual(upcoming.id, first_id)
+            self.assertEqual(upcoming.run_at, first_run_at + timedelta(hours=1))
+            self.assertEqual((upcoming.payload, upcoming.interval_seconds), ({"name": "tick"}, 3600))
+        self.assertIsNone(worker.run_once())
+        self.assertEqual(CALLS["tick"], 1)
+
+    def test_concurrent_enqueue_of_a_key_keeps_one_active_job(self):
+        with self.app.app_context():
+            first = enqueue("tests.record", {"name": "tick"}, key="hourly", commit=False)
+            db.session.flush()
+            # Both callers passed the existence check before either inserted
+            with mock.patch.object(queue, "_active_job", side_effect=[None, first]):
+                self.assertIs(enqueue("tests.record", {"name": "tick"}, key="hourly", commit=False), first)
+            db.session.commit()
+            self.assertEqual(Job.query.filter_by(key="hourly").count(), 1)
+
+            db.session.add(Job(task="tests.record", payload={}, key="hourly", status="running"))
+            with self.assertRaises(IntegrityError):
+                db.session.commit()
+            db.session.rollback()
+
+            # Finished jobs release the key
+            db.session.get(Job, first.id).status = "succeeded"
+            db.session.commit()
+            self.assertNotEqual(enqueue("tests.record", {"name": "tick"}, key="hourly").id, first.id)
+
+    def test_stale_jobs_are_released(self):
+        with self.app.app_context():
+            job_id = enqueue("tests.record", {"name": "stale"}).id
+            claim_job("dead-worker")
+            db.session.get(Job, job_id).locked_at = datetime.utcnow() - timedelta(hours=2)
+            db.session.commit()
+
+            self.assertEqual(requeue_stale(600), 1)
+            self.assertEqual(claim_job("w2"), job_id)
+            # The lost worker can no longer finish the job
+            complete_job(db.session.get(Job, job_id), "dead-worker", {"late": True})
+            job = db.session.get(Job, job_id)
+            self.assertEqual((job.status, job.locked_by, job.attempts), ("running", "w2", 2))
+
+class TestParallelWorkers(JobTestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.database_uri = f"sqlite:///{self.path}"
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.path)
+
+    def test_workers_drain_the_queue_once_each(self):
+        with self.app.app_context():
+            for n in range(40):
+                enqueue("tests.record", {"name": f"job{n}", "sleep": 0.005}, commit=False)
+            db.session.commit()
+
+        workers = [Worker(self.app, name=f"w{n}") for n in range(4)]
+        processed = Counter()
+        threads = [threading.Thread(target=lambda w=w: processed.update({w.name: w.run(burst=True)}))
+                   for w in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(processed.values()), 40)
+        self.assertGreater(len([n for n in processed.values() if n]), 1)
+        self.assertEqual(set(CALLS.values()), {1})
+        with self.app.app_context():
+            self.assertEqual(Job.query.filter_by(status="succeeded").count(), 40)
+
+class TestJobsApi(JobTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            roles = {name: Role(name=name) for name in ("admin", "student")}
+            db.session.add_all(roles.values())
+            db.session.flush()
+            admin = self.create_user("admin", roles["admin"])
+            student_user = self.create_user("student", roles["student"])
+            student = Student(user_id=student_user, register_number="REG001", admission_year=2024)
+            db.session.add(student)
+            db.session.flush()
+            account = PlatformAccount(student_id=student.id, platform_name="leetcode", username="lc")
+            db.session.add(account)
+            db.session.commit()
+            self.account_id = account.id
+            self.admin = {"Authorization": f"Bearer {create_access_token(identity=admin)}"}
+            self.student = {"Authorization": f"Bearer {create_access_token(identity=student_user)}"}
+
+    def create_user(self, name, role):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name.title())
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserRole(user_id=user.id, role_id=role.id))
+        return user.id
+
+    def test_admin_queues_inspects_and_cancels_jobs(self):
+        response = self.client.post("/jobs", json={"task": "tests.record", "payload": {"name": "api"},
+                                                   "priority": 5, "delay_seconds": 60}, headers=self.admin)
+        self.assertEqual(response.status_code, 202)
+        job = response.get_json()["data"]
+        self.assertEqual((job["status"], job["priority"]), ("queued", 5))
+
+        response = self.client.get(f"/jobs/{job['id']}", headers=self.admin)
+        self.assertEqual(response.get_json()["data"]["task"], "tests.record")
+
+        listing = self.client.get("/jobs?status=queued", headers=self.admin).get_json()["data"]
+        self.assertEqual([j["id"] for j in listing["jobs"]], [job["id"]])
+        self.assertEqual(listing["counts"]["queued"], 1)
+
+        self.assertEqual(self.client.post(f"/jobs/{job['id']}/cancel", headers=self.admin).status_code, 200)
+        self.assertEqual(self.client.post(f"/jobs/{job['id']}/cancel", headers=self.admin).status_code, 409)
+
+    def test_validation_and_access(self):
+        self.assertEqual(self.client.post("/jobs", json={"task": "tests.missing"}, headers=self.admin).status_code, 400)
+        self.assertEqual(self.client.post("/jobs", json={"task": "tests.record", "priority": "high"},
+                                          headers=self.admin).status_code, 400)
+        self.assertEqual(self.client.post("/jobs", json={"task": "tests.record"}, headers=self.student).status_code, 403)
+        self.assertEqual(self.client.get("/jobs", headers=self.student).status_code, 403)
+
+    def test_deleted_user_token_gets_not_found(self):
+        job_id = self.client.post("/jobs", json={"task": "tests.record"}, headers=self.admin).get_json()["data"]["id"]
+        with self.app.app_context():
+            ghost = {"Authorization": f"Bearer {create_access_token(identity='deleted-user')}"}
+        self.assertEqual(self.client.get(f"/jobs/{job_id}", headers=ghost).status_code, 404)
+        self.assertEqual(self.client.post(f"/jobs/{job_id}/cancel", headers=ghost).status_code, 404)
+
+    def test_async_bulk_import_runs_in_the_worker(self):
+        csv = f"platform_account_id,total_solved,snapshot_date\n{self.account_id},42,2026-01-05\n{self.account_id},x,2026-01-12\n"
+        response = self.client.post("/snapshots/bulk?async=true", data=csv, content_type="text/csv",
+                                    headers=self.student)
+        self.assertEqual(response.status_code, 202)
+        job_id = response.get_json()["data"]["id"]
+        with self.app.app_context():
+            self.assertEqual(PlatformSnapshot.query.count(), 0)
+
+        self.assertEqual(Worker(self.app).run(burst=True), 1)
+
+        job = self.client.get(f"/jobs/{job_id}", headers=self.student).get_json()["data"]
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["result"]["summary"], {"created": 1, "updated": 0, "skipped": 0, "error": 1})
+        self.assertEqual(self.client.get(f"/jobs/{job_id}", headers=self.admin).status_code, 200)
+        with self.app.app_context():
+            self.assertEqual(PlatformSnapshot.query.one().total_solved, 42)
+
+if __name__ == "__main__":
+    unittest.main()
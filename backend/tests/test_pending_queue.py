@@ -0,0 +1,116 @@
+import unittest
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.students.models import Student, StudentCounsellor
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+
+class TestPendingQueue(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null"
+        })
+        self.client = self.app.test_client()
+        start = date(2026, 1, 5)
+        submitted = datetime(2026, 3, 1, 9, 0)
+
+        with self.app.app_context():
+            db.create_all()
+            roles = {name: Role(name=name) for name in ["student", "counsellor"]}
+            db.session.add_all(roles.values())
+            db.session.flush()
+            counsellor = self.create_user("counsellor", roles["counsellor"])
+            other = self.create_user("other", roles["counsellor"])
+
+            self.expected = []  # pending ids, newest submission first
+            for n in range(7):
+                student = Student(user_id=self.create_user(f"student{n}", roles["student"]),
+                                  register_number=f"REG{n:03d}", admission_year=2024)
+                db.session.add(student)
+                db.session.flush()
+                db.session.add(StudentCounsellor(student_id=student.id,
+                                                 counsellor_user_id=other if n == 6 else counsellor))
+                account = PlatformAccount(student_id=student.id, platform_name="leetcode", username=f"lc{n}")
+                db.session.add(account)
+                db.session.flush()
+                # Student n has n approved weeks, then one pending week; 3 shares a submission time with 2
+                for k in range(n):
+                    db.session.add(PlatformSnapshot(platform_account_id=account.id, total_solved=10 * (k + 1),
+                                                    contest_rating=1400 + k, snapshot_date=start + timedelta(weeks=k),
+                                                    status="approved"))
+                pending = PlatformSnapshot(platform_account_id=account.id, total_solved=10 * n + 7,
+                                           snapshot_date=start + timedelta(weeks=n), status="pending",
+                                           created_at=submitted + timedelta(hours=2 if n == 3 else n))
+                db.session.add(pending)
+                db.session.flush()
+                if n < 6:
+                    self.expected.append((pending.created_at, pending.id, n))
+            db.session.commit()
+            self.expected = [row[1:] for row in sorted(self.expected, reverse=True)]
+            self.headers = {"Authorization": f"Bearer {create_access_token(identity=counsellor)}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, name, role):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name.title())
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserRole(user_id=user.id, role_id=role.id))
+        return user.id
+
+    def get(self, query=""):
+        with self.app.app_context():
+            engine = db.engine
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = self.client.get(f"/counsellor/pending-snapshots{query}", headers=self.headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        return response, len(statements)
+
+    def test_keyset_pages_cover_queue_once(self):
+        seen, cursor, query_counts = [], None, []
+        while True:
+            response, queries = self.get(f"?limit=2&cursor={cursor}" if cursor else "?limit=2")
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()["data"]
+            self.assertEqual(data["total"], 6)
+            seen += [s["snapshot_id"] for s in data["snapshots"]]
+            query_counts.append(queries)
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, [snapshot_id for snapshot_id, _ in self.expected])
+        self.assertEqual(len(set(query_counts)), 1)
+
+    def test_rows_include_previous_approved_values(self):
+        response, _ = self.get("?paginate=false")
+        rows = {row["snapshot_id"]: row for row in response.get_json()["data"]}
+        self.assertEqual(len(rows), 6)
+        for snapshot_id, n in self.expected:
+            row = rows[snapshot_id]
+            if n == 0:
+                self.assertIsNone(row["previous_total_solved"])
+                self.assertIsNone(row["previous_snapshot_date"])
+            else:
+                self.assertEqual((row["previous_total_solved"], row["previous_contest_rating"]),
+                                 (10 * n, 1400 + n - 1))
+                self.assertEqual(row["total_solved"] - row["previous_total_solved"], 7)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.get("?cursor=not-a-cursor")[0].status_code, 400)
+        self.assertEqual(self.get("?limit=0")[0].status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
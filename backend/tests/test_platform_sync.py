@@ -0,0 +1,240 @@
+import time
+import asyncio
+import threading
+import unittest
+from collections import Counter, defaultdict
+from datetime import date
+from aiohttp import web
+from app import create_app, db
+from app.auth.models import User
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.platforms.routes import ALLOWED_PLATFORMS
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.models import PlatformAccountStats
+from app.sync.adapters import ADAPTERS
+from app.sync.engine import RateLimiter
+from app.sync.services import sync_accounts
+
+class StubPlatforms:
+    """One local HTTP server imitating the LeetCode, Codeforces and HackerRank APIs"""
+
+    def __init__(self):
+        self.users = {}  # (platform, username) -> solved
+        self.failures = defaultdict(list)  # username -> statuses to return before succeeding
+        self.requests = Counter()
+        self.in_flight = Counter()
+        self.max_in_flight = Counter()
+
+        app = web.Application()
+        app.router.add_post("/graphql", self.leetcode)
+        app.router.add_get("/api/user.info", self.codeforces_info)
+        app.router.add_get("/api/user.status", self.codeforces_status)
+        app.router.add_get("/rest/hackers/{username}/badges", self.hackerrank)
+        self.app = app
+
+    def start(self):
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(self.loop)
+            self.runner = web.AppRunner(self.app)
+            self.loop.run_until_complete(self.runner.setup())
+            site = web.TCPSite(self.runner, "127.0.0.1", 0)
+            self.loop.run_until_complete(site.start())
+            self.port = site._server.sockets[0].getsockname()[1]
+            ready.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=serve, daemon=True)
+        self.thread.start()
+        ready.wait()
+        return f"http://127.0.0.1:{self.port}"
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    async def handle(self, platform, username, respond):
+        self.requests[(platform, username)] += 1
+        self.in_flight[platform] += 1
+        self.max_in_flight[platform] = max(self.max_in_flight[platform], self.in_flight[platform])
+        try:
+            await asyncio.sleep(0.01)
+            if self.failures[username]:
+                status = self.failures[username].pop(0)
+                return web.json_response({}, status=status, headers={"Retry-After": "0"} if status == 429 else None)
+            return respond(self.users.get((platform, username)))
+        finally:
+            self.in_flight[platform] -= 1
+
+    async def leetcode(self, request):
+        username = (await request.json())["variables"]["username"]
+        def respond(solved):
+            if solved is None:
+                return web.json_response({"data": {"matchedUser": None, "userContestRanking": None}})
+            return web.json_response({"data": {
+                "matchedUser": {"profile": {"ranking": 90000},
+                                "submitStats": {"acSubmissionNum": [{"difficulty": "All", "count": solved},
+                                                                    {"difficulty": "Easy", "count": solved // 2}]}},
+                "userContestRanking": {"rating": 1650.4, "globalRanking": 12000}
+            }})
+        return await self.handle("leetcode", username, respond)
+
+    async def codeforces_info(self, request):
+        def respond(solved):
+            if solved is None:
+                return web.json_response({"status": "FAILED", "comment": "handles: not found"}, status=400)
+            return web.json_response({"status": "OK", "result": [{"rating": 1420}]})
+        return await self.handle("codeforces", request.query["handles"], respond)
+
+    async def codeforces_status(self, request):
+        def respond(solved):
+            submissions = [{"problem": {"contestId": 1000 + i, "index": "A"}, "verdict": "OK"} for i in range(solved)]
+            submissions += [{"problem": {"contestId": 1000, "index": "A"}, "verdict": "OK"},
+                            {"problem": {"contestId": 1, "index": "B"}, "verdict": "WRONG_ANSWER"}]
+            return web.json_response({"status": "OK", "result": submissions})
+        return await self.handle("codeforces", request.query["handle"], respond)
+
+    async def hackerrank(self, request):
+        def respond(solved):
+            if solved is None:
+                return web.json_response({"models": []}, status=404)
+            return web.json_response({"models": [{"badge_name": "Python", "solved": solved - 2},
+                                                 {"badge_name": "SQL", "solved": 2}]})
+        return await self.handle("hackerrank", request.match_info["username"], respond)
+
+class TestPlatformSync(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = StubPlatforms()
+        cls.base_url = cls.stub.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+
+    def setUp(self):
+        self.stub.users.clear()
+        self.stub.failures.clear()
+        self.stub.requests.clear()
+        self.stub.max_in_flight.clear()
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null",
+            "SYNC_BATCH_SIZE": 7,
+            "SYNC_BACKOFF_SECONDS": 0.01,
+            "SYNC_MAX_RETRIES": 2,
+            "SYNC_PLATFORMS": {
+                "leetcode": {"base_url": self.base_url, "concurrency": 5, "rate": 1000},
+                "codeforces": {"base_url": self.base_url + "/api", "concurrency": 2, "rate": 1000},
+                "hackerrank": {"base_url": self.base_url, "rate": 1000}
+            }
+        })
+
+        with self.app.app_context():
+            db.create_all()
+            self.accounts = {}
+            for n in range(12):
+                user = User(email=f"student{n}@test.com", password_hash="!", full_name=f"Student {n}")
+                db.session.add(user)
+                db.session.flush()
+                student = Student(user_id=user.id, register_number=f"REG{n:03d}", admission_year=2024)
+                db.session.add(student)
+                db.session.flush()
+                for platform in ALLOWED_PLATFORMS:
+                    username = f"{platform}_{n}"
+                    account = PlatformAccount(student_id=student.id, platform_name=platform, username=username)
+                    db.session.add(account)
+                    db.session.flush()
+                    self.accounts[(platform, n)] = account.id
+                    if n != 11:
+                        self.stub.users[(platform, username)] = 10 + n
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def snapshot(self, platform, n):
+        return PlatformSnapshot.query.filter_by(platform_account_id=self.accounts[(platform, n)]).one_or_none()
+
+    def test_every_allowed_platform_but_github_has_an_adapter(self):
+        # GitHub has no solve count to store as total_solved
+        self.assertEqual(set(ADAPTERS), set(ALLOWED_PLATFORMS) - {"github"})
+
+    def test_sync_writes_snapshots_under_platform_limits(self):
+        with self.app.app_context():
+            summary = sync_accounts()
+            self.assertEqual(summary, {"accounts": 36, "ok": 33, "not_found": 3, "failed": 0, "written": 33})
+
+            leetcode = self.snapshot("leetcode", 3)
+            self.assertEqual((leetcode.total_solved, leetcode.contest_rating, leetcode.global_rank), (13, 1650, 12000))
+            self.assertEqual((leetcode.status, leetcode.snapshot_date), ("approved", date.today()))
+            # Duplicate accepted submissions of one problem count once
+            self.assertEqual((self.snapshot("codeforces", 3).total_solved, self.snapshot("codeforces", 3).contest_rating),
+                             (13, 1420))
+            self.assertEqual(self.snapshot("hackerrank", 3).total_solved, 13)
+            self.assertIsNone(self.snapshot("hackerrank", 11))
+            self.assertIsNone(self.snapshot("github", 3))
+
+            stats = db.session.get(PlatformAccountStats, self.accounts[("leetcode", 5)])
+            self.assertEqual(stats.latest_total_solved, 15)
+
+        self.assertEqual(self.stub.max_in_flight["codeforces"], 2)
+        self.assertGreater(self.stub.max_in_flight["leetcode"], 1)
+        self.assertLessEqual(self.stub.max_in_flight["leetcode"], 5)
+
+    def test_retries_with_backoff_then_gives_up(self):
+        self.stub.failures["hackerrank_1"] = [429, 503]
+        self.stub.failures["leetcode_2"] = [500, 500, 500]
+        with self.app.app_context():
+            summary = sync_accounts(platforms=["hackerrank", "leetcode"])
+            self.assertEqual((summary["ok"], summary["failed"]), (21, 1))
+            self.assertEqual(self.snapshot("hackerrank", 1).total_solved, 11)
+            self.assertIsNone(self.snapshot("leetcode", 2))
+        self.assertEqual(self.stub.requests[("hackerrank", "hackerrank_1")], 3)
+        self.assertEqual(self.stub.requests[("leetcode", "leetcode_2")], 3)
+
+    def test_resync_overwrites_unreviewed_synced_snapshots_only(self):
+        with self.app.app_context():
+            sync_accounts(platforms=["hackerrank"])
+            reviewed = self.snapshot("hackerrank", 0)
+            reviewed.reviewed_by = db.session.query(User.id).first()[0]
+            # The student's own submissions for today, one still pending
+            db.session.add_all([
+                PlatformSnapshot(platform_account_id=self.accounts[("hackerrank", 11)], total_solved=7,
+                                 snapshot_date=date.today(), status="pending"),
+                PlatformSnapshot(platform_account_id=self.accounts[("leetcode", 0)], total_solved=8,
+                                 snapshot_date=date.today(), status="approved")
+            ])
+            db.session.commit()
+
+            for n in range(12):
+                self.stub.users[("hackerrank", f"hackerrank_{n}")] = 50
+            summary = sync_accounts(platforms=["hackerrank"])
+            self.assertEqual(summary["written"], 10)
+            self.assertEqual(self.snapshot("hackerrank", 0).total_solved, 10)
+            self.assertEqual(self.snapshot("hackerrank", 1).total_solved, 50)
+            pending = self.snapshot("hackerrank", 11)
+            self.assertEqual((pending.total_solved, pending.status), (7, "pending"))
+
+            sync_accounts(platforms=["leetcode"], account_ids=[self.accounts[("leetcode", 0)]])
+            self.assertEqual(self.snapshot("leetcode", 0).total_solved, 8)
+            self.assertEqual(PlatformSnapshot.query.count(), 13)
+
+    def test_rate_limiter_spaces_requests(self):
+        async def acquire_all():
+            limiter = RateLimiter(50)
+            start = time.monotonic()
+            await asyncio.gather(*(limiter.acquire() for _ in range(6)))
+            return time.monotonic() - start
+        self.assertGreaterEqual(asyncio.run(acquire_all()), 0.09)
+
+if __name__ == "__main__":
+    unittest.main()
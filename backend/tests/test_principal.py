@@ -0,0 +1,105 @@
+import unittest
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.academics.models import Department
+from app.staff.models import StaffProfile
+from app.common.principal import load_principal
+from app.common.utils import hash_password, is_hod, is_advisor
+
+class TestPrincipal(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "JWT_PRINCIPAL_CLAIMS": True,
+            "CACHE_TYPE": "null"
+        })
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            roles = {name: Role(name=name) for name in ["admin", "hod", "advisor", "counsellor", "student"]}
+            db.session.add_all(roles.values())
+            self.hod_id = self.create_user("hod", [roles["hod"], roles["advisor"]])
+            self.counsellor_id = self.create_user("counsellor", [roles["counsellor"]])
+            department = Department(name="Computer Science", code="CSE", hod_id=self.hod_id)
+            db.session.add(department)
+            db.session.flush()
+            self.department_id = department.id
+            db.session.add(StaffProfile(user_id=self.counsellor_id, department_id=department.id, role_type="counsellor"))
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, name, roles):
+        user = User(email=f"{name}@test.com", password_hash=hash_password("secret"), full_name=name.title())
+        db.session.add(user)
+        db.session.flush()
+        for role in roles:
+            db.session.add(UserRole(user_id=user.id, role_id=role.id))
+        return user.id
+
+    def capture(self, fn):
+        with self.app.app_context():
+            engine = db.engine
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            result = fn()
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        return result, statements
+
+    def login(self, name):
+        response = self.client.post("/auth/login", json={"email": f"{name}@test.com", "password": "secret"})
+        return {"Authorization": f"Bearer {response.get_json()['data']['access_token']}"}
+
+    def test_principal_loads_in_one_query_and_is_cached(self):
+        with self.app.test_request_context():
+            principal, statements = self.capture(lambda: load_principal(self.counsellor_id))
+            self.assertEqual(len(statements), 1)
+            self.assertEqual(principal.role_names, {"counsellor"})
+            self.assertEqual(principal.staff_department_id, self.department_id)
+            self.assertEqual(principal.staff_department_name, "Computer Science")
+
+            hod, statements = self.capture(lambda: [load_principal(self.hod_id), load_principal(self.hod_id)][0])
+            self.assertEqual(len(statements), 1)
+            self.assertTrue(is_hod(hod, self.department_id))
+            self.assertFalse(is_hod(hod, "another-department"))
+            self.assertTrue(is_advisor(hod))
+
+    def test_read_endpoint_trusts_claims(self):
+        headers = self.login("counsellor")
+        response, statements = self.capture(lambda: self.client.get("/analytics/counsellor/summary", headers=headers))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["data"]["department_name"], "Computer Science")
+        self.assertFalse(any("user_roles" in s for s in statements))
+
+    def test_mutating_endpoint_reloads_roles(self):
+        headers = self.login("hod")
+        with self.app.app_context():
+            UserRole.query.filter_by(user_id=self.hod_id).delete()
+            db.session.commit()
+
+        # Token still claims the hod role; GETs honour it until the next login
+        self.assertEqual(self.client.get("/students/all", headers=headers).status_code, 200)
+        response = self.client.post("/staff/assign-advisor", headers=headers,
+                                    json={"advisor_id": self.hod_id, "student_ids": ["x"]})
+        self.assertEqual(response.status_code, 403)
+
+    def test_token_without_claims_falls_back_to_lookup(self):
+        with self.app.app_context():
+            headers = {"Authorization": f"Bearer {create_access_token(identity=self.counsellor_id)}"}
+        response = self.client.get("/analytics/counsellor/summary", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["data"]["department_name"], "Computer Science")
+
+if __name__ == "__main__":
+    unittest.main()
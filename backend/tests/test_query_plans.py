@@ -0,0 +1,140 @@
+import re
+import unittest
+from datetime import date, timedelta
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.academics.models import Department
+from app.students.models import Student, StudentAdvisor, StudentCounsellor
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.services import (
+    rebuild_account_stats,
+    refresh_account_stats,
+    refresh_department_daily_stats,
+    compute_department_daily_stats,
+    get_student_metrics
+)
+from app.analytics.risk import evaluate_at_risk
+from app.analytics.timeseries import growth_series
+
+START = date(2025, 1, 1)
+SEQUENTIAL_SCAN = re.compile(r"\bSCAN platform_snapshots\b")
+
+class TestSnapshotQueryPlans(unittest.TestCase):
+    """EXPLAIN every statement that reads platform_snapshots; none may scan the whole table"""
+
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null"
+        })
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            roles = {name: Role(name=name) for name in ["admin", "advisor", "counsellor", "student"]}
+            db.session.add_all(roles.values())
+            department = Department(name="Computer Science", code="CSE")
+            db.session.add(department)
+            db.session.flush()
+            self.department_id = department.id
+
+            self.user_ids = {name: self.create_user(name, roles[name]) for name in ["admin", "advisor", "counsellor"]}
+            self.account_ids = []
+            for n in range(20):
+                user_id = self.create_user(f"student{n}", roles["student"])
+                student = Student(user_id=user_id, register_number=f"REG{n:03d}", admission_year=2024, department_id=department.id)
+                db.session.add(student)
+                db.session.flush()
+                db.session.add(StudentAdvisor(student_id=student.id, advisor_user_id=self.user_ids["advisor"]))
+                db.session.add(StudentCounsellor(student_id=student.id, counsellor_user_id=self.user_ids["counsellor"]))
+                for platform_name in ["leetcode", "codeforces"]:
+                    account = PlatformAccount(student_id=student.id, platform_name=platform_name, username=f"u{n}")
+                    db.session.add(account)
+                    db.session.flush()
+                    self.account_ids.append(account.id)
+                    for day in range(15):
+                        db.session.add(PlatformSnapshot(
+                            platform_account_id=account.id,
+                            total_solved=day * 3,
+                            contest_rating=1400 + day,
+                            snapshot_date=START + timedelta(days=day),
+                            status="approved" if day < 14 else "pending"
+                        ))
+            self.student_id = student.id
+            self.user_ids["student"] = user_id
+            db.session.commit()
+            rebuild_account_stats()
+            self.engine = db.engine
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, name, role):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name)
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserRole(user_id=user.id, role_id=role.id))
+        return user.id
+
+    def capture(self):
+        statements = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            if "platform_snapshots" in statement and not executemany and not statement.startswith("EXPLAIN"):
+                statements.append((statement, parameters))
+
+        event.listen(self.engine, "before_cursor_execute", listener)
+        self.addCleanup(event.remove, self.engine, "before_cursor_execute", listener)
+        return statements
+
+    def assert_no_sequential_scans(self, statements):
+        self.assertTrue(statements)
+        with self.engine.connect() as conn:
+            for statement, parameters in statements:
+                plan = "\n".join(row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+                self.assertIsNone(SEQUENTIAL_SCAN.search(plan), f"{statement}\n{plan}")
+
+    def test_service_queries(self):
+        statements = self.capture()
+        with self.app.app_context():
+            refresh_account_stats(self.account_ids[:2])
+            refresh_department_daily_stats([self.department_id], since=START + timedelta(days=10))
+            db.session.rollback()
+            compute_department_daily_stats(self.department_id, START + timedelta(days=5), START + timedelta(days=14))
+            evaluate_at_risk()
+            get_student_metrics([self.student_id])
+            for interval in ["week", "month"]:
+                growth_series("account", self.account_ids[0], interval, START, START + timedelta(days=14))
+                growth_series("student", self.student_id, interval, START, START + timedelta(days=14))
+                growth_series("department", self.department_id, interval, START + timedelta(days=7), START + timedelta(days=14))
+        self.assert_no_sequential_scans(statements)
+
+    def test_endpoint_queries(self):
+        with self.app.app_context():
+            tokens = {role: create_access_token(identity=user_id) for role, user_id in self.user_ids.items()}
+
+        statements = self.capture()
+        for url, role in [
+            ("/counsellor/pending-snapshots", "counsellor"),
+            ("/analytics/counsellor/summary", "counsellor"),
+            ("/analytics/counsellor/at-risk", "counsellor"),
+            ("/analytics/advisor/my-students", "advisor"),
+            ("/analytics/my-summary", "student"),
+            (f"/analytics/timeseries/department/{self.department_id}?from=2025-01-06&to=2025-01-15", "admin"),
+            (f"/analytics/department/{self.department_id}/leaderboard", "admin"),
+            ("/analytics/top-performers?partition=department", "admin"),
+            ("/analytics/at-risk", "admin")
+        ]:
+            response = self.client.get(url, headers={"Authorization": f"Bearer {tokens[role]}"})
+            self.assertEqual(response.status_code, 200, url)
+        self.assert_no_sequential_scans(statements)
+
+if __name__ == "__main__":
+    unittest.main()
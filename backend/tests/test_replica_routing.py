@@ -0,0 +1,110 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from sqlalchemy.orm import Session
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.academics.models import Department
+from app.common.replicas import replica_router
+
+class TestReplicaRouting(unittest.TestCase):
+    """Two SQLite files stand in for the primary and a lagging replica"""
+
+    cache_type = "null"
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(self.workdir, 'primary.db')}",
+            "SQLALCHEMY_REPLICA_URIS": [f"sqlite:///{os.path.join(self.workdir, 'replica.db')}"],
+            "REPLICA_STICKY_SECONDS": 1,
+            "REDIS_URL": None,
+            "CACHE_TYPE": self.cache_type,
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length"
+        })
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            replica = self.app.extensions["replica_router"]["replicas"][0]
+            db.metadata.create_all(replica)
+            # Same users on both; the replica has departments the primary lacks
+            self.seed(db.engine, ["CSE"])
+            self.seed(replica, ["CSE", "ECE", "MECH"])
+            self.headers = {"Authorization": f"Bearer {create_access_token(identity='admin-1')}"}
+            self.other_headers = {"Authorization": f"Bearer {create_access_token(identity='admin-2')}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+            replica_router.dispose()
+        shutil.rmtree(self.workdir)
+
+    def seed(self, engine, codes):
+        with Session(engine) as session:
+            session.add(Role(id=1, name="admin"))
+            for user_id in ["admin-1", "admin-2"]:
+                session.add(User(id=user_id, email=f"{user_id}@test.com", password_hash="!", full_name=user_id))
+                session.add(UserRole(user_id=user_id, role_id=1))
+            session.add_all([Department(name=code, code=code) for code in codes])
+            session.commit()
+
+    def department_count(self, headers):
+        response = self.client.get("/analytics/institution-summary", headers=headers)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response.get_json()["data"]["total_departments"]
+
+    def test_read_only_blueprint_reads_replica(self):
+        self.assertEqual(self.department_count(self.headers), 3)
+
+    def test_other_blueprints_read_primary(self):
+        response = self.client.get("/academics/departments", headers=self.headers)
+        self.assertEqual(len(response.get_json()["data"]), 1)
+
+    def test_writes_go_to_primary_and_pin_the_writer(self):
+        response = self.client.post("/academics/departments", headers=self.headers,
+                                    json={"name": "Civil", "code": "CIVIL"})
+        self.assertEqual(response.status_code, 201, response.get_json())
+
+        # The writer reads their own write; everyone else stays on the replica
+        self.assertEqual(self.department_count(self.headers), 2)
+        self.assertEqual(self.department_count(self.other_headers), 3)
+
+        time.sleep(1.1)
+        self.assertEqual(self.department_count(self.headers), 3)
+
+class TestReplicaRoutingWithCache(TestReplicaRouting):
+    cache_type = "memory"
+
+    def test_cache_miss_after_invalidation_reads_primary(self):
+        self.assertEqual(self.department_count(self.other_headers), 3)
+
+        response = self.client.post("/academics/departments", headers=self.headers,
+                                    json={"name": "Civil", "code": "CIVIL"})
+        self.assertEqual(response.status_code, 201, response.get_json())
+
+        # Not pinned, but the bumped tag sends the miss to the primary
+        self.assertEqual(self.department_count(self.other_headers), 2)
+
+        # The primary's answer is what got cached, even once the window ends
+        time.sleep(1.1)
+        response = self.client.get("/analytics/institution-summary", headers=self.other_headers)
+        self.assertEqual(response.headers["X-Cache"], "HIT")
+        self.assertEqual(response.get_json()["data"]["total_departments"], 2)
+
+    def test_writes_go_to_primary_and_pin_the_writer(self):
+        response = self.client.post("/academics/departments", headers=self.headers,
+                                    json={"name": "Civil", "code": "CIVIL"})
+        self.assertEqual(response.status_code, 201, response.get_json())
+
+        # Misses on the bumped tag read the primary for everyone, not just the writer
+        self.assertEqual(self.department_count(self.headers), 2)
+        self.assertEqual(self.department_count(self.other_headers), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import time
+import unittest
+from datetime import date
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.academics.models import Department
+from app.students.models import Student, StudentAdvisor, StudentCounsellor
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.common.cache import MemoryBackend, response_cache
+
+class TestMemoryBackend(unittest.TestCase):
+    def test_lru_eviction_and_ttl(self):
+        backend = MemoryBackend(max_entries=2)
+        backend.store("a", "1", 60)
+        backend.store("b", "2", 60)
+        backend.lookup("a", [])
+        backend.store("c", "3", 60)
+        self.assertEqual(backend.lookup("a", [])[0], "1")
+        self.assertIsNone(backend.lookup("b", [])[0])
+
+        backend.store("d", "4", -1)
+        self.assertIsNone(backend.lookup("d", [])[0])
+
+    def test_tag_versions(self):
+        backend = MemoryBackend()
+        self.assertEqual(backend.lookup("a", ["t1", "t2"])[1], [0, 0])
+        backend.bump(["t2"])
+        self.assertEqual(backend.lookup("a", ["t1", "t2"])[1], [0, 1])
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "memory"
+        })
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            roles = {name: Role(name=name) for name in ["admin", "advisor", "counsellor", "student"]}
+            db.session.add_all(roles.values())
+            cse = Department(name="Computer Science", code="CSE")
+            ece = Department(name="Electronics", code="ECE")
+            db.session.add_all([cse, ece])
+
+            admin_id = self.create_user("admin", roles["admin"])
+            advisor_id = self.create_user("advisor", roles["advisor"])
+            self.other_advisor_id = self.create_user("advisor2", roles["advisor"])
+            counsellor_id = self.counsellor_id = self.create_user("counsellor", roles["counsellor"])
+            student_user_id = self.create_user("student", roles["student"])
+            db.session.flush()
+            self.cse_id, self.ece_id = cse.id, ece.id
+
+            student = Student(user_id=student_user_id, register_number="REG001", admission_year=2024, department_id=cse.id)
+            db.session.add(student)
+            db.session.flush()
+            self.student_id = student.id
+            db.session.add(StudentAdvisor(student_id=student.id, advisor_user_id=advisor_id))
+            db.session.add(StudentCounsellor(student_id=student.id, counsellor_user_id=counsellor_id))
+
+            account = PlatformAccount(student_id=student.id, platform_name="leetcode", username="student")
+            db.session.add(account)
+            db.session.flush()
+            snapshot = PlatformSnapshot(platform_account_id=account.id, total_solved=50, snapshot_date=date.today(), status="pending")
+            db.session.add(snapshot)
+            db.session.commit()
+            self.snapshot_id = snapshot.id
+
+            self.headers = {
+                name: {"Authorization": f"Bearer {create_access_token(identity=user_id)}"}
+                for name, user_id in [
+                    ("admin", admin_id), ("advisor", advisor_id), ("advisor2", self.other_advisor_id),
+                    ("counsellor", counsellor_id), ("student", student_user_id)
+                ]
+            }
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, name, role):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name.title())
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserRole(user_id=user.id, role_id=role.id))
+        return user.id
+
+    def get(self, url, role):
+        response = self.client.get(url, headers=self.headers[role])
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response
+
+    def test_hit_after_miss_and_per_caller_keys(self):
+        first = self.get("/analytics/institution-summary", "admin")
+        second = self.get("/analytics/institution-summary", "admin")
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(first.get_json(), second.get_json())
+
+        # A different caller does not share the entry
+        self.assertEqual(self.get("/analytics/institution-summary", "counsellor").headers["X-Cache"], "MISS")
+
+        # Errors are not cached
+        self.assertEqual(self.client.get("/analytics/institution-summary", headers=self.headers["student"]).status_code, 403)
+        self.assertNotIn("X-Cache", self.client.get("/analytics/cache-stats", headers=self.headers["student"]).headers)
+
+        stats = self.get("/analytics/cache-stats", "admin").get_json()["data"]
+        self.assertEqual(stats["backend"], "memory")
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 3)
+
+    def test_approval_invalidates_dependent_views(self):
+        urls = [
+            ("/analytics/my-summary", "student"),
+            ("/analytics/counsellor/summary", "counsellor"),
+            ("/analytics/advisor/my-students", "advisor"),
+            (f"/analytics/department/{self.cse_id}/leaderboard", "admin"),
+            ("/analytics/institution-summary", "admin")
+        ]
+        for url, role in urls:
+            self.get(url, role)
+        # Unrelated department stays cached
+        self.get(f"/analytics/department/{self.ece_id}/leaderboard", "admin")
+
+        response = self.client.put(f"/counsellor/snapshots/{self.snapshot_id}/approve", headers=self.headers["counsellor"])
+        self.assertEqual(response.status_code, 200)
+
+        for url, role in urls:
+            response = self.get(url, role)
+            self.assertEqual(response.headers["X-Cache"], "MISS", url)
+        self.assertEqual(self.get("/analytics/counsellor/summary", "counsellor").get_json()["data"]["total_solved"], 50)
+        self.assertEqual(self.get(f"/analytics/department/{self.ece_id}/leaderboard", "admin").headers["X-Cache"], "HIT")
+
+    def test_department_reassignment_invalidates_both_departments(self):
+        for department_id in [self.cse_id, self.ece_id]:
+            self.get(f"/analytics/department/{department_id}/leaderboard", "admin")
+
+        response = self.client.put(
+            f"/students/{self.student_id}/assign-department",
+            json={"department_id": self.ece_id},
+            headers=self.headers["admin"]
+        )
+        self.assertEqual(response.status_code, 200)
+
+        cse = self.get(f"/analytics/department/{self.cse_id}/leaderboard", "admin")
+        ece = self.get(f"/analytics/department/{self.ece_id}/leaderboard", "admin")
+        self.assertEqual((cse.headers["X-Cache"], ece.headers["X-Cache"]), ("MISS", "MISS"))
+        self.assertEqual(cse.get_json()["data"]["total_students"], 0)
+        self.assertEqual(ece.get_json()["data"]["total_students"], 1)
+
+    def test_advisor_reassignment_invalidates_old_and_new_advisor(self):
+        self.assertEqual(len(self.get("/analytics/advisor/my-students", "advisor").get_json()["data"]), 1)
+        self.assertEqual(len(self.get("/analytics/advisor/my-students", "advisor2").get_json()["data"]), 0)
+        self.get(f"/analytics/advisor/student/{self.student_id}", "advisor")
+
+        response = self.client.post(
+            "/staff/assign-advisor",
+            json={"advisor_id": self.other_advisor_id, "student_ids": [self.student_id]},
+            headers=self.headers["admin"]
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(len(self.get("/analytics/advisor/my-students", "advisor").get_json()["data"]), 0)
+        self.assertEqual(len(self.get("/analytics/advisor/my-students", "advisor2").get_json()["data"]), 1)
+        response = self.client.get(f"/analytics/advisor/student/{self.student_id}", headers=self.headers["advisor"])
+        self.assertEqual(response.status_code, 403)
+
+    def test_department_performance_uses_department_tags(self):
+        self.get("/analytics/department-performance", "admin")
+        # Institution-wide bumps (e.g. a student registering without a department) keep it
+        with self.app.test_request_context():
+            response_cache.invalidate("institution")
+        self.assertEqual(self.get("/analytics/department-performance", "admin").headers["X-Cache"], "HIT")
+
+        response = self.client.put(f"/counsellor/snapshots/{self.snapshot_id}/approve", headers=self.headers["counsellor"])
+        self.assertEqual(response.status_code, 200)
+        response = self.get("/analytics/department-performance", "admin")
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+        self.assertEqual(response.get_json()["data"][0]["total_solved"], 50)
+
+        response = self.client.post("/academics/departments", json={"name": "Civil", "code": "CIVIL"},
+                                    headers=self.headers["admin"])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.get("/analytics/department-performance", "admin").headers["X-Cache"], "MISS")
+
+    def test_assignment_invalidates_the_staff_users_views(self):
+        self.get("/analytics/institution-summary", "counsellor")
+        self.get("/analytics/institution-summary", "admin")
+
+        response = self.client.post(
+            "/staff/assign-counsellor",
+            json={"counsellor_id": self.counsellor_id, "student_ids": [self.student_id]},
+            headers=self.headers["admin"]
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.get("/analytics/institution-summary", "counsellor").headers["X-Cache"], "MISS")
+        self.assertEqual(self.get("/analytics/institution-summary", "admin").headers["X-Cache"], "HIT")
+
+    def test_ttl_expiry(self):
+        self.app.config["CACHE_DEFAULT_TIMEOUT"] = 0.05
+        self.get("/analytics/my-summary", "student")
+        time.sleep(0.1)
+        self.assertEqual(self.get("/analytics/my-summary", "student").headers["X-Cache"], "MISS")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from datetime import date
+import numpy as np
+from app import create_app, db
+from app.auth.models import User
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.academics.models import Department
+from app.analytics.models import DepartmentDailyStats
+from scripts.seeds import snapshots as snapshot_seed
+from scripts.seeds.growth import generate_snapshots, ensure_accounts, growth_curves
+
+START = date(2024, 1, 1)
+END = date(2025, 12, 31)
+
+class TestSnapshotGenerator(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null"
+        })
+        with self.app.app_context():
+            db.create_all()
+            for n in range(12):
+                user = User(email=f"student{n}@test.com", password_hash="!", full_name=f"Student {n}")
+                db.session.add(user)
+                db.session.flush()
+                db.session.add(Student(user_id=user.id, register_number=f"REG{n:03d}", admission_year=2024))
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def values(self):
+        rows = db.session.query(Student.register_number, PlatformAccount.platform_name, PlatformSnapshot.snapshot_date,
+                                PlatformSnapshot.total_solved, PlatformSnapshot.contest_rating, PlatformSnapshot.status)\
+            .join(PlatformAccount, PlatformSnapshot.platform_account_id == PlatformAccount.id)\
+            .join(Student, PlatformAccount.student_id == Student.id)\
+            .order_by(Student.register_number, PlatformAccount.platform_name, PlatformSnapshot.snapshot_date).all()
+        return [tuple(r) for r in rows]
+
+    def test_growth_curves_are_monotonic_and_bounded(self):
+        solved, rating, rank, rated = growth_curves(np.random.default_rng(1), 500, 104, 7)
+        self.assertEqual(solved.shape, (500, 104))
+        self.assertTrue((np.diff(solved, axis=1) >= 0).all())
+        self.assertTrue(((rating >= 800) & (rating <= 3500)).all())
+        self.assertTrue((rank >= 1).all())
+        self.assertTrue(0 < rated.mean() < 1)
+
+    def test_all_accounts_in_chunks_deterministic_under_seed(self):
+        with self.app.app_context():
+            self.assertEqual(ensure_accounts(db, ["LeetCode", "Codeforces"]), 24)
+            self.assertEqual(ensure_accounts(db, ["LeetCode", "Codeforces"]), 0)
+            accounts, written = generate_snapshots(db, START, END, interval="weekly", seed=7,
+                                                   pending_ratio=0.5, chunk_rows=500)
+            self.assertEqual((accounts, written), (24, 24 * 105))
+            first = self.values()
+
+            pending = [r for r in first if r[5] == "pending"]
+            self.assertTrue(0 < len(pending) < 24)
+            self.assertTrue(all(r[2] == date(2025, 12, 29) for r in pending))
+
+            # Accounts already holding snapshots in the range are skipped
+            self.assertEqual(generate_snapshots(db, START, END, seed=7, chunk_rows=500), (0, 0))
+
+            PlatformSnapshot.query.delete()
+            db.session.commit()
+            generate_snapshots(db, START, END, interval="weekly", seed=7, pending_ratio=0.5, chunk_rows=500)
+            self.assertEqual(self.values(), first)
+
+            PlatformSnapshot.query.delete()
+            db.session.commit()
+            generate_snapshots(db, START, END, interval="weekly", seed=8, pending_ratio=0.5, chunk_rows=500)
+            self.assertNotEqual(self.values(), first)
+
+    def test_daily_interval_and_student_limit(self):
+        with self.app.app_context():
+            ensure_accounts(db, ["LeetCode"], students=5)
+            accounts, written = generate_snapshots(db, date(2025, 1, 1), date(2025, 3, 31), interval="daily")
+            self.assertEqual((accounts, written), (5, 5 * 90))
+            self.assertEqual(PlatformSnapshot.query.filter_by(status="approved").count(), 450)
+
+    def test_seed_backfills_department_rollups(self):
+        with self.app.app_context():
+            department = Department(name="Computer Science", code="CSE")
+            db.session.add(department)
+            db.session.flush()
+            Student.query.update({Student.department_id: department.id})
+            db.session.commit()
+
+            snapshot_seed.run(self.app, db, days=28)
+
+            rows = DepartmentDailyStats.query.filter_by(department_id=department.id)\
+                .order_by(DepartmentDailyStats.stat_date).all()
+            self.assertEqual(len(rows), 29)
+            self.assertEqual(rows[-1].stat_date, date.today())
+            self.assertEqual((rows[-1].student_count, rows[-1].linked_accounts), (12, 36))
+            self.assertGreater(rows[-1].total_solved, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import unittest
+from datetime import date
+from sqlalchemy import text
+from app import create_app, db
+from app.auth.models import User
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.snapshots.partitions import (
+    partition_ranges,
+    partition_start,
+    partition_end,
+    is_partitioned,
+    list_partitions,
+    create_snapshot_partitions,
+    detach_snapshot_partitions
+)
+
+# An empty, disposable Postgres database; every table in it is dropped afterwards
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+class TestSnapshotPartitions(unittest.TestCase):
+    def test_monthly_ranges(self):
+        self.assertEqual(list(partition_ranges(date(2024, 11, 20), date(2025, 1, 1), "month")), [
+            ("platform_snapshots_y2024m11", date(2024, 11, 1), date(2024, 12, 1)),
+            ("platform_snapshots_y2024m12", date(2024, 12, 1), date(2025, 1, 1)),
+            ("platform_snapshots_y2025m01", date(2025, 1, 1), date(2025, 2, 1))
+        ])
+
+    def test_yearly_ranges(self):
+        self.assertEqual(list(partition_ranges(date(2024, 3, 1), date(2025, 12, 31), "year")), [
+            ("platform_snapshots_y2024", date(2024, 1, 1), date(2025, 1, 1)),
+            ("platform_snapshots_y2025", date(2025, 1, 1), date(2026, 1, 1))
+        ])
+        self.assertEqual(partition_end(partition_start(date(2025, 12, 31), "month"), "month"), date(2026, 1, 1))
+
+    def test_commands_require_postgres(self):
+        app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
+        with app.app_context():
+            db.create_all()
+            self.assertFalse(is_partitioned())
+
+        result = app.test_cli_runner().invoke(args=["snapshots", "create-partitions"])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("not partitioned", result.output)
+
+@unittest.skipUnless(POSTGRES_URL, "set TEST_POSTGRES_URL to run the Postgres partition tests")
+class TestSnapshotPartitionsPostgres(unittest.TestCase):
+    """Create, attach and detach real partitions; platform_snapshots is built as migration f3a9c2d8b614 does"""
+
+    def setUp(self):
+        self.app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": POSTGRES_URL, "CACHE_TYPE": "null"})
+        self.detached = []
+        with self.app.app_context():
+            db.metadata.create_all(db.engine, tables=[t for t in db.metadata.sorted_tables
+                                                      if t.name != "platform_snapshots"])
+            db.session.execute(text("""
+                CREATE TABLE platform_snapshots (
+                    id VARCHAR(36) NOT NULL,
+                    platform_account_id VARCHAR(36) NOT NULL REFERENCES platform_accounts (id) ON DELETE CASCADE,
+                    total_solved INTEGER NOT NULL,
+                    contest_rating INTEGER,
+                    global_rank INTEGER,
+                    snapshot_date DATE NOT NULL,
+                    created_at TIMESTAMP WITHOUT TIME ZONE,
+                    status VARCHAR(20) NOT NULL,
+                    reviewed_by VARCHAR(36) REFERENCES users (id),
+                    reviewed_at TIMESTAMP WITHOUT TIME ZONE,
+                    remarks TEXT,
+                    PRIMARY KEY (id, snapshot_date),
+                    CONSTRAINT unique_platform_snapshot_date UNIQUE (platform_account_id, snapshot_date)
+                ) PARTITION BY RANGE (snapshot_date)
+            """))
+            db.session.execute(text("CREATE TABLE platform_snapshots_default PARTITION OF platform_snapshots DEFAULT"))
+
+            user = User(email="student@test.com", password_hash="!", full_name="Student")
+            db.session.add(user)
+            db.session.flush()
+            student = Student(user_id=user.id, register_number="REG001", admission_year=2024)
+            db.session.add(student)
+            db.session.flush()
+            account = PlatformAccount(student_id=student.id, platform_name="leetcode", username="lc")
+            db.session.add(account)
+            db.session.commit()
+            self.account_id = account.id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.rollback()
+            for name in self.detached:
+                db.session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            db.session.commit()
+            db.session.remove()
+            # Dropping the parent drops its attached partitions
+            db.drop_all()
+
+    def add_snapshot(self, snapshot_date, solved):
+        db.session.add(PlatformSnapshot(platform_account_id=self.account_id, total_solved=solved,
+                                        snapshot_date=snapshot_date, status="approved"))
+        db.session.commit()
+
+    def locations(self):
+        """{snapshot_date: partition holding it}"""
+        rows = db.session.execute(text("SELECT snapshot_date, tableoid::regclass::text FROM platform_snapshots"))
+        return dict(rows.all())
+
+    def test_create_attach_and_detach(self):
+        with self.app.app_context():
+            self.assertTrue(is_partitioned())
+            # Dates without a partition land in the default one
+            self.add_snapshot(date(2025, 1, 10), 10)
+            self.add_snapshot(date(2025, 2, 10), 20)
+            self.assertEqual(set(self.locations().values()), {"platform_snapshots_default"})
+
+            created = create_snapshot_partitions(date(2025, 1, 1), date(2025, 2, 28))
+            db.session.commit()
+            self.assertEqual(created, ["platform_snapshots_y2025m01", "platform_snapshots_y2025m02"])
+            self.assertEqual([p[0] for p in list_partitions()], created)
+            # Existing rows moved out of the default partition on attach
+            self.assertEqual(self.locations(), {
+                date(2025, 1, 10): "platform_snapshots_y2025m01",
+                date(2025, 2, 10): "platform_snapshots_y2025m02"
+            })
+            self.add_snapshot(date(2025, 1, 20), 15)
+            self.add_snapshot(date(2025, 3, 5), 30)
+            locations = self.locations()
+            self.assertEqual(locations[date(2025, 1, 20)], "platform_snapshots_y2025m01")
+            self.assertEqual(locations[date(2025, 3, 5)], "platform_snapshots_default")
+            self.assertEqual(create_snapshot_partitions(date(2025, 1, 1), date(2025, 2, 28)), [])
+
+            self.detached = detach_snapshot_partitions(date(2025, 2, 1))
+            db.session.commit()
+            self.assertEqual(self.detached, ["platform_snapshots_y2025m01"])
+            self.assertEqual(sorted(self.locations()), [date(2025, 2, 10), date(2025, 3, 5)])
+            # Detached data stays in a standalone table
+            kept = db.session.execute(text("SELECT count(*) FROM platform_snapshots_y2025m01")).scalar()
+            self.assertEqual(kept, 2)
+
+            dropped = detach_snapshot_partitions(date(2025, 3, 1), drop=True)
+            db.session.commit()
+            self.assertEqual(dropped, ["platform_snapshots_y2025m02"])
+            self.assertIsNone(db.session.execute(
+                text("SELECT to_regclass('platform_snapshots_y2025m02')")).scalar())
+
+if __name__ == "__main__":
+    unittest.main()
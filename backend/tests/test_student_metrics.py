@@ -0,0 +1,151 @@
+import unittest
+from datetime import date, timedelta
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.academics.models import Department
+from app.students.models import Student, StudentAdvisor, StudentCounsellor
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.services import rebuild_account_stats, get_student_metrics
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+class TestStudentMetricsService(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null"  # measure the database path
+        })
+        self.client = self.app.test_client()
+        self.student_count = 0
+
+        with self.app.app_context():
+            db.create_all()
+            roles = {name: Role(name=name) for name in ["admin", "advisor", "counsellor", "student"]}
+            db.session.add_all(roles.values())
+
+            self.department = Department(name="Computer Science", code="CSE")
+            db.session.add(self.department)
+
+            self.admin_id = self.create_user("admin", roles["admin"])
+            self.advisor_id = self.create_user("advisor", roles["advisor"])
+            self.counsellor_id = self.create_user("counsellor", roles["counsellor"])
+            self.student_role = roles["student"]
+            db.session.commit()
+            self.department_id = self.department.id
+
+            self.first_student_id, self.first_student_user_id = self.add_students(2)
+            self.tokens = {
+                "admin": create_access_token(identity=self.admin_id),
+                "advisor": create_access_token(identity=self.advisor_id),
+                "counsellor": create_access_token(identity=self.counsellor_id),
+                "student": create_access_token(identity=self.first_student_user_id)
+            }
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, name, role):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name.title())
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserRole(user_id=user.id, role_id=role.id))
+        return user.id
+
+    def add_students(self, count):
+        """Add assigned students with two accounts and two approved snapshots each"""
+        first = None
+        with self.app.app_context():
+            for _ in range(count):
+                self.student_count += 1
+                n = self.student_count
+                user_id = self.create_user(f"student{n}", self.student_role)
+                student = Student(
+                    user_id=user_id,
+                    register_number=f"REG{n:03d}",
+                    admission_year=2024,
+                    department_id=self.department_id
+                )
+                db.session.add(student)
+                db.session.flush()
+                db.session.add(StudentAdvisor(student_id=student.id, advisor_user_id=self.advisor_id))
+                db.session.add(StudentCounsellor(student_id=student.id, counsellor_user_id=self.counsellor_id))
+
+                for platform_name, base in [("leetcode", 100), ("codeforces", 40)]:
+                    account = PlatformAccount(student_id=student.id, platform_name=platform_name, username=f"u{n}")
+                    db.session.add(account)
+                    db.session.flush()
+                    for days_ago, solved in [(7, base), (0, base + n)]:
+                        db.session.add(PlatformSnapshot(
+                            platform_account_id=account.id,
+                            total_solved=solved,
+                            contest_rating=1500,
+                            snapshot_date=date.today() - timedelta(days=days_ago),
+                            status="approved"
+                        ))
+                if first is None:
+                    first = (student.id, user_id)
+            db.session.commit()
+            rebuild_account_stats()
+        return first
+
+    def count_queries(self, url, role):
+        with self.app.app_context():
+            engine = db.engine
+        with QueryCounter(engine) as counter:
+            response = self.client.get(url, headers={"Authorization": f"Bearer {self.tokens[role]}"})
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return counter.count
+
+    def test_metrics_values(self):
+        with self.app.app_context():
+            metrics = get_student_metrics([self.first_student_id])[self.first_student_id]
+
+        self.assertEqual(metrics["total_solved"], 101 + 41)
+        self.assertEqual(metrics["growth"], 2)
+        self.assertEqual(metrics["last_active"], date.today())
+        self.assertEqual(metrics["rating_average"], 1500)
+        self.assertEqual(len(metrics["platforms"]), 2)
+        self.assertEqual(metrics["department_name"], "Computer Science")
+
+    def test_query_count_is_constant_per_route(self):
+        routes = [
+            ("/analytics/my-summary", "student"),
+            ("/analytics/advisor/my-students", "advisor"),
+            (f"/analytics/advisor/student/{self.first_student_id}", "advisor"),
+            ("/analytics/counsellor/summary", "counsellor"),
+            ("/analytics/counsellor/students", "counsellor"),
+            ("/analytics/counsellor/at-risk", "counsellor"),
+            ("/analytics/at-risk", "admin")
+        ]
+
+        small = {url: self.count_queries(url, role) for url, role in routes}
+        self.add_students(25)
+        large = {url: self.count_queries(url, role) for url, role in routes}
+
+        for url, _ in routes:
+            with self.subTest(url=url):
+                self.assertEqual(small[url], large[url])
+                self.assertLessEqual(large[url], 8)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.academics.models import Department
+from app.students.models import Student, StudentAdvisor, StudentCounsellor
+
+class TestStudentsList(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length"
+        })
+        self.client = self.app.test_client()
+        self.student_count = 0
+
+        with self.app.app_context():
+            db.create_all()
+            roles = {name: Role(name=name) for name in ["admin", "advisor", "counsellor", "student"]}
+            db.session.add_all(roles.values())
+            departments = [Department(name="Computer Science", code="CSE"), Department(name="Electronics", code="ECE")]
+            db.session.add_all(departments)
+            admin_id = self.create_user("admin", roles["admin"])
+            self.advisor_id = self.create_user("advisor", roles["advisor"])
+            self.counsellor_id = self.create_user("counsellor", roles["counsellor"])
+            db.session.commit()
+            self.student_role_id = roles["student"].id
+            self.department_ids = [d.id for d in departments]
+            self.headers = {"Authorization": f"Bearer {create_access_token(identity=admin_id)}"}
+
+        self.add_students(9)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, name, role=None, role_id=None):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name.title())
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserRole(user_id=user.id, role_id=role.id if role else role_id))
+        return user.id
+
+    def add_students(self, count):
+        """Every third student is unassigned; the rest alternate departments"""
+        with self.app.app_context():
+            for _ in range(count):
+                self.student_count += 1
+                n = self.student_count
+                user_id = self.create_user(f"student{n}", role_id=self.student_role_id)
+                student = Student(
+                    user_id=user_id,
+                    register_number=f"REG{n:03d}",
+                    admission_year=2023 + n % 2,
+                    department_id=None if n % 3 == 0 else self.department_ids[n % 2]
+                )
+                db.session.add(student)
+                db.session.flush()
+                db.session.add(StudentAdvisor(student_id=student.id, advisor_user_id=self.advisor_id))
+                db.session.add(StudentCounsellor(student_id=student.id, counsellor_user_id=self.counsellor_id))
+            db.session.commit()
+
+    def get(self, query, expected_status=200):
+        with self.app.app_context():
+            engine = db.engine
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = self.client.get(f"/students/all?{query}", headers=self.headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        self.assertEqual(response.status_code, expected_status, response.get_json())
+        return response.get_json().get("data"), len(statements)
+
+    def walk(self, query):
+        register_numbers, cursor = [], None
+        while True:
+            data, _ = self.get(f"{query}&cursor={cursor}" if cursor else query)
+            register_numbers += [s["register_number"] for s in data["students"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return register_numbers
+
+    def test_pages_cover_every_student_in_order(self):
+        self.assertEqual(self.walk("limit=4"), [f"REG{n:03d}" for n in range(1, 10)])
+
+    def test_filters(self):
+        self.assertEqual(self.walk("limit=2&assigned=false"), ["REG003", "REG006", "REG009"])
+        self.assertEqual(self.walk(f"limit=2&department_id={self.department_ids[1]}"), ["REG001", "REG005", "REG007"])
+        self.assertEqual(self.walk("paginate=true&admission_year=2023&assigned=true"), ["REG002", "REG004", "REG008"])
+
+    def test_page_query_count_is_constant(self):
+        first_page, small = self.get("limit=50")
+        self.add_students(30)
+        second_page, large = self.get("limit=50")
+        self.assertEqual(len(first_page["students"]), 9)
+        self.assertEqual(len(second_page["students"]), 39)
+        self.assertEqual(small, large)
+        self.assertEqual(second_page["students"][0]["advisor_name"], "Advisor")
+        self.assertEqual(second_page["students"][0]["department_name"], "Electronics")
+
+    def test_full_list_unless_paginated_and_invalid_input(self):
+        for query in ("", "paginate=false", "assigned=true"):
+            data, _ = self.get(query)
+            self.assertIsInstance(data, list)
+        self.assertEqual(len(self.get("")[0]), 9)
+        self.assertEqual(self.get("")[0][0]["counsellor_name"], "Counsellor")
+        self.assertEqual(len(self.get("assigned=true")[0]), 6)
+
+        self.get("cursor=not-a-cursor", expected_status=400)
+        self.get("limit=0", expected_status=400)
+        self.get("admission_year=abc", expected_status=400)
+
+if __name__ == "__main__":
+    unittest.main()
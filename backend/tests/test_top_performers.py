@@ -0,0 +1,137 @@
+import unittest
+from datetime import date
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.auth.models import User, Role, UserRole
+from app.academics.models import Department
+from app.students.models import Student
+from app.platforms.models import PlatformAccount
+from app.snapshots.models import PlatformSnapshot
+from app.analytics.services import rebuild_account_stats
+
+class TestTopPerformers(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "JWT_SECRET_KEY": "test-secret-key-with-enough-length",
+            "CACHE_TYPE": "null"
+        })
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            admin_role, student_role = Role(name="admin"), Role(name="student")
+            db.session.add_all([admin_role, student_role])
+            cse, ece = Department(name="Computer Science", code="CSE"), Department(name="Electronics", code="ECE")
+            db.session.add_all([cse, ece])
+            admin_id = self.create_user("admin", admin_role)
+            db.session.flush()
+            self.cse_id, self.ece_id = cse.id, ece.id
+
+            # name -> (department, year, {platform: (solved, rating)})
+            self.students = {}
+            for name, department_id, year, accounts in [
+                ("a", cse.id, 2023, {"leetcode": (300, 1800), "codeforces": (50, None)}),
+                ("b", cse.id, 2024, {"leetcode": (200, 1500)}),
+                ("c", cse.id, 2024, {"leetcode": (200, 1600), "codeforces": (10, 1400)}),
+                ("d", ece.id, 2023, {"codeforces": (120, 1900)}),
+                ("e", ece.id, 2024, {"leetcode": (5, None)})
+            ]:
+                user_id = self.create_user(name, student_role)
+                student = Student(user_id=user_id, register_number=name.upper(), admission_year=year, department_id=department_id)
+                db.session.add(student)
+                db.session.flush()
+                self.students[student.id] = name
+                for platform, (solved, rating) in accounts.items():
+                    account = PlatformAccount(student_id=student.id, platform_name=platform, username=name)
+                    db.session.add(account)
+                    db.session.flush()
+                    db.session.add(PlatformSnapshot(
+                        platform_account_id=account.id,
+                        total_solved=solved,
+                        contest_rating=rating,
+                        snapshot_date=date(2025, 1, 1),
+                        status="approved"
+                    ))
+            db.session.commit()
+            rebuild_account_stats()
+            self.headers = {"Authorization": f"Bearer {create_access_token(identity=admin_id)}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, name, role):
+        user = User(email=f"{name}@test.com", password_hash="!", full_name=name)
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(UserRole(user_id=user.id, role_id=role.id))
+        return user.id
+
+    def get(self, query, expected_status=200):
+        response = self.client.get(f"/analytics/top-performers?{query}", headers=self.headers)
+        self.assertEqual(response.status_code, expected_status, response.get_json())
+        return response.get_json().get("data")
+
+    def summary(self, rows, *fields):
+        return [(r["full_name"],) + tuple(r[f] for f in fields) for r in rows]
+
+    def test_global_ranking_with_ties(self):
+        rows = self.get("limit=10")
+        self.assertEqual(self.summary(rows, "total_solved", "rank", "percentile"), [
+            ("a", 350, 1, 100.0),
+            ("c", 210, 2, 75.0),
+            ("b", 200, 3, 50.0),
+            ("d", 120, 4, 25.0),
+            ("e", 5, 5, 0.0)
+        ])
+
+    def test_top_n_per_department_in_one_statement(self):
+        with self.app.app_context():
+            engine = db.engine
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            rows = self.get("partition=department&limit=2")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        by_group = {}
+        for r in rows:
+            by_group.setdefault(r["group"], []).append((r["full_name"], r["rank"], r["group_size"]))
+        self.assertEqual(by_group, {
+            self.cse_id: [("a", 1, 3), ("c", 2, 3)],
+            self.ece_id: [("d", 1, 2), ("e", 2, 2)]
+        })
+        self.assertEqual(len([s for s in statements if "rank" in s.lower()]), 1)
+
+    def test_paging_within_groups(self):
+        rows = self.get("partition=department&limit=2&offset=2")
+        self.assertEqual(self.summary(rows, "position", "rank"), [("b", 3, 3)])
+
+    def test_rating_mode_by_platform_and_year(self):
+        rows = self.get("partition=platform&metric=rating")
+        self.assertEqual(self.summary(rows, "platform", "rank"), [
+            ("d", "codeforces", 1), ("c", "codeforces", 2),
+            ("a", "leetcode", 1), ("c", "leetcode", 2), ("b", "leetcode", 3)
+        ])
+
+        # b (1500) and c (avg of 1600 and 1400) tie in 2024
+        rows = self.get("partition=admission_year&metric=rating")
+        summary = self.summary(rows, "group", "rank")
+        self.assertEqual(summary[:2], [("d", 2023, 1), ("a", 2023, 2)])
+        self.assertEqual(sorted(summary[2:]), [("b", 2024, 1), ("c", 2024, 1)])
+
+    def test_department_filter_and_validation(self):
+        rows = self.get(f"department_id={self.ece_id}")
+        self.assertEqual(self.summary(rows, "rank"), [("d", 1), ("e", 2)])
+        self.get("partition=city", expected_status=400)
+        self.get("metric=speed", expected_status=400)
+        self.get("offset=-1", expected_status=400)
+
+if __name__ == "__main__":
+    unittest.main()
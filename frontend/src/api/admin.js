@@ -21,6 +21,18 @@ export const getAllStudents = async () => {
     return response.data
 }
 
+// assigned: true/false filters on whether the student has a department
+export const getStudentsPage = async ({ cursor, limit, departmentId, admissionYear, assigned } = {}) => {
+    const params = new URLSearchParams({ paginate: 'true' })
+    if (cursor) params.append('cursor', cursor)
+    if (limit) params.append('limit', limit)
+    if (departmentId) params.append('department_id', departmentId)
+    if (admissionYear) params.append('admission_year', admissionYear)
+    if (assigned !== undefined) params.append('assigned', assigned)
+    const response = await api.get(`/students/all?${params.toString()}`)
+    return response.data
+}
+
 export const assignDepartment = async (studentId, departmentId) => {
     const response = await api.put(`/students/${studentId}/assign-department`, { department_id: departmentId })
     return response.data
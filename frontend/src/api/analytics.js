@@ -10,3 +10,13 @@ export const getMyGrowth = async (platformAccountId) => {
     const response = await api.get(`/analytics/my-growth/${platformAccountId}`)
     return response.data
 }
+
+const getSeries = async (path, { interval = 'week', from, to } = {}) => {
+    const params = new URLSearchParams({ interval })
+    if (from) params.append('from', from)
+    if (to) params.append('to', to)
+    const response = await api.get(`/analytics/timeseries/${path}?${params.toString()}`)
+    return response.data
+}
+
+export const getAccountSeries = (platformAccountId, options) => getSeries(`account/${platformAccountId}`, options)
@@ -11,8 +11,13 @@ export const getDepartmentPerformance = async () => {
     return response.data
 }
 
-export const getTopPerformers = async (limit = 10) => {
-    const response = await api.get(`/analytics/top-performers?limit=${limit}`)
+export const getTopPerformers = async (limit = 10, { partition, metric, offset, departmentId } = {}) => {
+    const params = new URLSearchParams({ limit })
+    if (partition) params.append('partition', partition)
+    if (metric) params.append('metric', metric)
+    if (offset) params.append('offset', offset)
+    if (departmentId) params.append('department_id', departmentId)
+    const response = await api.get(`/analytics/top-performers?${params.toString()}`)
     return response.data
 }
 
@@ -20,3 +25,11 @@ export const getAtRiskStudents = async () => {
     const response = await api.get('/analytics/at-risk')
     return response.data
 }
+
+export const getDepartmentTrend = async (departmentId, from, to) => {
+    const params = new URLSearchParams()
+    if (from) params.append('from', from)
+    if (to) params.append('to', to)
+    const response = await api.get(`/analytics/department/${departmentId}/trend?${params.toString()}`)
+    return response.data
+}
@@ -1,8 +1,12 @@
 
 import api from './axios'
 
-export const getPendingSnapshots = async () => {
-    const response = await api.get('/counsellor/pending-snapshots')
+// One page of the queue: { snapshots, next_cursor, total, limit }
+export const getPendingSnapshotsPage = async ({ cursor, limit } = {}) => {
+    const params = new URLSearchParams()
+    if (cursor) params.append('cursor', cursor)
+    if (limit) params.append('limit', limit)
+    const response = await api.get(`/counsellor/pending-snapshots?${params.toString()}`)
     return response.data
 }
 
@@ -15,3 +19,21 @@ export const rejectSnapshot = async (snapshotId, remarks) => {
     const response = await api.put(`/counsellor/snapshots/${snapshotId}/reject`, { remarks })
     return response.data
 }
+
+// Pass { snapshotIds } or { studentId } (every pending snapshot of that student)
+export const bulkApproveSnapshots = async ({ snapshotIds, studentId }) => {
+    const response = await api.put('/counsellor/snapshots/bulk-approve', {
+        snapshot_ids: snapshotIds,
+        student_id: studentId
+    })
+    return response.data
+}
+
+export const bulkRejectSnapshots = async ({ snapshotIds, studentId }, remarks) => {
+    const response = await api.put('/counsellor/snapshots/bulk-reject', {
+        snapshot_ids: snapshotIds,
+        student_id: studentId,
+        remarks
+    })
+    return response.data
+}
@@ -10,3 +10,17 @@ export const createSnapshot = async (data) => {
     const response = await api.post('/snapshots', data)
     return response.data
 }
+
+// snapshots: array of {platform_account_id, total_solved, contest_rating, global_rank, snapshot_date}
+// onConflict: 'skip' keeps existing snapshots, 'update' rewrites pending ones
+export const createSnapshotsBulk = async (snapshots, onConflict = 'skip') => {
+    const response = await api.post('/snapshots/bulk', { snapshots, on_conflict: onConflict })
+    return response.data
+}
+
+export const uploadSnapshotsCsv = async (file, onConflict = 'skip') => {
+    const form = new FormData()
+    form.append('file', file)
+    const response = await api.post(`/snapshots/bulk?on_conflict=${onConflict}`, form)
+    return response.data
+}
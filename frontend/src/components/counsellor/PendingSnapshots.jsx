@@ -1,11 +1,14 @@
 
 import { useState, useEffect } from 'react'
-import { getPendingSnapshots, approveSnapshot, rejectSnapshot } from '../../api/review'
+import { getPendingSnapshotsPage, approveSnapshot, rejectSnapshot } from '../../api/review'
 import Loader from '../common/Loader'
 
 const PendingSnapshots = () => {
     const [snapshots, setSnapshots] = useState([])
+    const [total, setTotal] = useState(0)
+    const [nextCursor, setNextCursor] = useState(null)
     const [loading, setLoading] = useState(true)
+    const [loadingMore, setLoadingMore] = useState(false)
     const [error, setError] = useState(null)
     const [processingId, setProcessingId] = useState(null)
 
@@ -21,9 +24,11 @@ const PendingSnapshots = () => {
     const fetchSnapshots = async () => {
         setLoading(true)
         try {
-            const res = await getPendingSnapshots()
+            const res = await getPendingSnapshotsPage()
             if (res.success) {
-                setSnapshots(res.data)
+                setSnapshots(res.data.snapshots)
+                setTotal(res.data.total)
+                setNextCursor(res.data.next_cursor)
                 setError(null)
             } else {
                 setError(res.error || "Failed to fetch pending snapshots")
@@ -36,6 +41,31 @@ const PendingSnapshots = () => {
         }
     }
 
+    const loadMore = async () => {
+        if (!nextCursor) return
+        setLoadingMore(true)
+        try {
+            const res = await getPendingSnapshotsPage({ cursor: nextCursor })
+            if (res.success) {
+                setSnapshots(prev => [...prev, ...res.data.snapshots])
+                setTotal(res.data.total)
+                setNextCursor(res.data.next_cursor)
+            } else {
+                alert(res.error || "Failed to load more snapshots")
+            }
+        } catch (err) {
+            console.error(err)
+            alert("Error loading more snapshots")
+        } finally {
+            setLoadingMore(false)
+        }
+    }
+
+    const removeSnapshot = (id) => {
+        setSnapshots(prev => prev.filter(s => s.snapshot_id !== id))
+        setTotal(prev => Math.max(prev - 1, 0))
+    }
+
     const handleApprove = async (id) => {
         if (!confirm("Are you sure you want to approve this snapshot?")) return
 
@@ -44,7 +74,7 @@ const PendingSnapshots = () => {
             const res = await approveSnapshot(id)
             if (res.success) {
                 // Remove from list
-                setSnapshots(prev => prev.filter(s => s.snapshot_id !== id))
+                removeSnapshot(id)
                 // Could show toast success here
             } else {
                 alert(res.error || "Failed to approve")
@@ -70,7 +100,7 @@ const PendingSnapshots = () => {
         try {
             const res = await rejectSnapshot(selectedSnapshotId, rejectRemarks || "Rejected by counsellor")
             if (res.success) {
-                setSnapshots(prev => prev.filter(s => s.snapshot_id !== selectedSnapshotId))
+                removeSnapshot(selectedSnapshotId)
                 closeRejectModal()
             } else {
                 alert(res.error || "Failed to reject")
@@ -97,7 +127,7 @@ const PendingSnapshots = () => {
         <div className="bg-white shadow-sm rounded-xl border border-gray-100 overflow-hidden mb-8">
             <div className="px-6 py-5 border-b border-gray-100 bg-amber-50 flex justify-between items-center">
                 <h3 className="text-lg font-medium leading-6 text-amber-900">Pending Snapshot Approvals</h3>
-                <span className="bg-amber-100 text-amber-800 text-xs font-medium px-2.5 py-0.5 rounded border border-amber-200">{snapshots.length} Pending</span>
+                <span className="bg-amber-100 text-amber-800 text-xs font-medium px-2.5 py-0.5 rounded border border-amber-200">{total} Pending</span>
             </div>
 
             {snapshots.length === 0 ? (
@@ -155,6 +185,18 @@ const PendingSnapshots = () => {
                             ))}
                         </tbody>
                     </table>
+                    {nextCursor && (
+                        <div className="px-6 py-4 border-t border-gray-100 flex justify-between items-center">
+                            <span className="text-sm text-gray-500">Showing {snapshots.length} of {total}</span>
+                            <button
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                                className="inline-flex items-center px-3 py-1.5 border border-gray-300 text-xs font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50 transition-colors"
+                            >
+                                {loadingMore ? 'Loading...' : 'Load more'}
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
 
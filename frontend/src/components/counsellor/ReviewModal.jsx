@@ -51,13 +51,9 @@ const ReviewModal = ({ isOpen, onClose, snapshot, onActionComplete }) => {
         }
     }
 
-    // Growth Calculation/Display
-    // Snapshot doesn't seem to pass "Previous" snapshot data for comparison in the single object from pending list.
-    // We might need to rely on what's available or fetching it. 
-    // The endpoint `pending-snapshots` returns: total_solved, contest_rating, date.
-    // It does NOT return previous snapshot data.
-    // I can't calculate growth comparison without it.
-    // I will display "N/A" or hide growth comparison if data is missing, to be safe.
+    // Previous approved values come with each pending row (null for a first submission)
+    const hasPrevious = snapshot.previous_total_solved !== null && snapshot.previous_total_solved !== undefined
+    const solvedDelta = hasPrevious ? snapshot.total_solved - snapshot.previous_total_solved : null
 
     return (
         <div className="fixed inset-0 z-50 overflow-y-auto" aria-labelledby="modal-title" role="dialog" aria-modal="true">
@@ -98,10 +94,18 @@ const ReviewModal = ({ isOpen, onClose, snapshot, onActionComplete }) => {
                                             <div>
                                                 <div className="text-xs text-gray-500">Total Solved</div>
                                                 <div className="text-xl font-bold text-indigo-600">{snapshot.total_solved}</div>
+                                                {hasPrevious && (
+                                                    <div className="text-xs text-gray-500">
+                                                        was {snapshot.previous_total_solved} ({solvedDelta >= 0 ? '+' : ''}{solvedDelta})
+                                                    </div>
+                                                )}
                                             </div>
                                             <div>
                                                 <div className="text-xs text-gray-500">Rating</div>
                                                 <div className="text-xl font-bold text-gray-700">{snapshot.contest_rating || 'N/A'}</div>
+                                                {hasPrevious && (
+                                                    <div className="text-xs text-gray-500">was {snapshot.previous_contest_rating || 'N/A'}</div>
+                                                )}
                                             </div>
                                         </div>
                                     </div>
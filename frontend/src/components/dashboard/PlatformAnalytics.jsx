@@ -6,11 +6,21 @@ import GrowthBadge from './GrowthBadge'
 
 import Loader from '../common/Loader'
 import { getSnapshots } from '../../api/snapshots'
-import { getMyGrowth } from '../../api/analytics'
+import { getMyGrowth, getAccountSeries } from '../../api/analytics'
+
+// Trend charts: weekly buckets over the last year, aggregated server-side
+const SERIES_WEEKS = 52
+
+const seriesStart = () => {
+    const from = new Date()
+    from.setDate(from.getDate() - SERIES_WEEKS * 7)
+    return from.toISOString().slice(0, 10)
+}
 
 const PlatformAnalytics = ({ platforms }) => {
     const [selectedPlatformId, setSelectedPlatformId] = useState('')
     const [snapshots, setSnapshots] = useState([])
+    const [series, setSeries] = useState([])
     const [growth, setGrowth] = useState(null)
     const [loading, setLoading] = useState(false)
     const [error, setError] = useState(null)
@@ -28,19 +38,22 @@ const PlatformAnalytics = ({ platforms }) => {
             setLoading(true)
             setError(null)
             try {
-                const [snapshotsData, growthData] = await Promise.all([
+                const [snapshotsData, seriesData, growthData] = await Promise.all([
                     getSnapshots(selectedPlatformId),
+                    getAccountSeries(selectedPlatformId, { interval: 'week', from: seriesStart() }),
                     getMyGrowth(selectedPlatformId)
                 ])
 
                 if (snapshotsData.success) {
-                    // Sort descending for table, ascending for chart
-                    const sorted = snapshotsData.data.sort((a, b) => new Date(a.snapshot_date) - new Date(b.snapshot_date))
-                    setSnapshots(sorted)
+                    // Already newest first for the history table
+                    setSnapshots(snapshotsData.data)
                 } else {
                     setError(snapshotsData.error)
                 }
 
+                // Charts plot the approved weekly series, not the raw history
+                setSeries(seriesData.success ? seriesData.data.series : [])
+
                 if (growthData.success) {
                     setGrowth(growthData.data)
                 } else {
@@ -110,10 +123,10 @@ const PlatformAnalytics = ({ platforms }) => {
                                 <h4 className="text-sm font-medium text-gray-900 mb-4">Total Solved Trend</h4>
                                 <div className="h-64 w-full">
                                     <ResponsiveContainer width="100%" height="100%">
-                                        <LineChart data={snapshots} margin={{ top: 5, right: 20, bottom: 5, left: 0 }}>
+                                        <LineChart data={series} margin={{ top: 5, right: 20, bottom: 5, left: 0 }}>
                                             <CartesianGrid strokeDasharray="3 3" vertical={false} stroke="#F3F4F6" />
                                             <XAxis
-                                                dataKey="snapshot_date"
+                                                dataKey="period_start"
                                                 tick={{ fontSize: 11, fill: '#9CA3AF' }}
                                                 tickLine={false}
                                                 tickFormatter={(str) => new Date(str).toLocaleDateString(undefined, { month: 'short', day: 'numeric' })}
@@ -126,7 +139,7 @@ const PlatformAnalytics = ({ platforms }) => {
                                             <Tooltip
                                                 contentStyle={{ borderRadius: '8px', border: 'none', boxShadow: '0 4px 6px -1px rgba(0, 0, 0, 0.1)' }}
                                                 labelStyle={{ color: '#6B7280', marginBottom: '0.25rem' }}
-                                                labelFormatter={(label) => new Date(label).toLocaleDateString(undefined, { weekday: 'short', year: 'numeric', month: 'short', day: 'numeric' })}
+                                                labelFormatter={(label) => `Week of ${new Date(label).toLocaleDateString(undefined, { year: 'numeric', month: 'short', day: 'numeric' })}`}
                                             />
                                             <Line
                                                 type="monotone"
@@ -146,10 +159,10 @@ const PlatformAnalytics = ({ platforms }) => {
                                 <h4 className="text-sm font-medium text-gray-900 mb-4">Rating Trend</h4>
                                 <div className="h-64 w-full">
                                     <ResponsiveContainer width="100%" height="100%">
-                                        <LineChart data={snapshots} margin={{ top: 5, right: 20, bottom: 5, left: 0 }}>
+                                        <LineChart data={series} margin={{ top: 5, right: 20, bottom: 5, left: 0 }}>
                                             <CartesianGrid strokeDasharray="3 3" vertical={false} stroke="#F3F4F6" />
                                             <XAxis
-                                                dataKey="snapshot_date"
+                                                dataKey="period_start"
                                                 tick={{ fontSize: 11, fill: '#9CA3AF' }}
                                                 tickLine={false}
                                                 tickFormatter={(str) => new Date(str).toLocaleDateString(undefined, { month: 'short', day: 'numeric' })}
@@ -163,11 +176,11 @@ const PlatformAnalytics = ({ platforms }) => {
                                             <Tooltip
                                                 contentStyle={{ borderRadius: '8px', border: 'none', boxShadow: '0 4px 6px -1px rgba(0, 0, 0, 0.1)' }}
                                                 labelStyle={{ color: '#6B7280', marginBottom: '0.25rem' }}
-                                                labelFormatter={(label) => new Date(label).toLocaleDateString(undefined, { weekday: 'short', year: 'numeric', month: 'short', day: 'numeric' })}
+                                                labelFormatter={(label) => `Week of ${new Date(label).toLocaleDateString(undefined, { year: 'numeric', month: 'short', day: 'numeric' })}`}
                                             />
                                             <Line
                                                 type="monotone"
-                                                dataKey="contest_rating"
+                                                dataKey="average_rating"
                                                 name="Contest Rating"
                                                 stroke="#10B981"
                                                 strokeWidth={2}
@@ -205,7 +218,7 @@ const PlatformAnalytics = ({ platforms }) => {
                                         </tr>
                                     </thead>
                                     <tbody className="bg-white divide-y divide-gray-200">
-                                        {[...snapshots].reverse().map((snap) => (
+                                        {snapshots.map((snap) => (
                                             <tr key={snap.id} className="hover:bg-gray-50 transition-colors">
                                                 <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900 font-medium">
                                                     {new Date(snap.snapshot_date).toLocaleDateString()}
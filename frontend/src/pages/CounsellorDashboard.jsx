@@ -1,7 +1,7 @@
 
 import { useState, useEffect } from 'react'
 import { getCounsellorSummary, getDepartmentStudents as getMyStudents } from '../api/counsellor'
-import { getPendingSnapshots } from '../api/review'
+import { getPendingSnapshotsPage } from '../api/review'
 import Navbar from '../components/layout/Navbar'
 import Loader from '../components/common/Loader'
 import ApprovalTable from '../components/counsellor/ApprovalTable'
@@ -18,6 +18,9 @@ const TABS = [
 const CounsellorDashboard = () => {
     const [summary, setSummary] = useState(null)
     const [pendingSnapshots, setPendingSnapshots] = useState([])
+    const [pendingTotal, setPendingTotal] = useState(0)
+    const [pendingCursor, setPendingCursor] = useState(null)
+    const [loadingMore, setLoadingMore] = useState(false)
     const [myStudents, setMyStudents] = useState([])
     const [loading, setLoading] = useState(true)
     const [activeTab, setActiveTab] = useState('pending')
@@ -33,15 +36,18 @@ const CounsellorDashboard = () => {
         try {
             const [summaryRes, pendingRes, studentsRes] = await Promise.all([
                 getCounsellorSummary(),
-                getPendingSnapshots(),
+                getPendingSnapshotsPage(),
                 getMyStudents()
             ])
 
             if (summaryRes.success) setSummary(summaryRes.data)
             else setError(summaryRes.error || "Failed to fetch summary")
 
-            if (pendingRes.success) setPendingSnapshots(pendingRes.data)
-            else console.error(pendingRes.error)
+            if (pendingRes.success) {
+                setPendingSnapshots(pendingRes.data.snapshots)
+                setPendingTotal(pendingRes.data.total)
+                setPendingCursor(pendingRes.data.next_cursor)
+            } else console.error(pendingRes.error)
 
             if (studentsRes.success) setMyStudents(studentsRes.data)
             else console.error(studentsRes.error)
@@ -58,6 +64,25 @@ const CounsellorDashboard = () => {
         fetchData()
     }, [])
 
+    const loadMorePending = async () => {
+        setLoadingMore(true)
+        try {
+            const res = await getPendingSnapshotsPage({ cursor: pendingCursor })
+            if (res.success) {
+                setPendingSnapshots(prev => [...prev, ...res.data.snapshots])
+                setPendingTotal(res.data.total)
+                setPendingCursor(res.data.next_cursor)
+            } else {
+                setToast({ type: 'error', message: res.error || "Failed to load more snapshots" })
+            }
+        } catch (err) {
+            console.error(err)
+            setToast({ type: 'error', message: "Failed to load more snapshots" })
+        } finally {
+            setLoadingMore(false)
+        }
+    }
+
     const handleReviewAction = (msg) => {
         setToast({ type: 'success', message: msg })
         fetchData()
@@ -119,8 +144,8 @@ const CounsellorDashboard = () => {
                     />
                     <StatCard
                         title="Pending Reviews"
-                        value={pendingSnapshots.length}
-                        color={pendingSnapshots.length > 0 ? "text-yellow-600" : "text-green-600"}
+                        value={pendingTotal}
+                        color={pendingTotal > 0 ? "text-yellow-600" : "text-green-600"}
                     />
                     <StatCard
                         title="At-Risk Students"
@@ -145,9 +170,9 @@ const CounsellorDashboard = () => {
                                     `}
                                 >
                                     {tab.label}
-                                    {tab.id === 'pending' && pendingSnapshots.length > 0 && (
+                                    {tab.id === 'pending' && pendingTotal > 0 && (
                                         <span className="ml-2 bg-yellow-100 text-yellow-800 py-0.5 px-2 rounded-full text-xs">
-                                            {pendingSnapshots.length}
+                                            {pendingTotal}
                                         </span>
                                     )}
                                 </button>
@@ -157,14 +182,28 @@ const CounsellorDashboard = () => {
 
                     <div className="p-0">
                         {activeTab === 'pending' && (
-                            <ApprovalTable
-                                snapshots={pendingSnapshots}
-                                status="Pending"
-                                onReview={(snap) => {
-                                    setSelectedSnapshot(snap)
-                                    setIsReviewOpen(true)
-                                }}
-                            />
+                            <>
+                                <ApprovalTable
+                                    snapshots={pendingSnapshots}
+                                    status="Pending"
+                                    onReview={(snap) => {
+                                        setSelectedSnapshot(snap)
+                                        setIsReviewOpen(true)
+                                    }}
+                                />
+                                {pendingCursor && (
+                                    <div className="px-6 py-4 border-t border-gray-100 flex justify-between items-center">
+                                        <span className="text-sm text-gray-500">Showing {pendingSnapshots.length} of {pendingTotal}</span>
+                                        <button
+                                            onClick={loadMorePending}
+                                            disabled={loadingMore}
+                                            className="inline-flex items-center px-3 py-1.5 border border-gray-300 text-xs font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50 transition-colors"
+                                        >
+                                            {loadingMore ? 'Loading...' : 'Load more'}
+                                        </button>
+                                    </div>
+                                )}
+                            </>
                         )}
 
                         {activeTab === 'students' && (